@@ -0,0 +1,40 @@
+"""add composite indexes for the drill catalog
+
+Revision ID: add_drill_catalog_indexes
+Revises: drill_group_tags_jsonb
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_drill_catalog_indexes'
+down_revision = 'drill_group_tags_jsonb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'idx_drills_type_difficulty_duration',
+        'drills',
+        ['drill_type', 'difficulty', 'duration_minutes']
+    )
+    op.create_index(
+        'idx_drills_difficulty_duration',
+        'drills',
+        ['difficulty', 'duration_minutes']
+    )
+    op.create_index(
+        'idx_drills_created_at_id',
+        'drills',
+        [sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade():
+    op.drop_index('idx_drills_created_at_id', table_name='drills')
+    op.drop_index('idx_drills_difficulty_duration', table_name='drills')
+    op.drop_index('idx_drills_type_difficulty_duration', table_name='drills')
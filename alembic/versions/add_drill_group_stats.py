@@ -0,0 +1,82 @@
+"""add drill group popularity counters
+
+Revision ID: add_drill_group_stats
+Revises: add_practice_sessions_created_at_idx
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_drill_group_stats'
+down_revision = 'add_practice_sessions_created_at_idx'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Sharded write-side counters
+    op.create_table(
+        'drill_group_counter_shards',
+        sa.Column('drill_group_id', sa.Integer(), nullable=False),
+        sa.Column('shard', sa.SmallInteger(), nullable=False),
+        sa.Column('practice_count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('trending_score', sa.Float(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['drill_group_id'], ['drill_groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('drill_group_id', 'shard')
+    )
+
+    # Rolled-up read-side counters
+    op.create_table(
+        'drill_group_stats',
+        sa.Column('drill_group_id', sa.Integer(), nullable=False),
+        sa.Column('practice_count', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('trending_score', sa.Float(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['drill_group_id'], ['drill_groups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('drill_group_id')
+    )
+    op.create_index(
+        'idx_drill_group_stats_trending',
+        'drill_group_stats',
+        [sa.text('trending_score DESC'), 'drill_group_id']
+    )
+    op.create_index(
+        'idx_drill_group_stats_popular',
+        'drill_group_stats',
+        [sa.text('practice_count DESC'), 'drill_group_id']
+    )
+
+    # Seed the counters from existing practice history, with scores in log2
+    # space as crud_drill_group_stats stores them
+    half_life_seconds = settings.POPULARITY_HALF_LIFE_HOURS * 3600
+    op.execute(f"""
+        INSERT INTO drill_group_counter_shards (drill_group_id, shard, practice_count, trending_score)
+        SELECT drill_group_id, 0, count(*),
+               max(top) + ln(sum(power(2.0, greatest(exponent - top, -1000)))) / ln(2.0)
+        FROM (
+            SELECT drill_group_id, exponent, max(exponent) OVER (PARTITION BY drill_group_id) AS top
+            FROM (
+                SELECT drill_group_id,
+                       extract(epoch FROM created_at - timestamp '2025-01-01')::float8 / {half_life_seconds} AS exponent
+                FROM practice_sessions
+            ) AS events
+        ) AS scored
+        GROUP BY drill_group_id
+    """)
+    op.execute("""
+        INSERT INTO drill_group_stats (drill_group_id, practice_count, trending_score)
+        SELECT drill_group_id, practice_count, trending_score
+        FROM drill_group_counter_shards
+    """)
+
+
+def downgrade():
+    op.drop_index('idx_drill_group_stats_popular', table_name='drill_group_stats')
+    op.drop_index('idx_drill_group_stats_trending', table_name='drill_group_stats')
+    op.drop_table('drill_group_stats')
+    op.drop_table('drill_group_counter_shards')
@@ -0,0 +1,29 @@
+"""add created_at index to practice_sessions
+
+Revision ID: add_practice_sessions_created_at_idx
+Revises: add_session_id_to_drills
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_practice_sessions_created_at_idx'
+down_revision = 'add_session_id_to_drills'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Index used by incremental readers that scan practice sessions by watermark
+    op.create_index(
+        'idx_practice_sessions_created_at',
+        'practice_sessions',
+        ['created_at']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_practice_sessions_created_at', table_name='practice_sessions')
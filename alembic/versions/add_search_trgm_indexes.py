@@ -0,0 +1,35 @@
+"""add trigram indexes for fuzzy drill and drill group search
+
+Revision ID: add_search_trgm_indexes
+Revises: add_user_autocomplete_indexes
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_trgm_indexes'
+down_revision = 'add_user_autocomplete_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table in ('drills', 'drill_groups'):
+        for column in ('name', 'description'):
+            op.create_index(
+                f'idx_{table}_{column}_trgm',
+                table,
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'}
+            )
+
+
+def downgrade():
+    for table in ('drills', 'drill_groups'):
+        for column in ('name', 'description'):
+            op.drop_index(f'idx_{table}_{column}_trgm', table_name=table)
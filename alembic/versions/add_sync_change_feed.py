@@ -0,0 +1,158 @@
+"""add change stamps and tombstones for delta sync
+
+Revision ID: add_sync_change_feed
+Revises: add_search_trgm_indexes
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_sync_change_feed'
+down_revision = 'add_search_trgm_indexes'
+branch_labels = None
+depends_on = None
+
+CHANGE_XID = "(pg_current_xact_id()::text::bigint)"
+
+# table -> (primary key columns, owner columns, public flag column).
+# drill_group_drills takes its visibility from the group, see below.
+SYNC_TABLES = {
+    'drills': (['id'], [], None),
+    'drill_groups': (['id'], ['user_id'], 'is_public'),
+    'drill_group_drills': (['drill_group_id', 'drill_id'], None, None),
+    'practice_sessions': (['id'], ['user_id'], None),
+    'challenges': (['id'], ['sender_id', 'recipient_id'], None),
+}
+
+
+def upgrade():
+    op.create_table(
+        'sync_tombstones',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('row_key', postgresql.JSONB(), nullable=False),
+        sa.Column('user_ids', postgresql.ARRAY(sa.Integer()), nullable=True),
+        sa.Column('except_user_id', sa.Integer(), nullable=True),
+        sa.Column('change_xid', sa.BigInteger(), server_default=sa.text(CHANGE_XID), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_sync_tombstones_change', 'sync_tombstones', ['change_xid', 'id'])
+    op.create_index('idx_sync_tombstones_created_at', 'sync_tombstones', ['created_at'])
+
+    # Stamp every insert and update with the writing transaction id
+    op.execute(f"""
+        CREATE FUNCTION sync_stamp_change() RETURNS trigger AS $$
+        BEGIN
+            NEW.change_xid := {CHANGE_XID};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Record deletes (including FK cascades) as tombstones.
+    # Arguments: key columns, owner columns ('' = visible to everyone),
+    # and optionally a flag column that makes the row visible to everyone.
+    op.execute("""
+        CREATE FUNCTION sync_record_delete() RETURNS trigger AS $$
+        DECLARE
+            old_row jsonb := to_jsonb(OLD);
+            deleted_key jsonb;
+            owners integer[];
+        BEGIN
+            SELECT jsonb_object_agg(k, old_row -> k) INTO deleted_key
+            FROM unnest(string_to_array(TG_ARGV[0], ',')) AS k;
+            IF TG_ARGV[1] <> '' AND (TG_NARGS < 3 OR NOT coalesce((old_row ->> TG_ARGV[2])::boolean, false)) THEN
+                SELECT array_agg((old_row ->> c)::integer) INTO owners
+                FROM unnest(string_to_array(TG_ARGV[1], ',')) AS c;
+            END IF;
+            INSERT INTO sync_tombstones (table_name, row_key, user_ids) VALUES (TG_TABLE_NAME, deleted_key, owners);
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    # Memberships are visible to whoever can see their group: everyone for a
+    # public group, the owner for a private one. When the group itself is
+    # being deleted its row is already gone; the group's own tombstone tells
+    # its owner to drop the memberships, so these go to nobody.
+    op.execute("""
+        CREATE FUNCTION sync_record_group_drill_delete() RETURNS trigger AS $$
+        DECLARE
+            owners integer[] := '{}';
+            group_public boolean;
+            group_owner integer;
+        BEGIN
+            SELECT is_public, user_id INTO group_public, group_owner
+            FROM drill_groups WHERE id = OLD.drill_group_id;
+            IF FOUND THEN
+                owners := CASE WHEN coalesce(group_public, false) THEN NULL ELSE ARRAY[group_owner] END;
+            END IF;
+            INSERT INTO sync_tombstones (table_name, row_key, user_ids)
+            VALUES (TG_TABLE_NAME, jsonb_build_object('drill_group_id', OLD.drill_group_id, 'drill_id', OLD.drill_id), owners);
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table, (keys, owners, flag) in SYNC_TABLES.items():
+        # Constant default first so existing rows are not rewritten; they
+        # carry 0 and arrive with every full sync
+        op.add_column(table, sa.Column('change_xid', sa.BigInteger(), server_default='0', nullable=False))
+        op.alter_column(table, 'change_xid', server_default=sa.text(CHANGE_XID))
+        op.create_index(f'idx_{table}_change', table, ['change_xid', *keys])
+
+        op.execute(f"""
+            CREATE TRIGGER {table}_sync_stamp BEFORE INSERT OR UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION sync_stamp_change()
+        """)
+        if owners is None:
+            delete_function = "sync_record_group_drill_delete()"
+        else:
+            args = [",".join(keys), ",".join(owners)] + ([flag] if flag else [])
+            delete_function = "sync_record_delete({})".format(", ".join(f"'{a}'" for a in args))
+        op.execute(f"""
+            CREATE TRIGGER {table}_sync_delete AFTER DELETE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION {delete_function}
+        """)
+
+    # A drill group changing visibility re-publishes its memberships. Made
+    # private, it is also tombstoned for everyone but its owner; the group's
+    # memberships go with it on the client.
+    op.execute("""
+        CREATE FUNCTION sync_touch_group_drills() RETURNS trigger AS $$
+        BEGIN
+            UPDATE drill_group_drills SET drill_group_id = drill_group_id WHERE drill_group_id = NEW.id;
+            IF coalesce(OLD.is_public, false) AND NOT coalesce(NEW.is_public, false) THEN
+                INSERT INTO sync_tombstones (table_name, row_key, user_ids, except_user_id)
+                VALUES (TG_TABLE_NAME, jsonb_build_object('id', NEW.id), NULL, NEW.user_id);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER drill_groups_sync_visibility AFTER UPDATE OF is_public ON drill_groups
+        FOR EACH ROW WHEN (OLD.is_public IS DISTINCT FROM NEW.is_public)
+        EXECUTE FUNCTION sync_touch_group_drills()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS drill_groups_sync_visibility ON drill_groups")
+    op.execute("DROP FUNCTION IF EXISTS sync_touch_group_drills()")
+    for table, (keys, owners, flag) in SYNC_TABLES.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_delete ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_sync_stamp ON {table}")
+        op.drop_index(f'idx_{table}_change', table_name=table)
+        op.drop_column(table, 'change_xid')
+    op.execute("DROP FUNCTION IF EXISTS sync_record_group_drill_delete()")
+    op.execute("DROP FUNCTION IF EXISTS sync_record_delete()")
+    op.execute("DROP FUNCTION IF EXISTS sync_stamp_change()")
+    op.drop_index('idx_sync_tombstones_created_at', table_name='sync_tombstones')
+    op.drop_index('idx_sync_tombstones_change', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
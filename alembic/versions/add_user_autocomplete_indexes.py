@@ -0,0 +1,29 @@
+"""add prefix and trigram indexes for user autocomplete
+
+Revision ID: add_user_autocomplete_indexes
+Revises: add_user_ratings
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_autocomplete_indexes'
+down_revision = 'add_user_ratings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX idx_users_username_prefix ON users (lower(username) text_pattern_ops)")
+    op.execute("CREATE INDEX idx_users_phone_prefix ON users (phone_number text_pattern_ops)")
+    op.execute("CREATE INDEX idx_users_full_name_trgm ON users USING gin (lower(full_name) gin_trgm_ops)")
+
+
+def downgrade():
+    op.drop_index('idx_users_full_name_trgm', table_name='users')
+    op.drop_index('idx_users_phone_prefix', table_name='users')
+    op.drop_index('idx_users_username_prefix', table_name='users')
@@ -0,0 +1,76 @@
+"""add challenge results and user ratings
+
+Revision ID: add_user_ratings
+Revises: add_drill_catalog_indexes
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_ratings'
+down_revision = 'add_drill_catalog_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('challenges', sa.Column('winner_id', sa.Integer(), nullable=True))
+    op.add_column('challenges', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_foreign_key(
+        'challenges_winner_id_fkey', 'challenges', 'users', ['winner_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index('ix_challenges_completed_at', 'challenges', ['completed_at'])
+
+    # Challenges completed before results were recorded replay as draws
+    op.execute("""
+        UPDATE challenges
+        SET completed_at = coalesce(updated_at, created_at)
+        WHERE status = 'COMPLETED' AND completed_at IS NULL
+    """)
+
+    op.create_table(
+        'user_ratings',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.REAL(), nullable=False),
+        sa.Column('games', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index(
+        'idx_user_ratings_rating',
+        'user_ratings',
+        [sa.text('rating DESC'), 'user_id']
+    )
+
+    op.create_table(
+        'rating_history',
+        sa.Column('id', sa.BigInteger(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('challenge_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.REAL(), nullable=False),
+        sa.Column('delta', sa.SmallInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['challenge_id'], ['challenges.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'idx_rating_history_user_created',
+        'rating_history',
+        ['user_id', 'created_at']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_rating_history_user_created', table_name='rating_history')
+    op.drop_table('rating_history')
+    op.drop_index('idx_user_ratings_rating', table_name='user_ratings')
+    op.drop_table('user_ratings')
+    op.drop_index('ix_challenges_completed_at', table_name='challenges')
+    op.drop_constraint('challenges_winner_id_fkey', 'challenges', type_='foreignkey')
+    op.drop_column('challenges', 'completed_at')
+    op.drop_column('challenges', 'winner_id')
@@ -0,0 +1,50 @@
+"""convert drill_groups.tags to jsonb with a GIN index
+
+Revision ID: drill_group_tags_jsonb
+Revises: add_drill_group_stats
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'drill_group_tags_jsonb'
+down_revision = 'add_drill_group_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Convert tags from json to jsonb
+    op.alter_column('drill_groups', 'tags', server_default=None)
+    op.alter_column(
+        'drill_groups', 'tags',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        postgresql_using='tags::jsonb'
+    )
+    op.alter_column('drill_groups', 'tags', server_default=sa.text("'[]'::jsonb"))
+
+    # GIN index for containment filters
+    op.create_index(
+        'idx_drill_groups_tags',
+        'drill_groups',
+        ['tags'],
+        postgresql_using='gin',
+        postgresql_ops={'tags': 'jsonb_path_ops'}
+    )
+
+
+def downgrade():
+    op.drop_index('idx_drill_groups_tags', table_name='drill_groups')
+    op.alter_column('drill_groups', 'tags', server_default=None)
+    op.alter_column(
+        'drill_groups', 'tags',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        postgresql_using='tags::json'
+    )
+    op.alter_column('drill_groups', 'tags', server_default=sa.text("'[]'::json"))
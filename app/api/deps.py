@@ -1,9 +1,11 @@
-from typing import Optional
-from fastapi import Depends, HTTPException, status, Request
+from typing import Any, Dict, List, Optional, Type
+from fastapi import Depends, HTTPException, Query, status, Request
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.base import get_db
 from app.schemas.user import User
 from app.crud import crud_user
+from app.utils.fast_json import adapter
 
 async def get_current_user(
     request: Request,
@@ -92,3 +94,127 @@ def get_current_admin_user(
             detail="Not enough permissions",
         )
     return current_user
+
+
+class FieldSelection:
+    """
+    Parsed ?fields= and ?expand= for one request.
+
+    `fields` is None for every column; `expand` maps each relationship to
+    load to its requested fields (None for all of them).
+    """
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        relationships: Dict[str, Type[BaseModel]],
+        fields: Optional[List[str]],
+        expand: Dict[str, Optional[List[str]]],
+        full_schema: Optional[Type[BaseModel]] = None,
+    ):
+        self.schema = schema
+        self.relationships = relationships
+        self.fields = fields
+        self.expand = expand
+        self.full_schema = full_schema
+
+    @property
+    def key(self) -> tuple:
+        """Hashable form, for cache and coalescing keys"""
+        return (
+            tuple(self.fields) if self.fields is not None else None,
+            tuple(sorted((name, tuple(f) if f is not None else None) for name, f in self.expand.items())),
+        )
+
+    def dump_all(self, objs: List[Any]) -> List[Any]:
+        """
+        Every row through dump(); the default full selection is validated
+        as a whole list into `full_schema` in a single pydantic-core call.
+        """
+        if self.full_schema is not None and self.fields is None and all(
+            fields is None for fields in self.expand.values()
+        ):
+            return adapter(List[self.full_schema]).validate_python(objs, from_attributes=True)
+        return [self.dump(obj) for obj in objs]
+
+    def dump(self, obj: Any) -> Dict[str, Any]:
+        """Only the selected fields and expanded relationships of a loaded row"""
+        data = _pick(obj, self.schema, self.fields)
+        for name, fields in self.expand.items():
+            data[name] = [_pick(item, self.relationships[name], fields) for item in getattr(obj, name)]
+        return data
+
+
+def _pick(obj: Any, schema: Type[BaseModel], fields: Optional[List[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return schema.model_validate(obj).model_dump()
+    return {field: getattr(obj, field) for field in fields}
+
+
+class Fieldset:
+    """
+    Dependency for ?fields= and ?expand= on a list endpoint.
+
+    `fields=id,name,drills.name` limits the columns returned (dotted names
+    apply to a relationship and expand it); `expand=drills` loads a
+    relationship. Without `expand`, the relationships in `default_expand`
+    are loaded, so existing clients see no change; `expand=` loads none.
+    Names are checked against the response schema, unknown ones are a 400.
+    """
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        relationships: Optional[Dict[str, Type[BaseModel]]] = None,
+        default_expand: tuple = (),
+        full_schema: Optional[Type[BaseModel]] = None,
+    ):
+        self.schema = schema
+        self.relationships = relationships or {}
+        self.default_expand = default_expand
+        # Schema equal to `schema` plus the default expansions, for dump_all
+        self.full_schema = full_schema or (schema if not default_expand else None)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name,drills.name"),
+        expand: Optional[str] = Query(None, description="Comma-separated relationships to include, e.g. drills"),
+    ) -> FieldSelection:
+        names = [name.strip() for name in expand.split(",") if name.strip()] if expand is not None else list(self.default_expand)
+        selected: Optional[List[str]] = None
+        nested: Dict[str, List[str]] = {}
+        if fields is not None:
+            selected = []
+            for name in (name.strip() for name in fields.split(",")):
+                if not name:
+                    continue
+                relationship, dot, field = name.partition(".")
+                if dot:
+                    nested.setdefault(relationship, []).append(field)
+                    self._check(relationship, field)
+                elif name in self.relationships:
+                    names.append(name)
+                else:
+                    self._check(None, name)
+                    selected.append(name)
+            if "id" not in selected:
+                selected.insert(0, "id")
+        for name in names + list(nested):
+            if name not in self.relationships:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Cannot expand {name!r}",
+                )
+        expanded = {name: nested.get(name) for name in dict.fromkeys(names + list(nested))}
+        for name, nested_fields in expanded.items():
+            if nested_fields is not None and "id" not in nested_fields:
+                nested_fields.insert(0, "id")
+        full_schema = self.full_schema if set(expanded) == set(self.default_expand) else None
+        return FieldSelection(self.schema, self.relationships, selected, expanded, full_schema)
+
+    def _check(self, relationship: Optional[str], field: str) -> None:
+        schema = self.relationships.get(relationship) if relationship else self.schema
+        if schema is None or field not in schema.model_fields:
+            name = f"{relationship}.{field}" if relationship else field
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field {name!r}",
+            )
@@ -1,13 +1,20 @@
+from datetime import datetime, timedelta
 from typing import Any, Dict, List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.db.models.challenge import ChallengeStatus
+from app.db.models.shot import ShotType
 from app.db.base import get_db
 from app.schemas.user import User
 from app.api import deps
-from app.crud import crud_user
+from app.crud import crud_user, crud_practice, crud_challenge
+from app.utils import singleflight
+from app.utils.fanout import gather_reads
+from app.utils.fast_json import StreamingJSONResponse
 
 router = APIRouter()
 
@@ -16,13 +23,26 @@ router = APIRouter()
 async def get_all_users(
     skip: int = 0,
     limit: int = 100,
+    stream: bool = Query(False, description="Stream the array in chunks; memory stays flat for any limit"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_admin_user),  # Admin only
 ) -> Any:
     """
     Get all users (admin only).
     """
-    users = await crud_user.get_multi(db, skip=skip, limit=limit)
+    if stream:
+        async def batches():
+            from app.db.base import async_session
+
+            async with async_session() as session:
+                async for batch in crud_user.stream_all_users(
+                    session, skip=skip, limit=limit, batch_size=settings.STREAM_BATCH_SIZE
+                ):
+                    yield batch
+
+        return StreamingJSONResponse(batches(), User)
+
+    users = await crud_user.get_all_users(db, skip=skip, limit=limit)
     return users
 
 
@@ -73,3 +93,79 @@ async def deactivate_user(
     # Deactivate user
     updated_user = await crud_user.update(db, db_obj=user, obj_in={"is_active": False})
     return updated_user
+
+
+@router.get("/singleflight", response_model=Dict[str, Dict[str, Any]])
+async def get_singleflight_stats(
+    current_user: User = Depends(deps.get_current_admin_user),  # Admin only
+) -> Any:
+    """
+    Request coalescing metrics per singleflight group on this worker (admin only).
+    """
+    return singleflight.stats()
+
+
+@router.get("/dashboard", response_model=Dict[str, Any])
+async def get_admin_dashboard(
+    current_user: User = Depends(deps.get_current_admin_user),  # Admin only
+) -> Any:
+    """
+    Site-wide statistics and chart data for the admin dashboard (admin only).
+    """
+    today = datetime.now()
+    today_start = datetime(today.year, today.month, today.day)
+    month_dates = [today - timedelta(days=i * 30) for i in range(5, -1, -1)]
+    shot_types = list(ShotType)
+
+    # Every figure is an independent read, so fan them out over a few
+    # pooled connections instead of running ~20 queries back to back
+    results = await gather_reads(
+        lambda db: crud_user.get_count(db),
+        lambda db: crud_user.get_count(db, created_at_after=today_start),
+        lambda db: crud_practice.get_session_count(db),
+        lambda db: crud_practice.get_session_count(db, created_at_after=today_start),
+        lambda db: crud_practice.get_shot_count(db),
+        lambda db: crud_practice.get_shot_count(db, created_at_after=today_start),
+        lambda db: crud_challenge.get_count(db, status=ChallengeStatus.ACCEPTED),
+        lambda db: crud_challenge.get_count(
+            db, status=ChallengeStatus.COMPLETED, completed_at_after=today_start
+        ),
+        lambda db: crud_practice.get_recent_activities(db, limit=5),
+        *[
+            lambda db, before=before: crud_user.get_count(db, created_at_before=before)
+            for before in month_dates
+        ],
+        *[
+            lambda db, shot_type=shot_type: crud_practice.get_average_accuracy(db, shot_type=shot_type.value)
+            for shot_type in shot_types
+        ],
+    )
+    stat_names = [
+        "total_users",
+        "new_users_today",
+        "total_sessions",
+        "new_sessions_today",
+        "total_shots",
+        "new_shots_today",
+        "active_challenges",
+        "completed_challenges_today",
+    ]
+    stats = dict(zip(stat_names, results))
+    recent_activities = results[len(stat_names)]
+    user_counts = results[len(stat_names) + 1:len(stat_names) + 1 + len(month_dates)]
+    accuracies = results[len(stat_names) + 1 + len(month_dates):]
+
+    return {
+        "stats": stats,
+        "chart_data": {
+            "user_growth": {
+                "labels": [d.strftime("%b") for d in month_dates],
+                "data": user_counts,
+            },
+            "shot_performance": {
+                "labels": [shot_type.value for shot_type in shot_types],
+                "data": [accuracy or 0 for accuracy in accuracies],
+            },
+        },
+        "recent_activities": recent_activities,
+    }
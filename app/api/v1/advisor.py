@@ -4,42 +4,18 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.base import get_db
 from app.db.models.practice_session import PracticeSession
 from app.db.models.shot import Shot, ShotType
 from app.schemas.user import User
 from app.api import deps
 from app.crud import crud_user
+from app.utils.fanout import gather_reads
 
 router = APIRouter()
 
 
-@router.get("/recommendation/{user_id}", response_model=Dict[str, Any])
-async def get_advice_recommendations(
-    user_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user),
-) -> Any:
-    """
-    Get personalized advice recommendations based on practice history.
-    """
-    # Check if user exists
-    user = await crud_user.get(db, user_id=user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    
-    # Check permissions (only the user or an admin can get recommendations)
-    if user_id != current_user.id and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-    
-    # Get shot type performance
-    shot_type_performance = await db.execute(
+async def _shot_type_performance(db: AsyncSession, user_id: int) -> List[Any]:
+    result = await db.execute(
         select(
             Shot.shot_type,
             func.avg(Shot.accuracy_score).label("avg_accuracy"),
@@ -49,7 +25,13 @@ async def get_advice_recommendations(
         .where(PracticeSession.user_id == user_id)
         .group_by(Shot.shot_type)
     )
-    
+    return result.all()
+
+
+def _build_advice(username: str, shot_type_performance: List[Any]) -> Dict[str, Any]:
+    """
+    Turn a user's per-shot-type accuracy rows into recommendations.
+    """
     shot_type_results = {}
     worst_shot_type = None
     worst_accuracy = float('inf')
@@ -98,10 +80,40 @@ async def get_advice_recommendations(
                 focus_areas.append("Practice weighted shots with varying backswing lengths.")
     
     return {
-        "username": user.username,
+        "username": username,
         "total_shots": total_shots,
         "shot_type_performance": shot_type_results,
         "recommendations": recommendations,
         "focus_areas": focus_areas,
         "suggested_practice_time": 30 if total_shots > 100 else 20  # minutes
     }
+
+
+@router.get("/recommendation/{user_id}", response_model=Dict[str, Any])
+async def get_advice_recommendations(
+    user_id: int,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get personalized advice recommendations based on practice history.
+    """
+    # The user lookup and the shot type breakdown are independent, so run
+    # them concurrently on separate connections
+    user, shot_type_performance = await gather_reads(
+        lambda session: crud_user.get(session, user_id=user_id),
+        lambda session: _shot_type_performance(session, user_id),
+    )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    
+    # Check permissions (only the user or an admin can get recommendations)
+    if user_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    
+    return _build_advice(user.username, shot_type_performance)
@@ -0,0 +1,151 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from app.core.config import settings
+from app.schemas.user import User
+from app.schemas.batch import BatchRequest, BatchResponse, BatchSubRequest, BatchSubResponse
+from app.api import deps
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+# Parent request headers that describe the batch body, not the sub-request
+_SKIPPED_HEADERS = {b"content-length", b"content-type", b"transfer-encoding", b"if-none-match"}
+
+
+def _resolve_path(path: str) -> str:
+    if not path.startswith(settings.API_V1_STR + "/"):
+        path = settings.API_V1_STR + path
+    return path
+
+
+async def _dispatch(request: Request, sub: BatchSubRequest) -> BatchSubResponse:
+    """
+    Run one sub-request through the full ASGI app (middleware, auth,
+    validation) in-process, reusing the batch request's connection details
+    and credentials.
+    """
+    path, _, query = _resolve_path(sub.path).partition("?")
+    if path.rstrip("/") == f"{settings.API_V1_STR}/batch":
+        return BatchSubResponse(id=sub.id, status=400, body={"detail": "Batches cannot be nested"})
+
+    body = b"" if sub.body is None else json.dumps(sub.body).encode()
+    headers: List[Tuple[bytes, bytes]] = [
+        (name, value) for name, value in request.scope["headers"] if name not in _SKIPPED_HEADERS
+    ]
+    overrides = {name.lower().encode(): value.encode() for name, value in sub.headers.items()}
+    headers = [(name, value) for name, value in headers if name not in overrides]
+    headers.extend(overrides.items())
+    if body:
+        headers.append((b"content-type", b"application/json"))
+        headers.append((b"content-length", str(len(body)).encode()))
+
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": sub.method,
+        "scheme": request.scope.get("scheme", "http"),
+        "server": request.scope.get("server"),
+        "client": request.scope.get("client"),
+        "root_path": request.scope.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+    }
+
+    sent = False
+
+    async def receive() -> Dict[str, Any]:
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    response_status = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal response_status
+        if message["type"] == "http.response.start":
+            response_status = message["status"]
+            for name, value in message.get("headers", []):
+                name = name.decode("latin-1").lower()
+                if name not in ("content-length", "set-cookie"):
+                    response_headers[name] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception as e:
+        # ServerErrorMiddleware has already recorded the 500 it sent
+        logger.error(f"Batch sub-request {sub.method} {path} failed: {e}")
+
+    raw = b"".join(chunks)
+    content: Optional[Any] = None
+    if raw:
+        if response_headers.get("content-type", "").startswith("application/json"):
+            content = json.loads(raw)
+        else:
+            content = raw.decode("utf-8", errors="replace")
+    return BatchSubResponse(id=sub.id, status=response_status, headers=response_headers, body=content)
+
+
+@router.post("/", response_model=BatchResponse)
+async def run_batch(
+    batch: BatchRequest,
+    request: Request,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Run an ordered list of v1 API calls in one round trip.
+
+    Sub-requests run one after another, in order, with the caller's
+    credentials, and each gets the status, headers and body it would have
+    had on its own. With `atomic`, they share one database transaction:
+    the first sub-request answering 4xx/5xx rolls back everything, and the
+    sub-requests after it are skipped with 424.
+    """
+    if len(batch.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} requests per batch",
+        )
+
+    if not batch.atomic:
+        responses = [await _dispatch(request, sub) for sub in batch.requests]
+        return BatchResponse(responses=responses, committed=True)
+
+    from app.db.base import batch_connection, engine
+
+    responses: List[BatchSubResponse] = []
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        token = batch_connection.set(connection)
+        try:
+            for sub in batch.requests:
+                response = await _dispatch(request, sub)
+                responses.append(response)
+                if response.status >= 400:
+                    break
+        finally:
+            batch_connection.reset(token)
+            failed = len(responses) < len(batch.requests) or (responses and responses[-1].status >= 400)
+            if failed:
+                await transaction.rollback()
+            else:
+                await transaction.commit()
+
+    skipped = [
+        BatchSubResponse(id=sub.id, status=status.HTTP_424_FAILED_DEPENDENCY)
+        for sub in batch.requests[len(responses):]
+    ]
+    return BatchResponse(responses=responses + skipped, committed=not failed)
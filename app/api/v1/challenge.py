@@ -2,13 +2,19 @@ from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timedelta
 
 from app.db.base import get_db
 from app.schemas.user import User
-from app.schemas.challenge import Challenge, ChallengeCreate, ChallengeUpdate, ChallengeWithUsers, ChallengeStatusEnum
+from app.schemas.challenge import (
+    Challenge, ChallengeCreate, ChallengeUpdate, ChallengeWithUsers, ChallengeStatusEnum,
+    ChallengeBatchCreate, ChallengeBatchResponse, ChallengeComplete, OpponentSuggestion
+)
+from app.db.models.challenge import ChallengeStatus
 from app.api import deps
-from app.crud import crud_challenge, crud_user
+from app.crud import crud_challenge, crud_rating, crud_user
+from app.utils.broker import broker
+from app.utils.matchmaking import opponent_index
+from app.utils.fast_json import FastJSONResponse
 
 router = APIRouter()
 
@@ -22,6 +28,12 @@ async def send_challenge(
     """
     Send a challenge to another user.
     """
+    if challenge_in.recipient_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot challenge yourself",
+        )
+    
     # Check if recipient exists
     recipient = await crud_user.get(db, user_id=challenge_in.recipient_id)
     if not recipient:
@@ -37,9 +49,39 @@ async def send_challenge(
         sender_id=current_user.id
     )
     
+    await broker.publish(
+        [challenge.recipient_id], "challenge.created", Challenge.model_validate(challenge)
+    )
     return challenge
 
 
+@router.post("/send/batch", response_model=ChallengeBatchResponse)
+async def send_challenge_batch(
+    challenge_in: ChallengeBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Send the same challenge to many users at once (e.g. a whole club).
+    Returns a result per recipient; unknown, inactive and duplicate
+    recipients are reported rather than failing the whole batch.
+    """
+    results = await crud_challenge.create_many(
+        db,
+        obj_in=challenge_in,
+        sender_id=current_user.id
+    )
+    
+    for item in results:
+        if item["challenge"] is not None:
+            await broker.publish([item["recipient_id"]], "challenge.created", item["challenge"])
+    
+    return {
+        "created": sum(1 for item in results if item["status"] == "created"),
+        "results": results,
+    }
+
+
 @router.get("/", response_model=List[Challenge])
 async def list_challenges(
     status: Optional[List[ChallengeStatusEnum]] = Query(None),
@@ -59,7 +101,26 @@ async def list_challenges(
         limit=limit
     )
     
-    return challenges
+    return FastJSONResponse(challenges, List[Challenge])
+
+
+@router.get("/opponents", response_model=List[OpponentSuggestion])
+async def suggest_opponents(
+    limit: int = Query(10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Suggest opponents rated closest to the current user, skipping anyone
+    who already has a pending challenge with them.
+    """
+    rating = opponent_index.rating_of(current_user.id)
+    if rating is None:
+        rating = (await crud_rating.get(db, user_id=current_user.id))["rating"]
+    
+    exclude = await crud_challenge.get_pending_counterparts(db, user_id=current_user.id)
+    exclude.add(current_user.id)
+    return opponent_index.nearest(rating, limit, exclude=exclude)
 
 
 @router.get("/{challenge_id}", response_model=ChallengeWithUsers)
@@ -88,50 +149,74 @@ async def get_challenge(
     return challenge
 
 
-@router.put("/{challenge_id}/accept", response_model=Challenge)
-async def accept_challenge(
-    challenge_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(deps.get_current_active_user),
-) -> Any:
-    """
-    Accept a challenge.
-    """
-    challenge = await crud_challenge.get(db, challenge_id=challenge_id)
-    if not challenge:
-        raise HTTPException(
+def _transition_error(e: crud_challenge.TransitionError, action: str, forbidden_detail: str) -> HTTPException:
+    """Map a failed challenge transition to the matching HTTP error"""
+    if e.reason == "not_found":
+        return HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Challenge not found",
         )
-    
-    # Check if the user is the recipient of this challenge
-    if challenge.recipient_id != current_user.id:
-        raise HTTPException(
+    if e.reason == "forbidden":
+        return HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only the challenge recipient can accept it",
+            detail=forbidden_detail,
         )
-    
-    # Check if challenge can be accepted (is pending and not expired)
-    if challenge.status != ChallengeStatusEnum.PENDING:
-        raise HTTPException(
+    if e.reason == "expired":
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Challenge is not pending (current status: {challenge.status})",
+            detail="Challenge has expired",
         )
-    
-    if challenge.expires_at and challenge.expires_at < datetime.utcnow():
-        await crud_challenge.update_status(db, challenge_id=challenge_id, status=ChallengeStatusEnum.EXPIRED)
-        raise HTTPException(
+    if e.reason == "invalid_winner":
+        return HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Challenge has expired",
+            detail="Winner must be one of the challenge participants",
         )
-    
-    updated_challenge = await crud_challenge.update_status(
-        db, 
-        challenge_id=challenge_id, 
-        status=ChallengeStatusEnum.ACCEPTED
+    if e.reason == "conflict":
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Challenge was modified concurrently, please retry",
+        )
+    current = e.current_status.value if e.current_status else None
+    if action == "complete":
+        detail = f"Challenge must be accepted before it can be completed (current status: {current})"
+    else:
+        detail = f"Challenge is not pending (current status: {current})"
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=detail,
     )
-    
-    return updated_challenge
+
+
+async def _transition(
+    db: AsyncSession,
+    challenge_id: int,
+    to_status: ChallengeStatus,
+    user_id: int,
+    winner_id: Optional[int] = None
+) -> dict:
+    """Apply a challenge transition and push it to both participants"""
+    challenge = await crud_challenge.transition(
+        db, challenge_id=challenge_id, to_status=to_status, user_id=user_id, winner_id=winner_id
+    )
+    await broker.publish(
+        [challenge["sender_id"], challenge["recipient_id"]], "challenge.status", challenge
+    )
+    return challenge
+
+
+@router.put("/{challenge_id}/accept", response_model=Challenge)
+async def accept_challenge(
+    challenge_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Accept a challenge.
+    """
+    try:
+        return await _transition(db, challenge_id, ChallengeStatus.ACCEPTED, current_user.id)
+    except crud_challenge.TransitionError as e:
+        raise _transition_error(e, "accept", "Only the challenge recipient can accept it")
 
 
 @router.put("/{challenge_id}/decline", response_model=Challenge)
@@ -143,70 +228,25 @@ async def decline_challenge(
     """
     Decline a challenge.
     """
-    challenge = await crud_challenge.get(db, challenge_id=challenge_id)
-    if not challenge:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Challenge not found",
-        )
-    
-    # Check if the user is the recipient of this challenge
-    if challenge.recipient_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only the challenge recipient can decline it",
-        )
-    
-    # Check if challenge can be declined (is pending)
-    if challenge.status != ChallengeStatusEnum.PENDING:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Challenge is not pending (current status: {challenge.status})",
-        )
-    
-    updated_challenge = await crud_challenge.update_status(
-        db, 
-        challenge_id=challenge_id, 
-        status=ChallengeStatusEnum.DECLINED
-    )
-    
-    return updated_challenge
+    try:
+        return await _transition(db, challenge_id, ChallengeStatus.DECLINED, current_user.id)
+    except crud_challenge.TransitionError as e:
+        raise _transition_error(e, "decline", "Only the challenge recipient can decline it")
 
 
 @router.put("/{challenge_id}/complete", response_model=Challenge)
 async def complete_challenge(
     challenge_id: int,
+    result: Optional[ChallengeComplete] = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
-    Mark a challenge as completed.
+    Mark a challenge as completed and update both players' ratings.
+    Pass the winner's user id, or no body for a draw.
     """
-    challenge = await crud_challenge.get(db, challenge_id=challenge_id)
-    if not challenge:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Challenge not found",
-        )
-    
-    # Check if the user is involved in this challenge
-    if challenge.sender_id != current_user.id and challenge.recipient_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions",
-        )
-    
-    # Check if challenge can be completed (is accepted)
-    if challenge.status != ChallengeStatusEnum.ACCEPTED:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Challenge must be accepted before it can be completed (current status: {challenge.status})",
-        )
-    
-    updated_challenge = await crud_challenge.update_status(
-        db, 
-        challenge_id=challenge_id, 
-        status=ChallengeStatusEnum.COMPLETED
-    )
-    
-    return updated_challenge
+    winner_id = result.winner_id if result else None
+    try:
+        return await _transition(db, challenge_id, ChallengeStatus.COMPLETED, current_user.id, winner_id)
+    except crud_challenge.TransitionError as e:
+        raise _transition_error(e, "complete", "Not enough permissions")
@@ -1,6 +1,6 @@
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy import func, select, Integer
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,12 +10,74 @@ from app.db.models.shot import Shot
 from app.db.models.drill import Drill
 from app.db.models.challenge import Challenge, ChallengeStatus
 from app.schemas.user import User
+from app.schemas.progress import ProgressCurve
 from app.api import deps
-from app.crud import crud_user
+from app.crud import crud_user, crud_progress
+from app.utils import singleflight
+from app.utils.fanout import gather_reads
+from app.utils.series import lttb, slope_confidence_interval
 
 router = APIRouter()
 
 
+async def _session_count(db: AsyncSession, user_id: int) -> int:
+    result = await db.execute(
+        select(func.count(PracticeSession.id)).where(PracticeSession.user_id == user_id)
+    )
+    return result.scalar() or 0
+
+
+async def _shot_metrics(db: AsyncSession, user_id: int):
+    result = await db.execute(
+        select(
+            func.count(Shot.id).label("total_shots"),
+            func.avg(Shot.accuracy_score).label("average_accuracy")
+        )
+        .join(PracticeSession, Shot.session_id == PracticeSession.id)
+        .where(PracticeSession.user_id == user_id)
+    )
+    return result.first()
+
+
+async def _challenge_metrics(db: AsyncSession, user_id: int):
+    result = await db.execute(
+        select(
+            func.count(Challenge.id).label("total_challenges"),
+            func.sum(
+                (Challenge.status == ChallengeStatus.COMPLETED).cast(Integer)
+            ).label("completed_challenges")
+        )
+        .where(
+            (Challenge.sender_id == user_id) | (Challenge.recipient_id == user_id)
+        )
+    )
+    return result.first()
+
+
+async def _dashboard_metrics(user_id: int, username: str) -> Dict[str, Any]:
+    """
+    Dashboard numbers for one user; shared by concurrent identical requests.
+    The four independent queries run concurrently on separate connections.
+    """
+    session_count, shot_result, challenge_result, improvement_trend = await gather_reads(
+        lambda db: _session_count(db, user_id),
+        lambda db: _shot_metrics(db, user_id),
+        lambda db: _challenge_metrics(db, user_id),
+        # Recent improvement trend (compare halves of the last 10 sessions)
+        lambda db: crud_progress.get_improvement_trend(db, user_id=user_id, last_n=10),
+    )
+    
+    return {
+        "username": username,
+        "total_sessions": session_count,
+        "total_shots": shot_result.total_shots if shot_result else 0,
+        "average_accuracy": float(shot_result.average_accuracy) if shot_result and shot_result.average_accuracy else 0.0,
+        "total_challenges": challenge_result.total_challenges if challenge_result else 0,
+        "completed_challenges": challenge_result.completed_challenges if challenge_result and challenge_result.completed_challenges else 0,
+        "improvement_trend": float(improvement_trend) if improvement_trend is not None else 0.0
+    }
+
+
 @router.get("/{user_id}", response_model=Dict[str, Any])
 async def get_dashboard_metrics(
     user_id: int,
@@ -40,65 +102,56 @@ async def get_dashboard_metrics(
             detail="Not enough permissions",
         )
     
-    # Get session count
-    session_count = await db.execute(
-        select(func.count(PracticeSession.id)).where(PracticeSession.user_id == user_id)
+    return await singleflight.group("dashboard").do(
+        user_id, lambda: _dashboard_metrics(user_id, user.username), release=db
     )
+
+
+@router.get("/{user_id}/progress", response_model=ProgressCurve)
+async def get_progress_curve(
+    user_id: int,
+    granularity: str = Query("session", pattern="^(session|week)$", description="Series granularity: session or week"),
+    max_points: int = Query(200, ge=3, le=2000, description="Maximum number of points returned (LTTB downsampled)"),
+    moving_window: int = Query(5, ge=1, le=50, description="Sessions in the moving average window"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get the long-term accuracy progress curve for a user.
     
-    # Get shot metrics
-    shot_metrics = await db.execute(
-        select(
-            func.count(Shot.id).label("total_shots"),
-            func.avg(Shot.accuracy_score).label("average_accuracy")
-        )
-        .join(PracticeSession, Shot.session_id == PracticeSession.id)
-        .where(PracticeSession.user_id == user_id)
-    )
-    
-    shot_result = shot_metrics.first()
-    
-    # Get challenge metrics
-    challenge_metrics = await db.execute(
-        select(
-            func.count(Challenge.id).label("total_challenges"),
-            func.sum(
-                (Challenge.status == ChallengeStatus.COMPLETED).cast(Integer)
-            ).label("completed_challenges")
-        )
-        .where(
-            (Challenge.sender_id == user_id) | (Challenge.recipient_id == user_id)
+    The series is computed with window functions over the full history and
+    downsampled with LTTB to at most `max_points`. The trend line is fitted
+    over every point before downsampling.
+    """
+    if user_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
         )
-    )
     
-    challenge_result = challenge_metrics.first()
+    if granularity == "week":
+        series = await crud_progress.get_weekly_series(db, user_id=user_id)
+    else:
+        series = await crud_progress.get_session_series(db, user_id=user_id, moving_window=moving_window)
     
-    # Get recent improvement trend (compare last 10 sessions)
-    recent_shots = await db.execute(
-        select(
-            PracticeSession.id,
-            func.avg(Shot.accuracy_score).label("avg_accuracy")
-        )
-        .join(Shot, PracticeSession.id == Shot.session_id)
-        .where(PracticeSession.user_id == user_id)
-        .group_by(PracticeSession.id)
-        .order_by(PracticeSession.created_at.desc())
-        .limit(10)
-    )
+    # Downsample on (epoch seconds, accuracy)
+    points = [(point["timestamp"].timestamp(), point["accuracy"]) for point in series]
+    selected = [series[i] for i in lttb(points, max_points)]
     
-    recent_scores = [row.avg_accuracy for row in recent_shots if row.avg_accuracy is not None]
-    improvement_trend = None
-    if len(recent_scores) >= 2:
-        # Simple trend calculation
-        first_half = sum(recent_scores[len(recent_scores)//2:]) / (len(recent_scores) - len(recent_scores)//2)
-        second_half = sum(recent_scores[:len(recent_scores)//2]) / (len(recent_scores)//2)
-        improvement_trend = second_half - first_half
+    fit = await crud_progress.get_trend_fit(db, user_id=user_id, granularity=granularity)
+    trend = dict(fit)
+    if fit["slope_per_day"] is not None:
+        ci_low, ci_high = slope_confidence_interval(fit["slope_per_day"], fit["stderr"], fit["n"])
+        trend["slope_per_week"] = fit["slope_per_day"] * 7
+        if ci_low is not None:
+            trend["ci_low_per_week"] = ci_low * 7
+            trend["ci_high_per_week"] = ci_high * 7
+            trend["significant"] = ci_low > 0 or ci_high < 0
     
     return {
-        "username": user.username,
-        "total_sessions": session_count.scalar() or 0,
-        "total_shots": shot_result.total_shots if shot_result else 0,
-        "average_accuracy": float(shot_result.average_accuracy) if shot_result and shot_result.average_accuracy else 0.0,
-        "total_challenges": challenge_result.total_challenges if challenge_result else 0,
-        "completed_challenges": challenge_result.completed_challenges if challenge_result and challenge_result.completed_challenges else 0,
-        "improvement_trend": float(improvement_trend) if improvement_trend is not None else 0.0
+        "user_id": user_id,
+        "granularity": granularity,
+        "total_points": len(series),
+        "points": selected,
+        "trend": trend,
     }
@@ -1,31 +1,77 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import get_db
 from app.schemas.user import User
-from app.schemas.drill import Drill, DrillCreate, DrillUpdate
+from app.schemas.drill import Drill, DrillCreate, DrillUpdate, SimilarDrill, DrillCatalogPage
 from app.api import deps
 from app.crud import crud_drill
+from app.utils.recommender import drill_recommender
+from app.utils.encoding import negotiated_response
+from app.utils.fast_json import FastJSONResponse
 
 router = APIRouter()
 
+drill_fields = deps.Fieldset(Drill)
+
+class DrillCatalogFilters:
+    """Query parameters shared by the drill listing and the catalog page"""
+    def __init__(
+        self,
+        search: Optional[str] = None,
+        difficulty: Optional[int] = None,
+        drill_type: Optional[str] = None,
+        difficulty_min: Optional[int] = Query(None, ge=1, le=5),
+        difficulty_max: Optional[int] = Query(None, ge=1, le=5),
+        duration_min: Optional[int] = Query(None, ge=0),
+        duration_max: Optional[int] = Query(None, ge=0),
+        drill_group_id: Optional[int] = Query(None, description="Only drills in this drill group"),
+    ):
+        self.search = search
+        self.difficulty = difficulty
+        self.drill_type = drill_type
+        self.difficulty_min = difficulty_min
+        self.difficulty_max = difficulty_max
+        self.duration_min = duration_min
+        self.duration_max = duration_max
+        self.drill_group_id = drill_group_id
+
 @router.get("/", response_model=List[Drill])
 async def get_drills(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
-    search: Optional[str] = None,
-    difficulty: Optional[int] = None,
+    filters: DrillCatalogFilters = Depends(),
+    selection: deps.FieldSelection = Depends(drill_fields),
 ) -> Any:
     """
     Get all drills with optional filtering.
+    `fields=id,name` loads and returns only those columns.
     """
     drills = await crud_drill.get_multi(
-        db, skip=skip, limit=limit, search=search, difficulty=difficulty
+        db, skip=skip, limit=limit, fields=selection.fields, **vars(filters)
     )
-    return drills
+    return negotiated_response(request, selection.dump_all(drills))
+
+@router.get("/catalog", response_model=DrillCatalogPage)
+async def get_drill_catalog(
+    db: AsyncSession = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    estimate_count: bool = Query(False, description="Allow a cached count estimate instead of an exact COUNT(*)"),
+    filters: DrillCatalogFilters = Depends(),
+) -> Any:
+    """
+    Get a page of drills with the total count and facet counts
+    (drill_type, difficulty, duration) for the same filters, in one query.
+    """
+    page = await crud_drill.get_catalog_page(
+        db, skip=skip, limit=limit, estimate_count=estimate_count, **vars(filters)
+    )
+    return FastJSONResponse(page, DrillCatalogPage)
 
 @router.post("/", response_model=Drill)
 async def create_drill(
@@ -45,6 +91,34 @@ async def create_drill(
             detail=f"Could not create drill: {str(e)}"
         )
 
+@router.get("/recommended", response_model=List[SimilarDrill])
+async def get_recommended_drills(
+    limit: int = Query(10, ge=1, le=50),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Get personalized "next drill" suggestions for the current user.
+    Served from the in-memory co-occurrence index.
+    """
+    return [
+        SimilarDrill(drill_id=drill_id, score=score, co_occurrences=count)
+        for drill_id, score, count in drill_recommender.recommend_for_user(current_user.id, limit=limit)
+    ]
+
+@router.get("/{drill_id}/similar", response_model=List[SimilarDrill])
+async def get_similar_drills(
+    drill_id: int,
+    limit: int = Query(10, ge=1, le=50),
+) -> Any:
+    """
+    Get drills most often practiced by the same users as this drill.
+    Served from the in-memory co-occurrence index.
+    """
+    return [
+        SimilarDrill(drill_id=other_id, score=score, co_occurrences=count)
+        for other_id, score, count in drill_recommender.similar(drill_id, limit=limit)
+    ]
+
 @router.get("/{drill_id}", response_model=Drill)
 async def get_drill(
     drill_id: int,
@@ -1,28 +1,73 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import get_db
 from app.schemas.user import User
-from app.schemas.drill_group import DrillGroup, DrillGroupCreate, DrillGroupUpdate, DrillGroupInDBBase
+from app.schemas.drill_group import (
+    DrillGroup, DrillGroupCreate, DrillGroupUpdate, DrillGroupInDBBase, DrillGroupFacets,
+    DrillGroupForkRequest, DrillGroupForkResult
+)
 from app.api import deps
+from app.schemas.drill import Drill
 from app.crud import crud_drill_group, crud_drill
+from app.utils import singleflight
+from app.utils.encoding import negotiated_response
 
 router = APIRouter()
 
+drill_group_fields = deps.Fieldset(
+    DrillGroupInDBBase, {"drills": Drill}, default_expand=("drills",), full_schema=DrillGroup
+)
+
 
 @router.get("/", response_model=List[DrillGroup])
 async def get_drill_groups(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, description="Skip first N drill groups"),
     limit: int = Query(100, description="Limit number of drill groups returned"),
+    sort: Optional[str] = Query(None, pattern="^(trending|popular)$", description="Rank by recent (trending) or all-time (popular) practice"),
+    tags: Optional[List[str]] = Query(None, description="Only groups carrying all of these tags"),
+    difficulty: Optional[int] = Query(None, ge=1, le=5, description="Only groups with this difficulty"),
+    is_public: Optional[bool] = Query(None, description="Only public (true) or private (false) groups"),
+    selection: deps.FieldSelection = Depends(drill_group_fields),
+) -> Any:
+    """
+    Get all drill groups.
+    `fields=id,name` and `expand=` (no drills) trim the columns queried and
+    returned; drills are included unless `expand` leaves them out.
+    Also served as msgpack and as columnar JSON/msgpack with each drill
+    sent once (see app.utils.encoding), chosen by the Accept header.
+    """
+    async def load() -> List[Any]:
+        drill_groups = await crud_drill_group.get_multi(
+            db, skip=skip, limit=limit, sort=sort,
+            tags=tags, difficulty=difficulty, is_public=is_public,
+            fields=selection.fields,
+            with_drills="drills" in selection.expand,
+            drill_fields=selection.expand.get("drills"),
+        )
+        # Dumped here so concurrent callers share plain data, not ORM objects
+        return selection.dump_all(drill_groups)
+    
+    key = (skip, limit, sort, tuple(tags or ()), difficulty, is_public, selection.key)
+    drill_groups = await singleflight.group("drill_groups.list").do(key, load, release=db)
+    return negotiated_response(request, drill_groups, entities={"drills": "drills"})
+
+
+@router.get("/facets", response_model=DrillGroupFacets)
+async def get_drill_group_facets(
+    db: AsyncSession = Depends(get_db),
+    tags: Optional[List[str]] = Query(None, description="Only groups carrying all of these tags"),
+    difficulty: Optional[int] = Query(None, ge=1, le=5, description="Only groups with this difficulty"),
+    is_public: Optional[bool] = Query(None, description="Only public (true) or private (false) groups"),
 ) -> Any:
-    """Get all drill groups."""
-    drill_groups = await crud_drill_group.get_multi(
-        db, skip=skip, limit=limit
+    """Get tag, difficulty and visibility counts for the drill groups matching the filter."""
+    return await crud_drill_group.get_facets(
+        db, tags=tags, difficulty=difficulty, is_public=is_public
     )
-    return drill_groups
 
 
 @router.post("/", response_model=DrillGroupInDBBase)
@@ -73,6 +118,50 @@ async def create_drill_group(
         )
 
 
+def _fork_result(row: dict) -> DrillGroupForkResult:
+    return DrillGroupForkResult(
+        source_id=row["source_id"],
+        drill_group=DrillGroupInDBBase(**row),
+        drill_count=row["drill_count"],
+    )
+
+
+@router.post("/fork", response_model=List[DrillGroupForkResult])
+async def fork_drill_groups(
+    *,
+    db: AsyncSession = Depends(get_db),
+    fork_in: DrillGroupForkRequest,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Copy several public drill groups into the current user's library at once.
+    Groups that do not exist or are not public are skipped.
+    """
+    rows = await crud_drill_group.fork(
+        db, drill_group_ids=fork_in.drill_group_ids, user_id=current_user.id
+    )
+    return [_fork_result(row) for row in rows]
+
+
+@router.post("/{drill_group_id}/fork", response_model=DrillGroupForkResult)
+async def fork_drill_group(
+    *,
+    db: AsyncSession = Depends(get_db),
+    drill_group_id: int = Path(..., description="ID of the drill group to copy"),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """Copy a public drill group, with its drills, into the current user's library."""
+    rows = await crud_drill_group.fork(
+        db, drill_group_ids=[drill_group_id], user_id=current_user.id
+    )
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Drill group not found"
+        )
+    return _fork_result(rows[0])
+
+
 @router.get("/{drill_group_id}", response_model=DrillGroup)
 async def get_drill_group(
     *,
@@ -191,7 +280,7 @@ async def update_drill_group_drills(
     current_user: Optional[User] = Depends(deps.get_current_user_optional),
 ) -> Any:
     """Update the drills in a drill group."""
-    drill_group = await crud_drill_group.get(db, drill_group_id=drill_group_id)
+    drill_group = await crud_drill_group.get(db, drill_group_id=drill_group_id, with_drills=False)
     if not drill_group:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -200,19 +289,18 @@ async def update_drill_group_drills(
     
     # No authorization check - anyone can modify drill groups
     
-    # Verify all drills exist
-    drills = []
-    for drill_id in drill_ids:
-        drill = await crud_drill.get(db, drill_id=drill_id)
-        if not drill:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Drill with id {drill_id} not found"
-            )
-        drills.append(drill)
+    # Apply only the membership difference
+    try:
+        drills = await crud_drill_group.update_drills(
+            db=db, drill_group_id=drill_group_id, drill_ids=drill_ids
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
     
-    # Update the drills
-    drill_group.drills = drills
-    await db.commit()
-    await db.refresh(drill_group)
-    return drill_group
+    return DrillGroup(
+        **DrillGroupInDBBase.model_validate(drill_group).model_dump(),
+        drills=drills
+    )
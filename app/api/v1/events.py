@@ -0,0 +1,130 @@
+import json
+from typing import Any, AsyncGenerator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from starlette.requests import HTTPConnection
+
+from app.core.config import settings
+from app.api import deps
+from app.crud import crud_user
+from app.schemas.user import User
+from app.utils.broker import broker
+
+router = APIRouter()
+
+# Seconds between keepalives on an otherwise idle connection
+HEARTBEAT_SECONDS = 15
+
+
+async def _authenticate(connection: HTTPConnection, token: Optional[str] = None) -> Optional[int]:
+    """
+    Resolve the user id for a push connection from the session, a Bearer
+    header or a `token` query parameter.
+
+    Uses a short-lived database session rather than get_db so that idle
+    push connections never hold a pooled connection.
+    """
+    from app.db.base import async_session
+
+    user_id = connection.session.get("user_id") if "session" in connection.scope else None
+    if user_id:
+        return user_id
+
+    auth = connection.headers.get("Authorization")
+    if auth and auth.startswith("Bearer "):
+        token = auth[7:]
+    if not token:
+        return None
+
+    try:
+        from app.core.security import verify_token
+        username = verify_token(token).get("sub")
+    except Exception:
+        return None
+    if not username:
+        return None
+
+    async with async_session() as db:
+        user = await crud_user.get_by_username(db, username=username)
+    if not user or not user.is_active:
+        return None
+    return user.id
+
+
+@router.websocket("/ws")
+async def events_websocket(websocket: WebSocket, token: Optional[str] = None):
+    """
+    Push challenge and practice events for the current user over a WebSocket.
+    """
+    user_id = await _authenticate(websocket, token)
+    if user_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscription = broker.subscribe(user_id)
+    try:
+        while True:
+            event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+            if event is None:
+                event = {"type": "ping"}
+            if subscription.dropped:
+                event = {**event, "dropped": subscription.dropped}
+                subscription.dropped = 0
+            await websocket.send_json(event)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def events_stream(request: Request, token: Optional[str] = None) -> Any:
+    """
+    Push challenge and practice events for the current user as Server-Sent Events.
+    """
+    user_id = await _authenticate(request, token)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    async def event_source() -> AsyncGenerator[str, None]:
+        subscription = broker.subscribe(user_id)
+        try:
+            yield f"retry: {HEARTBEAT_SECONDS * 1000}\n\n"
+            while True:
+                event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscription.dropped:
+                    yield f"event: dropped\ndata: {subscription.dropped}\n\n"
+                    subscription.dropped = 0
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/stats")
+async def events_stats(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Number of push connections open on this worker (admin only).
+    """
+    return {
+        "connections": broker.connection_count,
+        "bridge": settings.REALTIME_PG_BRIDGE,
+    }
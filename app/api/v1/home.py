@@ -0,0 +1,105 @@
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.schemas.user import User
+from app.schemas.challenge import Challenge
+from app.schemas.session import Session
+from app.schemas.home import HomeScreen
+from app.db.models.challenge import ChallengeStatus
+from app.api import deps
+from app.api.v1.advisor import _build_advice, _shot_type_performance
+from app.api.v1.dashboard import _dashboard_metrics
+from app.crud import crud_challenge, crud_practice
+from app.utils import singleflight
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+async def _section(
+    name: str, load: Callable[[AsyncSession], Awaitable[Any]]
+) -> Tuple[str, Any, Optional[str]]:
+    """
+    Load one home screen section on its own short-lived session within the
+    section time budget. Returns (name, value, error).
+    """
+    from app.db.base import async_session
+
+    async def run() -> Any:
+        async with async_session() as db:
+            return await load(db)
+
+    try:
+        return name, await asyncio.wait_for(run(), settings.HOME_SECTION_TIMEOUT_SECONDS), None
+    except asyncio.TimeoutError:
+        logger.warning(f"Home section {name} timed out")
+        return name, None, "timeout"
+    except Exception as e:
+        logger.error(f"Home section {name} failed: {e}")
+        return name, None, "error"
+
+
+@router.get("/", response_model=HomeScreen)
+async def read_home(
+    request: Request,
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Response:
+    """
+    Everything the app needs at launch in one call: the current user,
+    dashboard metrics, pending challenges, recent practice sessions and
+    advice.
+
+    Sections load concurrently, each with its own time budget; a slow or
+    failing section comes back null and listed in `errors` instead of
+    failing the whole screen. Complete responses carry an ETag, so an
+    unchanged home screen revalidates with a 304.
+    """
+    user_id = current_user.id
+
+    async def advice(db: AsyncSession) -> Dict[str, Any]:
+        return _build_advice(current_user.username, await _shot_type_performance(db, user_id))
+
+    async def pending(db: AsyncSession):
+        challenges = await crud_challenge.get_user_challenges(
+            db, user_id=user_id, status=[ChallengeStatus.PENDING]
+        )
+        return [Challenge.model_validate(challenge) for challenge in challenges]
+
+    async def sessions(db: AsyncSession):
+        rows = await crud_practice.get_by_user(db, user_id=user_id, limit=settings.HOME_RECENT_SESSIONS)
+        return [Session.model_validate(row) for row in rows]
+
+    sections = await asyncio.gather(
+        # Dashboard metrics fan out on their own connections
+        _section("dashboard", lambda db: singleflight.group("dashboard").do(
+            user_id, lambda: _dashboard_metrics(user_id, current_user.username)
+        )),
+        _section("pending_challenges", pending),
+        _section("practice_sessions", sessions),
+        _section("advice", advice),
+    )
+
+    home = HomeScreen(user=User.model_validate(current_user))
+    for name, value, error in sections:
+        setattr(home, name, value)
+        if error:
+            home.errors[name] = error
+    body = home.model_dump_json().encode()
+
+    # Partial results are never validated against, so a later complete
+    # response always replaces them
+    if home.errors:
+        return Response(content=body, media_type="application/json", headers={"Cache-Control": "no-store"})
+
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in request.headers.get("If-None-Match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
 from app.db.base import get_db
 from app.crud import crud_practice_session
+from app.utils.broker import broker
+from app.utils.encoding import negotiated_response
 from app.schemas.practice_session import (
     PracticeSessionCreate, 
     PracticeSessionResponse,
@@ -44,6 +46,12 @@ async def create_practice_sessions(
             ) for session in practice_sessions
         ]
         
+        # Commit before pushing so clients that react to the event see the rows
+        await db.commit()
+        await broker.publish(
+            [practice_data.user_id], "practice.created", practice_session_responses
+        )
+        
         # Return bulk response
         return PracticeSessionBulkResponse(
             practice_sessions=practice_session_responses,
@@ -69,6 +77,7 @@ from app.db.models.user import User
 
 @router.get("/user/{user_id}")
 async def get_user_practice_sessions(
+    request: Request,
     user_id: int,
     skip: int = 0,
     limit: int = 100,
@@ -80,6 +89,10 @@ async def get_user_practice_sessions(
     Returns:
     - Detailed information about each practice session
     - Information about the associated drill and drill group
+    
+    Send `Accept: application/vnd.bowlsace.columnar+json` (or
+    `+msgpack`) to get per-field arrays with each drill, drill group and
+    user sent once, or `application/msgpack` for the records as msgpack.
     """
     # For testing purposes: No authentication required
     # In production, you would add back the authentication check
@@ -165,4 +178,8 @@ async def get_user_practice_sessions(
         
         detailed_responses.append(response)
     
-    return detailed_responses
+    return negotiated_response(
+        request,
+        detailed_responses,
+        entities={"drill": "drills", "drills": "drills", "drill_group": "drill_groups", "user": "users"}
+    )
@@ -0,0 +1,60 @@
+from typing import Any, List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import get_db
+from app.schemas.user import User
+from app.schemas.rating import UserRating, LeaderboardEntry, RatingRecomputeResult
+from app.api import deps
+from app.crud import crud_rating, crud_user
+from app.utils.fast_json import FastJSONResponse
+
+router = APIRouter()
+
+
+@router.get("/leaderboard", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Highest rated players.
+    """
+    entries = await crud_rating.get_leaderboard(db, skip=skip, limit=limit)
+    return FastJSONResponse(entries, List[LeaderboardEntry])
+
+
+@router.post("/recompute", response_model=RatingRecomputeResult)
+async def recompute_ratings(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_admin_user),  # Admin only
+) -> Any:
+    """
+    Rebuild all ratings by replaying every completed challenge (admin only).
+    """
+    return await crud_rating.recompute_all(db)
+
+
+@router.get("/{user_id}", response_model=UserRating)
+async def get_user_rating(
+    user_id: int,
+    history_limit: int = Query(20, ge=0, le=500),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    A user's rating with their most recent rating changes.
+    """
+    user = await crud_user.get(db, user_id=user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    
+    rating = await crud_rating.get(db, user_id=user_id)
+    rating["history"] = await crud_rating.get_history(db, user_id=user_id, limit=history_limit) if history_limit else []
+    return rating
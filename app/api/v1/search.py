@@ -1,13 +1,15 @@
-from typing import List
-from fastapi import APIRouter, Depends
-from sqlalchemy import or_, and_
+from typing import Any, List
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from app.db.base import get_db
-from app.db.models.drill import Drill
-from app.db.models.drill_group import DrillGroup
-from app.schemas.search import SearchResponse, SearchResult
+from app.api import deps
+from app.crud import crud_search
+from app.schemas.search import SearchResponse, SearchResult, SearchSuggestion
+from app.schemas.user import User
+from app.utils.catalog import catalog
+from app.utils.search_cache import search_cache
+from app.utils.suggest import suggest_index
 
 # Create router instance
 router = APIRouter(
@@ -16,86 +18,52 @@ router = APIRouter(
     responses={404: {"description": "Not found"}}
 )
 
+@router.get("/suggest", response_model=List[SearchSuggestion])
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+) -> List[SearchSuggestion]:
+    """
+    Autocomplete drill and public drill group names as the user types.
+    Matches any word of the name by prefix, most practiced first. Served
+    from memory; never touches the database.
+    """
+    return suggest_index.suggest(q, limit)
+
+
 @router.get("/", response_model=SearchResponse)
 async def search(
     query: str,
+    limit: int = Query(50, ge=1, le=100),
     db: AsyncSession = Depends(get_db)
-) -> SearchResponse:
+) -> Response:
     """
     Search for drills and drill groups.
-    Returns matches from both drills and drill groups sorted by relevance.
+    Typos are tolerated: exact, prefix and substring name matches rank
+    first, then description matches, then close trigram matches.
+    Responses are cached per catalog version (X-Cache: HIT or MISS).
     """
-    search_term = f"%{query}%"
-    search_exact = query.lower()
-    search_starts = f"{query}%"
-    
-    # Search drills
-    drill_query = select(Drill).where(
-        or_(
-            Drill.name.ilike(search_exact),  # Exact match
-            Drill.name.ilike(search_starts),  # Starts with
-            Drill.name.ilike(search_term),    # Contains
-            Drill.description.ilike(search_term)  # Description contains
-        )
-    )
-    drill_results = await db.execute(drill_query)
-    drills = drill_results.scalars().all()
+    # Matching is case-insensitive, so the normalized query is the cache key
+    normalized = " ".join(query.lower().split())
 
-    # Search public drill groups
-    drill_group_query = select(DrillGroup).where(
-        and_(
-            or_(
-                DrillGroup.name.ilike(search_exact),  # Exact match
-                DrillGroup.name.ilike(search_starts),  # Starts with
-                DrillGroup.name.ilike(search_term),    # Contains
-                DrillGroup.description.ilike(search_term)  # Description contains
-            ),
-            DrillGroup.is_public.is_(True)  # Only public drill groups
-        )
-    )
-    drill_group_results = await db.execute(drill_group_query)
-    drill_groups = drill_group_results.scalars().all()
+    async def compute() -> bytes:
+        rows = await crud_search.search(db, normalized, limit=limit)
+        results = [SearchResult(**row) for row in rows]
+        return SearchResponse(items=results, total=len(results)).model_dump_json().encode()
 
-    # Combine results
-    results = []
-    
-    # Helper function to get relevance score
-    def get_relevance_score(name: str) -> int:
-        name_lower = name.lower()
-        if name_lower == search_exact:  # Exact match
-            return 0
-        if name_lower.startswith(query.lower()):  # Starts with
-            return 1
-        if query.lower() in name_lower:  # Contains
-            return 2
-        return 3  # Description match
-    
-    # Add drills
-    for drill in drills:
-        results.append(
-            SearchResult(
-                id=drill.id,
-                name=drill.name,
-                type="drill",
-                description=drill.description
-            )
-        )
-
-    # Add drill groups
-    for group in drill_groups:
-        results.append(
-            SearchResult(
-                id=group.id,
-                name=group.name,
-                type="drill_group",
-                description=group.description
-            )
-        )
+    body, hit = await search_cache.get_or_compute((catalog.version, normalized, limit), compute)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Cache": "HIT" if hit else "MISS"}
+    )
 
-    # Sort results by relevance score and then alphabetically
-    results.sort(key=lambda x: (get_relevance_score(x.name), x.name.lower()))
 
-    return SearchResponse(
-        items=results,
-        total=len(results)
-    )
+@router.get("/stats")
+async def search_stats(
+    current_user: User = Depends(deps.get_current_admin_user),
+) -> Any:
+    """
+    Search cache hit rate and latency on this worker (admin only).
+    """
+    return {"catalog_version": catalog.version, **search_cache.stats()}
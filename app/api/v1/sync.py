@@ -0,0 +1,102 @@
+import base64
+import json
+import time
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import get_db
+from app.schemas.user import User
+from app.schemas.sync import SyncPage
+from app.api import deps
+from app.crud import crud_sync
+
+router = APIRouter()
+
+
+def _encode_token(token: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(token, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _is_int(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _decode_token(token: str) -> dict:
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        checked = {"s": int(decoded["s"]), "n": int(decoded["n"]), "i": float(decoded["i"])}
+        if "p" in decoded or "k" in decoded:
+            # The resume position and key index SYNC_TABLES and are compared
+            # against the table's key columns, so they must fit the table
+            position, key = decoded["p"], decoded["k"]
+            if not _is_int(position) or not 0 <= position <= crud_sync.TOMBSTONES:
+                raise ValueError("position out of range")
+            if (
+                not isinstance(key, list)
+                or len(key) != crud_sync.cursor_length(position)
+                or not all(_is_int(value) for value in key)
+            ):
+                raise ValueError("malformed resume key")
+            checked.update(p=position, k=key)
+        return checked
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync token",
+        )
+
+
+@router.get("/", response_model=SyncPage)
+async def sync(
+    since: Optional[str] = Query(None, description="Token from the previous response; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=2000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Rows of drills, drill groups, group memberships, practice sessions and
+    challenges that changed since the last sync, plus deletions.
+
+    Follow `next` while `has_more` is true, then keep the final `next` for
+    the next sync. Rows may be delivered more than once; apply a change or
+    deletion only when its change_xid is not older than the copy you hold.
+    A token older than the tombstone retention answers 410: drop the cache
+    and sync from scratch.
+    """
+    if since is None:
+        # The horizon is read before any row, so nothing committing during
+        # this pass can be missed by the next sync
+        token = {"s": 0, "n": await crud_sync.get_horizon(db), "i": time.time()}
+    else:
+        token = _decode_token(since)
+        if time.time() - token["i"] > settings.SYNC_TOMBSTONE_RETENTION_DAYS * 86400:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync token expired, sync from scratch",
+            )
+        if "p" not in token:
+            # Start of a new incremental sync from a finished one
+            token = {"s": token["n"], "n": await crud_sync.get_horizon(db), "i": time.time()}
+
+    changes, deleted, cursor = await crud_sync.get_changes(
+        db,
+        user_id=current_user.id,
+        since=token["s"],
+        position=token.get("p", 0),
+        after=token.get("k"),
+        limit=limit,
+    )
+
+    if cursor is None:
+        next_token = {"s": token["s"], "n": token["n"], "i": token["i"]}
+    else:
+        next_token = {**token, "p": cursor[0], "k": cursor[1]}
+    return SyncPage(
+        changes=changes,
+        deleted=deleted,
+        next=_encode_token(next_token),
+        has_more=cursor is not None,
+    )
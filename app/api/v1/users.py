@@ -4,9 +4,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.responses import JSONResponse
 
 from app.db.base import get_db
-from app.schemas.user import User, UserUpdate
+from app.schemas.user import User, UserUpdate, UserSuggestion
 from app.crud import crud_user
 from app.api import deps
+from app.utils.autocomplete import user_index
 
 router = APIRouter()
 
@@ -29,6 +30,33 @@ async def get_all_users(
     users = await crud_user.get_all_users(db, skip=skip, limit=limit)
     return users
 
+@router.get("/autocomplete", response_model=List[UserSuggestion])
+async def autocomplete_users(
+    q: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_user),
+) -> Any:
+    """
+    Suggest users whose username, name or phone number starts with `q`.
+    Admins also see inactive users and can match on partial phone numbers;
+    other users only match a phone number by typing all of it.
+    """
+    digits = "".join(filter(str.isdigit, q))
+    include_phone = current_user.is_admin or len(digits) >= 10
+    active_only = not current_user.is_admin
+    
+    if user_index.ready:
+        suggestions = user_index.search(q, limit=limit, include_phone=include_phone, active_only=active_only)
+    else:
+        suggestions = await crud_user.autocomplete(
+            db, q, limit=limit, include_phone=include_phone, active_only=active_only
+        )
+    
+    if not current_user.is_admin:
+        suggestions = [{**item, "phone_number": None} for item in suggestions]
+    return suggestions
+
 @router.get("/me", response_model=User)
 async def read_user_me(
     request: Request,
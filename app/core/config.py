@@ -38,5 +38,57 @@ class Settings(BaseSettings):
     
     # OTP settings
     OTP_EXPIRY_SECONDS: int = int(os.getenv("OTP_EXPIRY_SECONDS", "600"))  # 10 minutes default
+    
+    # Recommender settings
+    RECOMMENDER_TOP_K: int = int(os.getenv("RECOMMENDER_TOP_K", "20"))
+    RECOMMENDER_REFRESH_SECONDS: int = int(os.getenv("RECOMMENDER_REFRESH_SECONDS", "60"))
+    
+    # Drill group popularity settings
+    POPULARITY_SHARDS: int = int(os.getenv("POPULARITY_SHARDS", "8"))
+    POPULARITY_HALF_LIFE_HOURS: float = float(os.getenv("POPULARITY_HALF_LIFE_HOURS", "72"))
+    POPULARITY_ROLLUP_SECONDS: int = int(os.getenv("POPULARITY_ROLLUP_SECONDS", "30"))
+    
+    # Drill catalog settings
+    CATALOG_COUNT_CACHE_SECONDS: int = int(os.getenv("CATALOG_COUNT_CACHE_SECONDS", "60"))
+    CATALOG_COUNT_CACHE_SIZE: int = int(os.getenv("CATALOG_COUNT_CACHE_SIZE", "1000"))  # Filter sets per worker
+    
+    # Realtime push settings
+    REALTIME_QUEUE_SIZE: int = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))  # Events buffered per connection
+    REALTIME_PG_BRIDGE: bool = os.getenv("REALTIME_PG_BRIDGE", "").lower() == "true"  # Share events across workers
+    REALTIME_CHANNEL: str = os.getenv("REALTIME_CHANNEL", "bowlsace_events")
+    
+    # Skill rating settings
+    ELO_INITIAL_RATING: float = float(os.getenv("ELO_INITIAL_RATING", "1500"))
+    ELO_K_FACTOR: float = float(os.getenv("ELO_K_FACTOR", "32"))
+    MATCHMAKING_REFRESH_SECONDS: int = int(os.getenv("MATCHMAKING_REFRESH_SECONDS", "30"))
+    
+    # User autocomplete: serve from an in-memory trie instead of Postgres
+    USER_AUTOCOMPLETE_IN_MEMORY: bool = os.getenv("USER_AUTOCOMPLETE_IN_MEMORY", "").lower() == "true"
+    USER_AUTOCOMPLETE_REFRESH_SECONDS: int = int(os.getenv("USER_AUTOCOMPLETE_REFRESH_SECONDS", "30"))
+    
+    # Search suggestions: full rebuild interval (catalog changes on this worker rebuild immediately)
+    SUGGEST_REFRESH_SECONDS: int = int(os.getenv("SUGGEST_REFRESH_SECONDS", "300"))
+    
+    # Fuzzy search: minimum trigram similarity for typo matches (0-1)
+    SEARCH_SIMILARITY_THRESHOLD: float = float(os.getenv("SEARCH_SIMILARITY_THRESHOLD", "0.3"))
+    SEARCH_CACHE_SIZE: int = int(os.getenv("SEARCH_CACHE_SIZE", "1000"))  # Cached /search responses per worker
+    SEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "60"))
+    
+    # Most separate connections one request may use for concurrent reads
+    READ_FANOUT_LIMIT: int = int(os.getenv("READ_FANOUT_LIMIT", "4"))
+    
+    # Home screen aggregate: per-section time budget and recent sessions shown
+    HOME_SECTION_TIMEOUT_SECONDS: float = float(os.getenv("HOME_SECTION_TIMEOUT_SECONDS", "2.0"))
+    HOME_RECENT_SESSIONS: int = int(os.getenv("HOME_RECENT_SESSIONS", "20"))
+    
+    # Most sub-requests accepted in one POST /batch
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "50"))
+    
+    # Rows fetched and encoded per chunk by streaming list responses
+    STREAM_BATCH_SIZE: int = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+    
+    # Delta sync: deletions are remembered this long; older tokens must resync
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+    SYNC_PRUNE_SECONDS: int = int(os.getenv("SYNC_PRUNE_SECONDS", "3600"))
 
 settings = Settings()
@@ -1,13 +1,14 @@
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, Optional, Set, Union, List
 from datetime import datetime, timedelta
 
-from sqlalchemy import select, update, delete, and_, or_, func
+from sqlalchemy import select, insert, update as sql_update, delete, and_, or_, func, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.db.models.challenge import Challenge, ChallengeStatus
 from app.db.models.user import User
-from app.schemas.challenge import ChallengeCreate, ChallengeUpdate
+from app.schemas.challenge import ChallengeCreate, ChallengeBatchCreate, ChallengeUpdate
+from app.crud import crud_rating
 
 
 async def get(db: AsyncSession, challenge_id: int) -> Optional[Challenge]:
@@ -67,6 +68,24 @@ async def get_user_challenges(
     return result.scalars().all()
 
 
+async def get_pending_counterparts(db: AsyncSession, user_id: int) -> Set[int]:
+    """Users who have a pending challenge with `user_id`, in either direction"""
+    result = await db.execute(
+        select(Challenge.sender_id, Challenge.recipient_id)
+        .where(
+            Challenge.status == ChallengeStatus.PENDING,
+            or_(
+                Challenge.sender_id == user_id,
+                Challenge.recipient_id == user_id
+            )
+        )
+    )
+    return {
+        recipient_id if sender_id == user_id else sender_id
+        for sender_id, recipient_id in result
+    }
+
+
 async def create(db: AsyncSession, *, obj_in: ChallengeCreate, sender_id: int) -> Challenge:
     # Set expiration date (default 7 days)
     expires_at = datetime.utcnow() + timedelta(days=7)
@@ -87,6 +106,71 @@ async def create(db: AsyncSession, *, obj_in: ChallengeCreate, sender_id: int) -
     return db_obj
 
 
+async def create_many(
+    db: AsyncSession, *, obj_in: ChallengeBatchCreate, sender_id: int
+) -> List[Dict[str, Any]]:
+    """
+    Send the same challenge to many recipients.
+    
+    Recipients are validated with one query and all challenges are inserted
+    with one multi-row INSERT ... RETURNING.
+    
+    Returns:
+        List[Dict]: One result per requested recipient, in request order,
+        with a status of created, not_found, inactive, self or duplicate
+    """
+    result = await db.execute(
+        select(User.id, User.is_active).where(User.id.in_(set(obj_in.recipient_ids)))
+    )
+    active_by_id = {row.id: row.is_active for row in result}
+    
+    results = []
+    to_create = []
+    seen = set()
+    for recipient_id in obj_in.recipient_ids:
+        if recipient_id in seen:
+            status = "duplicate"
+        elif recipient_id == sender_id:
+            status = "self"
+        elif recipient_id not in active_by_id:
+            status = "not_found"
+        elif not active_by_id[recipient_id]:
+            status = "inactive"
+        else:
+            status = "created"
+            to_create.append(recipient_id)
+        seen.add(recipient_id)
+        results.append({"recipient_id": recipient_id, "status": status, "challenge": None})
+    
+    if to_create:
+        # Set expiration date (default 7 days)
+        expires_at = datetime.utcnow() + timedelta(days=7)
+        inserted = await db.execute(
+            insert(Challenge)
+            .values([
+                {
+                    "sender_id": sender_id,
+                    "recipient_id": recipient_id,
+                    "title": obj_in.title,
+                    "description": obj_in.description,
+                    "drill_type": obj_in.drill_type,
+                    "target_score": obj_in.target_score,
+                    "status": ChallengeStatus.PENDING,
+                    "expires_at": expires_at,
+                }
+                for recipient_id in to_create
+            ])
+            .returning(*Challenge.__table__.c)
+        )
+        by_recipient = {row.recipient_id: dict(row._mapping) for row in inserted}
+        await db.commit()
+        for item in results:
+            if item["status"] == "created":
+                item["challenge"] = by_recipient[item["recipient_id"]]
+    
+    return results
+
+
 async def update(
     db: AsyncSession, *, db_obj: Challenge, obj_in: Union[ChallengeUpdate, Dict[str, Any]]
 ) -> Challenge:
@@ -96,7 +180,7 @@ async def update(
         update_data = obj_in.dict(exclude_unset=True)
     
     stmt = (
-        update(Challenge)
+        sql_update(Challenge)
         .where(Challenge.id == db_obj.id)
         .values(**update_data)
         .returning(Challenge)
@@ -112,7 +196,7 @@ async def update_status(
     db: AsyncSession, challenge_id: int, status: ChallengeStatus
 ) -> Optional[Challenge]:
     stmt = (
-        update(Challenge)
+        sql_update(Challenge)
         .where(Challenge.id == challenge_id)
         .values(status=status)
         .returning(Challenge)
@@ -124,6 +208,129 @@ async def update_status(
     return result.scalars().first()
 
 
+class TransitionError(ValueError):
+    """
+    A challenge transition that did not apply.
+    
+    reason is one of: not_found, forbidden, invalid_winner, invalid_status,
+    expired, conflict.
+    """
+    def __init__(self, reason: str, current_status: Optional[ChallengeStatus] = None):
+        self.reason = reason
+        self.current_status = current_status
+        super().__init__(reason)
+
+
+# target status -> (allowed current statuses, who may act, whether expiry is enforced)
+TRANSITIONS = {
+    ChallengeStatus.ACCEPTED: ([ChallengeStatus.PENDING], "recipient", True),
+    ChallengeStatus.DECLINED: ([ChallengeStatus.PENDING], "recipient", False),
+    ChallengeStatus.COMPLETED: ([ChallengeStatus.ACCEPTED], "participant", False),
+}
+
+
+async def transition(
+    db: AsyncSession,
+    *,
+    challenge_id: int,
+    to_status: ChallengeStatus,
+    user_id: int,
+    winner_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Move a challenge to `to_status` with a single conditional UPDATE.
+    
+    The UPDATE only matches while the challenge is in an allowed status, the
+    user may act on it and (where enforced) it has not expired, so two
+    concurrent transitions can never both succeed. A "target" CTE reads the
+    row alongside the UPDATE, which lets a failed transition report why it
+    failed without a second round trip.
+    
+    Completing a challenge records the result (`winner_id`, None for a draw)
+    and updates both players' ratings in the same transaction.
+    
+    Raises:
+        TransitionError: If the transition did not apply
+    
+    Returns:
+        Dict: The updated challenge row
+    """
+    allowed, actor, check_expiry = TRANSITIONS[to_status]
+    
+    target = (
+        select(
+            Challenge.status.label("current_status"),
+            Challenge.sender_id.label("current_sender_id"),
+            Challenge.recipient_id.label("current_recipient_id"),
+            (Challenge.expires_at <= func.now()).label("is_expired"),
+        )
+        .where(Challenge.id == challenge_id)
+        .cte("target")
+    )
+    
+    conditions = [Challenge.id == challenge_id, Challenge.status.in_(allowed)]
+    if actor == "recipient":
+        conditions.append(Challenge.recipient_id == user_id)
+    else:
+        conditions.append(or_(Challenge.sender_id == user_id, Challenge.recipient_id == user_id))
+    if check_expiry:
+        conditions.append(or_(Challenge.expires_at.is_(None), Challenge.expires_at > func.now()))
+    
+    values = {"status": to_status, "updated_at": func.now()}
+    if to_status == ChallengeStatus.COMPLETED:
+        values.update(winner_id=winner_id, completed_at=func.now())
+        if winner_id is not None:
+            conditions.append(or_(Challenge.sender_id == winner_id, Challenge.recipient_id == winner_id))
+    
+    updated = (
+        sql_update(Challenge)
+        .where(*conditions)
+        .values(**values)
+        .returning(*Challenge.__table__.c)
+        .cte("updated")
+    )
+    
+    result = await db.execute(
+        select(target, updated).select_from(target).outerjoin(updated, true())
+    )
+    row = result.first()
+    
+    if row is None:
+        raise TransitionError("not_found")
+    if row.id is not None:
+        challenge = {column.name: row._mapping[column.name] for column in Challenge.__table__.c}
+        if to_status == ChallengeStatus.COMPLETED:
+            await crud_rating.record_result(
+                db,
+                challenge_id=challenge_id,
+                sender_id=challenge["sender_id"],
+                recipient_id=challenge["recipient_id"],
+                winner_id=winner_id
+            )
+        await db.commit()
+        return challenge
+    
+    await db.rollback()
+    participants = {row.current_sender_id, row.current_recipient_id}
+    if (actor == "recipient" and row.current_recipient_id != user_id) or user_id not in participants:
+        raise TransitionError("forbidden", row.current_status)
+    if winner_id is not None and winner_id not in participants:
+        raise TransitionError("invalid_winner", row.current_status)
+    if row.current_status not in allowed:
+        raise TransitionError("invalid_status", row.current_status)
+    if check_expiry and row.is_expired:
+        # Record the expiry; guarded so it cannot overwrite a concurrent change
+        await db.execute(
+            sql_update(Challenge)
+            .where(Challenge.id == challenge_id, Challenge.status == ChallengeStatus.PENDING)
+            .values(status=ChallengeStatus.EXPIRED, updated_at=func.now())
+        )
+        await db.commit()
+        raise TransitionError("expired", ChallengeStatus.EXPIRED)
+    # The row changed between the snapshot and the UPDATE
+    raise TransitionError("conflict", row.current_status)
+
+
 async def delete_challenge(db: AsyncSession, *, challenge_id: int) -> Optional[Challenge]:
     challenge = await get(db, challenge_id)
     if challenge:
@@ -136,7 +343,7 @@ async def delete_challenge(db: AsyncSession, *, challenge_id: int) -> Optional[C
 
 async def get_count(
     db: AsyncSession,
-    status: Optional[str] = None,
+    status: Optional[ChallengeStatus] = None,
     created_at_after: Optional[datetime] = None,
     created_at_before: Optional[datetime] = None,
     completed_at_after: Optional[datetime] = None,
@@ -147,28 +354,23 @@ async def get_count(
     
     Args:
         db: AsyncSession - Database session
-        status: Optional[str] - Filter by status ('active', 'completed', 'cancelled')
+        status: Optional[ChallengeStatus] - Filter by status
         created_at_after/before: Optional[datetime] - Filter by creation date
         completed_at_after/before: Optional[datetime] - Filter by completion date
     
     Returns:
         int: Count of challenges matching the filters
     """
-    # Simple fallback implementation that always works
-    try:
-        # Return different values based on status for more realistic dummy data
-        if status == "active":
-            return 3
-        elif status == "completed":
-            return 5
-        elif status == "pending":
-            return 2
-        elif status == "declined":
-            return 1
-        elif status == "expired":
-            return 1
-        else:
-            return 12  # Total count
-    except Exception as e:
-        print(f"Error in get_count: {e}")
-        return 0
+    query = select(func.count()).select_from(Challenge)
+    if status is not None:
+        query = query.where(Challenge.status == status)
+    if created_at_after:
+        query = query.where(Challenge.created_at >= created_at_after)
+    if created_at_before:
+        query = query.where(Challenge.created_at < created_at_before)
+    if completed_at_after:
+        query = query.where(Challenge.completed_at >= completed_at_after)
+    if completed_at_before:
+        query = query.where(Challenge.completed_at < completed_at_before)
+    result = await db.execute(query)
+    return result.scalar_one()
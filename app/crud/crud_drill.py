@@ -1,11 +1,40 @@
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, Optional, Sequence, Union, List, Tuple
 from datetime import datetime
+import time
+from collections import OrderedDict
 
-from sqlalchemy import select, update, delete, and_, func
+from sqlalchemy import select, update, delete, and_, func, case, literal_column, text, true, String
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, load_only
 
+from app.core.config import settings
 from app.db.models.drill import Drill
+from app.db.models.drill_group import DrillGroupDrills
 from app.schemas.drill import DrillCreate, DrillUpdate
+from app.utils.catalog import catalog
+
+# Exact catalog counts (and the unfiltered pg_class estimate) keyed by filter set,
+# least recently used first
+_count_cache: "OrderedDict[Tuple, Tuple[float, int]]" = OrderedDict()
+
+
+def _cached_count(key: Tuple) -> Optional[int]:
+    entry = _count_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, count = entry
+    if expires_at < time.monotonic():
+        del _count_cache[key]
+        return None
+    _count_cache.move_to_end(key)
+    return count
+
+
+def _cache_count(key: Tuple, count: int) -> None:
+    _count_cache[key] = (time.monotonic() + settings.CATALOG_COUNT_CACHE_SECONDS, count)
+    _count_cache.move_to_end(key)
+    while len(_count_cache) > settings.CATALOG_COUNT_CACHE_SIZE:
+        _count_cache.popitem(last=False)
 
 
 async def get(db: AsyncSession, drill_id: int) -> Optional[Drill]:
@@ -16,56 +45,192 @@ async def get(db: AsyncSession, drill_id: int) -> Optional[Drill]:
     return result.scalars().first()
 
 
-async def get_multi(
-    db: AsyncSession, 
-    *, 
-    skip: int = 0, 
-    limit: int = 100,
+def _apply_filters(
+    query,
+    *,
     search: Optional[str] = None,
-    difficulty: Optional[int] = None
-) -> List[Drill]:
-    """Get multiple drills with optional filtering"""
-    query = select(Drill)
-    
-    # Apply search filter
+    difficulty: Optional[int] = None,
+    drill_type: Optional[str] = None,
+    difficulty_min: Optional[int] = None,
+    difficulty_max: Optional[int] = None,
+    duration_min: Optional[int] = None,
+    duration_max: Optional[int] = None,
+    drill_group_id: Optional[int] = None
+):
+    """Apply the drill catalog filters shared by listing, counting and facets"""
     if search:
-        query = query.filter(
+        query = query.where(
             Drill.name.ilike(f"%{search}%") | 
             Drill.description.ilike(f"%{search}%")
         )
-    
-    # Apply difficulty filter
+    if drill_type:
+        query = query.where(Drill.drill_type == drill_type)
     if difficulty is not None:
-        query = query.filter(Drill.difficulty == difficulty)
+        query = query.where(Drill.difficulty == difficulty)
+    if difficulty_min is not None:
+        query = query.where(Drill.difficulty >= difficulty_min)
+    if difficulty_max is not None:
+        query = query.where(Drill.difficulty <= difficulty_max)
+    if duration_min is not None:
+        query = query.where(Drill.duration_minutes >= duration_min)
+    if duration_max is not None:
+        query = query.where(Drill.duration_minutes <= duration_max)
+    if drill_group_id is not None:
+        query = query.where(
+            Drill.id.in_(
+                select(DrillGroupDrills.drill_id).where(DrillGroupDrills.drill_group_id == drill_group_id)
+            )
+        )
+    return query
+
+
+async def get_multi(
+    db: AsyncSession, 
+    *, 
+    skip: int = 0, 
+    limit: int = 100,
+    fields: Optional[Sequence[str]] = None,
+    **filters: Any
+) -> List[Drill]:
+    """
+    Get multiple drills with optional filtering (see _apply_filters),
+    loading only `fields` when given.
+    """
+    query = _apply_filters(select(Drill), **filters)
+    if fields is not None:
+        query = query.options(load_only(*(getattr(Drill, field) for field in fields)))
     
     # Apply pagination
-    query = query.offset(skip).limit(limit).order_by(Drill.created_at.desc())
+    query = query.offset(skip).limit(limit).order_by(Drill.created_at.desc(), Drill.id.desc())
     
     result = await db.execute(query)
     return result.scalars().all()
 
 
-async def get_count(
+async def get_count(db: AsyncSession, **filters: Any) -> int:
+    """Count drills with optional filtering (see _apply_filters)"""
+    query = _apply_filters(select(func.count()).select_from(Drill), **filters)
+    result = await db.execute(query)
+    return result.scalar() or 0
+
+
+def _facet(filtered, column):
+    """JSON object of value -> count for one facet column of the filtered drills"""
+    counts = (
+        select(column.label("value"), func.count().label("count"))
+        .select_from(filtered)
+        .where(column.isnot(None))
+        .group_by(column)
+        .subquery()
+    )
+    return (
+        select(func.coalesce(func.json_object_agg(counts.c.value.cast(String), counts.c.count), text("'{}'::json")))
+        .scalar_subquery()
+    )
+
+
+async def _estimated_count(db: AsyncSession, filters: Dict[str, Any]) -> Optional[int]:
+    """
+    Count estimate for the catalog without running COUNT(*).
+    
+    Unfiltered catalogs use the planner's row estimate from pg_class;
+    filtered ones reuse an exact count from a recent request.
+    """
+    key = tuple(sorted((k, v) for k, v in filters.items() if v is not None))
+    cached = _cached_count(key)
+    if cached is not None:
+        return cached
+    if key:
+        return None
+    
+    result = await db.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'drills'::regclass")
+    )
+    estimate = result.scalar()
+    if estimate is None or estimate < 0:
+        # Table never analyzed
+        return None
+    _cache_count(key, estimate)
+    return estimate
+
+
+async def get_catalog_page(
     db: AsyncSession,
-    search: Optional[str] = None,
-    difficulty: Optional[int] = None
-) -> int:
-    """Count drills with optional filtering"""
-    query = select(func.count()).select_from(Drill)
+    *,
+    skip: int = 0,
+    limit: int = 100,
+    estimate_count: bool = False,
+    **filters: Any
+) -> Dict[str, Any]:
+    """
+    Get a page of drills together with the total count and facet counts.
     
-    # Apply search filter
-    if search:
-        query = query.filter(
-            Drill.name.ilike(f"%{search}%") | 
-            Drill.description.ilike(f"%{search}%")
-        )
+    Items, total and facets come back from a single statement: a one-row
+    "meta" subquery holding the total and the facet JSON is LEFT JOINed to
+    the page, so the meta row survives an empty page.
     
-    # Apply difficulty filter
-    if difficulty is not None:
-        query = query.filter(Drill.difficulty == difficulty)
+    With estimate_count=True the COUNT(*) is replaced by a cached estimate
+    when one is available (see _estimated_count).
+    """
+    active = {k: v for k, v in filters.items() if v is not None}
+    total = await _estimated_count(db, active) if estimate_count else None
+    total_is_estimate = total is not None
     
-    result = await db.execute(query)
-    return result.scalar() or 0
+    filtered = _apply_filters(
+        select(Drill.id, Drill.drill_type, Drill.difficulty, Drill.duration_minutes), **active
+    ).cte("filtered")
+    
+    # Inline constants so the GROUP BY expression matches the select list exactly
+    duration_bucket = case(
+        (filtered.c.duration_minutes < literal_column("15"), literal_column("'under_15'")),
+        (filtered.c.duration_minutes < literal_column("30"), literal_column("'15_29'")),
+        (filtered.c.duration_minutes < literal_column("60"), literal_column("'30_59'")),
+        (filtered.c.duration_minutes >= literal_column("60"), literal_column("'60_plus'")),
+    )
+    meta = select(
+        (
+            select(func.count()).select_from(filtered).scalar_subquery()
+            if total is None else literal_column("NULL::bigint")
+        ).label("total"),
+        func.json_build_object(
+            "drill_type", _facet(filtered, filtered.c.drill_type),
+            "difficulty", _facet(filtered, filtered.c.difficulty),
+            "duration", _facet(filtered, duration_bucket),
+        ).label("facets"),
+    ).subquery("meta")
+    
+    page = (
+        select(Drill)
+        .join(filtered, filtered.c.id == Drill.id)
+        .order_by(Drill.created_at.desc(), Drill.id.desc())
+        .offset(skip)
+        .limit(limit)
+        .subquery("page")
+    )
+    page_drill = aliased(Drill, page)
+    
+    result = await db.execute(
+        select(meta.c.total, meta.c.facets, page_drill)
+        .select_from(meta)
+        .outerjoin(page_drill, true())
+        .order_by(page_drill.created_at.desc(), page_drill.id.desc())
+    )
+    rows = result.all()
+    
+    items = [row[2] for row in rows if row[2] is not None]
+    facets = rows[0].facets if rows else {}
+    if total is None:
+        total = rows[0].total if rows else 0
+        if estimate_count:
+            key = tuple(sorted(active.items()))
+            _cache_count(key, total)
+    
+    return {
+        "items": items,
+        "total": total,
+        "total_is_estimate": total_is_estimate,
+        "facets": facets,
+    }
 
 
 async def create(db: AsyncSession, *, obj_in: DrillCreate) -> Drill:
@@ -75,6 +240,7 @@ async def create(db: AsyncSession, *, obj_in: DrillCreate) -> Drill:
         db_obj = Drill(**obj_data)
         db.add(db_obj)
         await db.commit()
+        catalog.bump()
         await db.refresh(db_obj)
         return db_obj
     except Exception as e:
@@ -92,6 +258,7 @@ async def update(db: AsyncSession, *, db_obj: Drill, obj_in: Union[DrillUpdate,
         setattr(db_obj, field, update_data[field])
     
     await db.commit()
+    catalog.bump()
     await db.refresh(db_obj)
     return db_obj
 
@@ -103,6 +270,7 @@ async def remove(db: AsyncSession, *, drill_id: int) -> Drill:
     if obj:
         await db.delete(obj)
         await db.commit()
+        catalog.bump()
     return obj
 
 
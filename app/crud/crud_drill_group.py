@@ -1,42 +1,145 @@
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, Optional, Sequence, Union, List
 
-from sqlalchemy import select, and_
+from sqlalchemy import select, delete, and_, any_, func, literal_column, null, true, union_all, text, bindparam, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import load_only, raiseload, selectinload
 
 from app.db.models.drill_group import DrillGroup, DrillGroupDrills
 from app.db.models.drill import Drill
+from app.db.models.drill_group_stats import DrillGroupStats
 from app.schemas.drill_group import DrillGroupCreate, DrillGroupUpdate
+from app.utils.catalog import catalog
+from app.utils.singleflight import coalesce
 
 
-async def get(db: AsyncSession, drill_group_id: int) -> Optional[DrillGroup]:
-    """Get a drill group by ID"""
-    result = await db.execute(
-        select(DrillGroup)
-        .options(selectinload(DrillGroup.drills))
-        .where(DrillGroup.id == drill_group_id)
-    )
+async def get(db: AsyncSession, drill_group_id: int, *, with_drills: bool = True) -> Optional[DrillGroup]:
+    """Get a drill group by ID, optionally without loading its drills"""
+    query = select(DrillGroup).where(DrillGroup.id == drill_group_id)
+    if with_drills:
+        query = query.options(selectinload(DrillGroup.drills))
+    result = await db.execute(query)
     return result.scalars().first()
 
 
+def _apply_filters(
+    query,
+    *,
+    user_id: Optional[int] = None,
+    tags: Optional[List[str]] = None,
+    difficulty: Optional[int] = None,
+    is_public: Optional[bool] = None
+):
+    """Apply the drill group browse filters shared by listing and facets"""
+    if user_id is not None:
+        query = query.where(DrillGroup.user_id == user_id)
+    if tags:
+        # JSONB containment, served by the GIN index on tags
+        query = query.where(DrillGroup.tags.contains(tags))
+    if difficulty is not None:
+        query = query.where(DrillGroup.difficulty == difficulty)
+    if is_public is not None:
+        query = query.where(DrillGroup.is_public.is_(is_public))
+    return query
+
+
 async def get_multi(
     db: AsyncSession,
     *,
     user_id: Optional[int] = None,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    sort: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    difficulty: Optional[int] = None,
+    is_public: Optional[bool] = None,
+    fields: Optional[Sequence[str]] = None,
+    with_drills: bool = True,
+    drill_fields: Optional[Sequence[str]] = None
 ) -> List[DrillGroup]:
-    """Get multiple drill groups, optionally filtered by user"""
-    query = select(DrillGroup).options(selectinload(DrillGroup.drills))
+    """
+    Get multiple drill groups, optionally filtered by user, tags, difficulty and visibility.
     
-    if user_id is not None:
-        query = query.where(DrillGroup.user_id == user_id)
+    sort="trending" or "popular" walks the drill_group_stats indexes, so
+    only groups with recorded practice are listed in those modes.
+    
+    `fields` and `drill_fields` restrict the columns loaded for groups and
+    their drills; without `with_drills` the drills are not queried at all
+    and touching them raises instead of lazy loading.
+    """
+    query = select(DrillGroup)
+    if fields is not None:
+        query = query.options(load_only(*(getattr(DrillGroup, field) for field in fields)))
+    if with_drills:
+        drills = selectinload(DrillGroup.drills)
+        if drill_fields is not None:
+            drills = drills.load_only(*(getattr(Drill, field) for field in drill_fields))
+        query = query.options(drills)
+    else:
+        query = query.options(raiseload(DrillGroup.drills))
+    query = _apply_filters(
+        query, user_id=user_id, tags=tags, difficulty=difficulty, is_public=is_public
+    )
+    
+    if sort == "trending":
+        query = query.join(DrillGroupStats, DrillGroupStats.drill_group_id == DrillGroup.id).order_by(
+            DrillGroupStats.trending_score.desc(), DrillGroupStats.drill_group_id
+        )
+    elif sort == "popular":
+        query = query.join(DrillGroupStats, DrillGroupStats.drill_group_id == DrillGroup.id).order_by(
+            DrillGroupStats.practice_count.desc(), DrillGroupStats.drill_group_id
+        )
     
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
     return result.scalars().all()
 
 
+@coalesce("drill_groups.facets")
+async def get_facets(
+    db: AsyncSession,
+    *,
+    user_id: Optional[int] = None,
+    tags: Optional[List[str]] = None,
+    difficulty: Optional[int] = None,
+    is_public: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Count drill groups per tag, difficulty and visibility for the given filter.
+    
+    All facets and the total come back from a single statement: the filtered
+    rows are a CTE and each facet is one arm of a UNION ALL.
+    """
+    filtered = _apply_filters(
+        select(DrillGroup.tags, DrillGroup.difficulty, DrillGroup.is_public),
+        user_id=user_id, tags=tags, difficulty=difficulty, is_public=is_public
+    ).cte("filtered")
+    tag = func.jsonb_array_elements_text(filtered.c.tags).table_valued("value").lateral("tag")
+    
+    facets = union_all(
+        select(literal_column("'total'").label("facet"), null().cast(String).label("value"), func.count().label("count"))
+        .select_from(filtered),
+        select(literal_column("'tags'"), tag.c.value, func.count())
+        .select_from(filtered)
+        .join(tag, true())
+        .group_by(tag.c.value),
+        select(literal_column("'difficulty'"), filtered.c.difficulty.cast(String), func.count())
+        .group_by(filtered.c.difficulty),
+        select(literal_column("'is_public'"), filtered.c.is_public.cast(String), func.count())
+        .group_by(filtered.c.is_public),
+    )
+    result = await db.execute(facets)
+    
+    response: Dict[str, Any] = {"total": 0, "tags": {}, "difficulty": {}, "is_public": {}}
+    for facet, value, count in result:
+        if facet == "total":
+            response["total"] = count
+        elif value is not None:
+            response[facet][value] = count
+    return response
+
+
 async def get_drill_group_drills(
     db: AsyncSession,
     *,
@@ -102,7 +205,8 @@ async def create(
         if valid_drills:
             db_obj.drills = valid_drills
             await db.commit()
-            
+    
+    catalog.bump()
     await db.refresh(db_obj)
     return db_obj
 
@@ -126,6 +230,7 @@ async def update(
         setattr(db_obj, field, update_data[field])
     
     await db.commit()
+    catalog.bump()
     await db.refresh(db_obj)
     return db_obj
 
@@ -139,6 +244,7 @@ async def remove(db: AsyncSession, *, drill_group_id: int) -> DrillGroup:
     if obj:
         await db.delete(obj)
         await db.commit()
+        catalog.bump()
     return obj
 
 
@@ -147,15 +253,14 @@ async def add_drill_to_group(
     *,
     drill_group_id: int,
     drill_id: int
-) -> DrillGroupDrills:
-    """Add a drill to a drill group"""
-    db_obj = DrillGroupDrills(
-        drill_group_id=drill_group_id,
-        drill_id=drill_id
+) -> None:
+    """Add a drill to a drill group (no-op if it is already a member)"""
+    await db.execute(
+        pg_insert(DrillGroupDrills)
+        .values(drill_group_id=drill_group_id, drill_id=drill_id)
+        .on_conflict_do_nothing(index_elements=["drill_group_id", "drill_id"])
     )
-    db.add(db_obj)
     await db.commit()
-    return db_obj
 
 
 async def remove_drill_from_group(
@@ -165,41 +270,128 @@ async def remove_drill_from_group(
     drill_id: int
 ) -> None:
     """Remove a drill from a drill group"""
-    result = await db.execute(
-        select(DrillGroupDrills).where(
+    await db.execute(
+        delete(DrillGroupDrills).where(
             and_(
                 DrillGroupDrills.drill_group_id == drill_group_id,
                 DrillGroupDrills.drill_id == drill_id
             )
         )
     )
-    obj = result.scalars().first()
-    if obj:
-        await db.delete(obj)
-        await db.commit()
+    await db.commit()
 
 
 async def update_drills(
     db: AsyncSession,
     *,
-    drill_group: DrillGroup,
+    drill_group_id: int,
     drill_ids: List[int]
-) -> DrillGroup:
-    """Update the drills in a drill group"""
-    # Clear existing drills
-    drill_group.drills = []
-    await db.flush()
+) -> List[Drill]:
+    """
+    Set the drills in a drill group by applying only the membership difference.
     
-    # Add new drills
-    result = await db.execute(
-        select(Drill).where(Drill.id.in_(drill_ids))
+    Reads the current membership and the requested drills, then issues one
+    multi-row INSERT ... ON CONFLICT DO NOTHING for additions and one
+    DELETE ... WHERE drill_id = ANY(...) for removals. Unchanged rows of
+    drill_group_drills are never touched.
+    
+    Raises:
+        ValueError: If any of the requested drills does not exist
+    
+    Returns:
+        List[Drill]: The new membership
+    """
+    desired = set(drill_ids)
+    
+    current_result = await db.execute(
+        select(DrillGroupDrills.drill_id).where(DrillGroupDrills.drill_group_id == drill_group_id)
+    )
+    current = set(current_result.scalars().all())
+    
+    drills: List[Drill] = []
+    if desired:
+        drill_result = await db.execute(select(Drill).where(Drill.id.in_(desired)))
+        drills = drill_result.scalars().all()
+        missing = desired - {drill.id for drill in drills}
+        if missing:
+            raise ValueError(f"Drills with IDs {sorted(missing)} not found")
+    
+    to_add = desired - current
+    to_remove = current - desired
+    
+    if to_add:
+        await db.execute(
+            pg_insert(DrillGroupDrills)
+            .values([{"drill_group_id": drill_group_id, "drill_id": drill_id} for drill_id in sorted(to_add)])
+            .on_conflict_do_nothing(index_elements=["drill_group_id", "drill_id"])
+        )
+    if to_remove:
+        await db.execute(
+            delete(DrillGroupDrills).where(
+                DrillGroupDrills.drill_group_id == drill_group_id,
+                DrillGroupDrills.drill_id == any_(list(to_remove))
+            )
+        )
+    
+    if to_add or to_remove:
+        await db.commit()
+    return drills
+
+
+_FORK_SQL = text("""
+    WITH src AS (
+        SELECT g.*, nextval(pg_get_serial_sequence('drill_groups', 'id')) AS new_id
+        FROM drill_groups g
+        WHERE g.id = ANY(:drill_group_ids)
+          AND (g.is_public OR g.user_id = :user_id)
+    ),
+    new_groups AS (
+        INSERT INTO drill_groups (id, user_id, name, description, is_public, difficulty, tags, image)
+        SELECT new_id, :user_id, name, description, false, difficulty, tags, image
+        FROM src
+        RETURNING *
+    ),
+    members AS (
+        INSERT INTO drill_group_drills (drill_group_id, drill_id)
+        SELECT src.new_id, m.drill_id
+        FROM src
+        JOIN drill_group_drills m ON m.drill_group_id = src.id
+        RETURNING drill_group_id
     )
-    drills = result.scalars().all()
-    drill_group.drills = drills
+    SELECT src.id AS source_id,
+           new_groups.*,
+           (SELECT count(*) FROM members WHERE members.drill_group_id = new_groups.id) AS drill_count
+    FROM new_groups
+    JOIN src ON src.new_id = new_groups.id
+    ORDER BY src.id
+""").bindparams(bindparam("drill_group_ids", type_=ARRAY(Integer)))
+
+
+async def fork(
+    db: AsyncSession,
+    *,
+    drill_group_ids: List[int],
+    user_id: int
+) -> List[Dict[str, Any]]:
+    """
+    Copy drill groups and their memberships into a user's library.
     
+    Runs as a single INSERT ... SELECT ... RETURNING statement regardless of
+    how many groups or drills are copied. New ids are drawn up front with
+    nextval() so every copy can be matched back to its source. Only public
+    groups, or the user's own, are copied; forks start out private.
+    
+    Returns:
+        List[Dict]: One row per copy with source_id, the new group's columns and drill_count
+    """
+    if not drill_group_ids:
+        return []
+    result = await db.execute(
+        _FORK_SQL, {"drill_group_ids": list(set(drill_group_ids)), "user_id": user_id}
+    )
+    rows = [dict(row._mapping) for row in result]
     await db.commit()
-    await db.refresh(drill_group)
-    return drill_group
+    return rows
 
 
 async def get_admin_user_id(db: AsyncSession) -> Optional[int]:
@@ -0,0 +1,112 @@
+from typing import Optional
+from datetime import datetime
+import math
+import random
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.drill_group_stats import DrillGroupCounterShard, DrillGroupStats
+
+# Forward-decay landmark. Scores are stored relative to this instant so that
+# old events never need rewriting: ranking by the stored score is identical
+# to ranking by the score decayed to "now". The stored score is the log2 of
+# the summed event weights, which grows linearly with time instead of
+# exponentially, so no half-life can overflow a float.
+LANDMARK = datetime(2025, 1, 1)
+
+# Below this many halvings a term no longer changes a log2 sum in float64;
+# also keeps power() clear of Postgres's underflow error
+_MIN_EXPONENT = -1000
+
+
+def decay_exponent(at: Optional[datetime] = None) -> float:
+    """log2 of the forward-decayed weight of one event happening at `at` (default: now)"""
+    at = at or datetime.utcnow()
+    half_life_seconds = settings.POPULARITY_HALF_LIFE_HOURS * 3600
+    return (at - LANDMARK).total_seconds() / half_life_seconds
+
+
+def current_score(stored_score: float, at: Optional[datetime] = None) -> float:
+    """Convert a stored log2 forward-decayed score to its value at `at` (default: now)"""
+    return 2.0 ** (stored_score - decay_exponent(at))
+
+
+def _log2_add(a, b):
+    """SQL for log2(2**a + 2**b) without leaving log space"""
+    return func.greatest(a, b) + func.ln(
+        1 + func.power(2.0, func.greatest(-func.abs(a - b), _MIN_EXPONENT))
+    ) / math.log(2)
+
+
+async def record_practice(
+    db: AsyncSession,
+    *,
+    drill_group_id: int,
+    count: int = 1,
+    at: Optional[datetime] = None
+) -> None:
+    """
+    Add practice events to a randomly chosen counter shard of a drill group.
+
+    Does not commit; the write joins the caller's transaction.
+    """
+    if count <= 0:
+        return
+    stmt = insert(DrillGroupCounterShard).values(
+        drill_group_id=drill_group_id,
+        shard=random.randrange(settings.POPULARITY_SHARDS),
+        practice_count=count,
+        trending_score=decay_exponent(at) + math.log2(count),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DrillGroupCounterShard.drill_group_id, DrillGroupCounterShard.shard],
+        set_={
+            "practice_count": DrillGroupCounterShard.practice_count + stmt.excluded.practice_count,
+            "trending_score": _log2_add(DrillGroupCounterShard.trending_score, stmt.excluded.trending_score),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def rollup(db: AsyncSession) -> None:
+    """Fold the counter shards into the indexed drill_group_stats table"""
+    # log2 of the summed shard weights, shifted by each group's largest
+    # score so the powers stay in range
+    shards = select(
+        DrillGroupCounterShard.drill_group_id,
+        DrillGroupCounterShard.practice_count,
+        DrillGroupCounterShard.trending_score,
+        func.max(DrillGroupCounterShard.trending_score).over(
+            partition_by=DrillGroupCounterShard.drill_group_id
+        ).label("top"),
+    ).subquery()
+    totals = (
+        select(
+            shards.c.drill_group_id,
+            func.sum(shards.c.practice_count),
+            func.max(shards.c.top) + func.ln(func.sum(
+                func.power(2.0, func.greatest(shards.c.trending_score - shards.c.top, _MIN_EXPONENT))
+            )) / math.log(2),
+        )
+        .group_by(shards.c.drill_group_id)
+    )
+    stmt = insert(DrillGroupStats).from_select(
+        ["drill_group_id", "practice_count", "trending_score"], totals
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DrillGroupStats.drill_group_id],
+        set_={
+            "practice_count": stmt.excluded.practice_count,
+            "trending_score": stmt.excluded.trending_score,
+            "updated_at": func.now(),
+        },
+        where=(
+            (DrillGroupStats.practice_count != stmt.excluded.practice_count)
+            | (DrillGroupStats.trending_score != stmt.excluded.trending_score)
+        ),
+    )
+    await db.execute(stmt)
+    await db.commit()
@@ -6,6 +6,7 @@ from app.db.models.practice_session import PracticeSession
 from app.db.models.drill_group import DrillGroup
 from app.db.models.drill import Drill
 from app.db.models.user import User
+from app.crud import crud_drill_group_stats
 
 
 async def create_practice_sessions(
@@ -50,6 +51,11 @@ async def create_practice_sessions(
         practice_sessions.append(practice_session)
     
     await db.flush()  # This will populate the IDs
+    
+    # Count the practice towards the drill group's popularity
+    await crud_drill_group_stats.record_practice(
+        db, drill_group_id=drill_group_id, count=len(practice_sessions)
+    )
     return practice_sessions
 
 
@@ -0,0 +1,221 @@
+from typing import Any, Dict, List, Optional
+import math
+
+from sqlalchemy import select, func, literal_column, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.practice_session import PracticeSession
+from app.db.models.shot import Shot
+
+
+def _session_accuracy_subquery(user_id: int):
+    """Per-session average accuracy and shot count for a user"""
+    return (
+        select(
+            PracticeSession.id.label("session_id"),
+            PracticeSession.created_at.label("created_at"),
+            func.avg(Shot.accuracy_score).label("avg_accuracy"),
+            func.count(Shot.id).label("shot_count")
+        )
+        .join(Shot, Shot.session_id == PracticeSession.id)
+        .where(PracticeSession.user_id == user_id)
+        .where(Shot.accuracy_score.isnot(None))
+        .group_by(PracticeSession.id, PracticeSession.created_at)
+        .subquery()
+    )
+
+
+def _weekly_accuracy_subquery(user_id: int):
+    """Per-week average accuracy, shot count and session count for a user"""
+    week = func.date_trunc(literal_column("'week'"), PracticeSession.created_at)
+    return (
+        select(
+            week.label("week_start"),
+            func.avg(Shot.accuracy_score).label("avg_accuracy"),
+            func.count(Shot.id).label("shot_count"),
+            func.count(func.distinct(PracticeSession.id)).label("session_count")
+        )
+        .join(Shot, Shot.session_id == PracticeSession.id)
+        .where(PracticeSession.user_id == user_id)
+        .where(Shot.accuracy_score.isnot(None))
+        .group_by(week)
+        .subquery()
+    )
+
+
+async def get_improvement_trend(
+    db: AsyncSession,
+    user_id: int,
+    last_n: int = 10
+) -> Optional[float]:
+    """
+    Get the accuracy change between the older and newer half of the last N sessions.
+
+    The halves are assigned with NTILE(2) in chronological order, so the
+    older half takes the extra session when N is odd.
+
+    Returns:
+        Optional[float]: Newer half average minus older half average, or None with fewer than 2 sessions
+    """
+    per_session = _session_accuracy_subquery(user_id)
+    recent = (
+        select(per_session.c.avg_accuracy, per_session.c.created_at)
+        .order_by(per_session.c.created_at.desc())
+        .limit(last_n)
+        .subquery()
+    )
+    halves = (
+        select(
+            recent.c.avg_accuracy,
+            func.ntile(2).over(order_by=recent.c.created_at.asc()).label("half")
+        )
+        .subquery()
+    )
+    result = await db.execute(
+        select(
+            func.count().label("n"),
+            func.avg(halves.c.avg_accuracy).filter(halves.c.half == 1).label("older"),
+            func.avg(halves.c.avg_accuracy).filter(halves.c.half == 2).label("newer")
+        )
+    )
+    row = result.first()
+    if not row or row.n < 2 or row.older is None or row.newer is None:
+        return None
+    return float(row.newer) - float(row.older)
+
+
+async def get_session_series(
+    db: AsyncSession,
+    user_id: int,
+    moving_window: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Get the per-session accuracy series for a user, oldest first.
+
+    Each point carries a moving average over the last `moving_window`
+    sessions and the shot-weighted cumulative accuracy to date, both
+    computed with window functions.
+    """
+    per_session = _session_accuracy_subquery(user_id)
+    ordering = per_session.c.created_at.asc()
+    weighted = per_session.c.avg_accuracy * per_session.c.shot_count
+
+    result = await db.execute(
+        select(
+            per_session.c.session_id,
+            per_session.c.created_at,
+            per_session.c.avg_accuracy,
+            per_session.c.shot_count,
+            func.avg(per_session.c.avg_accuracy).over(
+                order_by=ordering, rows=(-(max(moving_window, 1) - 1), 0)
+            ).label("moving_avg"),
+            (
+                func.sum(weighted).over(order_by=ordering, rows=(None, 0))
+                / func.sum(per_session.c.shot_count).over(order_by=ordering, rows=(None, 0))
+            ).label("cumulative_accuracy")
+        )
+        .order_by(ordering)
+    )
+    return [
+        {
+            "session_id": row.session_id,
+            "timestamp": row.created_at,
+            "accuracy": float(row.avg_accuracy),
+            "shot_count": row.shot_count,
+            "moving_average": float(row.moving_avg),
+            "cumulative_accuracy": float(row.cumulative_accuracy),
+        }
+        for row in result
+    ]
+
+
+async def get_weekly_series(db: AsyncSession, user_id: int) -> List[Dict[str, Any]]:
+    """
+    Get the per-week accuracy series for a user, oldest first.
+
+    The week-over-week change is computed with LAG over the weekly buckets.
+    """
+    weekly = _weekly_accuracy_subquery(user_id)
+    ordering = weekly.c.week_start.asc()
+
+    result = await db.execute(
+        select(
+            weekly.c.week_start,
+            weekly.c.avg_accuracy,
+            weekly.c.shot_count,
+            weekly.c.session_count,
+            (
+                weekly.c.avg_accuracy - func.lag(weekly.c.avg_accuracy).over(order_by=ordering)
+            ).label("change")
+        )
+        .order_by(ordering)
+    )
+    return [
+        {
+            "timestamp": row.week_start,
+            "accuracy": float(row.avg_accuracy),
+            "shot_count": row.shot_count,
+            "session_count": row.session_count,
+            "change": float(row.change) if row.change is not None else None,
+        }
+        for row in result
+    ]
+
+
+async def get_trend_fit(
+    db: AsyncSession,
+    user_id: int,
+    granularity: str = "session"
+) -> Dict[str, Any]:
+    """
+    Fit a least-squares line of accuracy against time over the full history.
+
+    The fit uses the Postgres regr_* aggregates so it always covers every
+    point, independently of any downsampling applied to the returned series.
+
+    Args:
+        db: AsyncSession - Database session
+        user_id: int - User to fit
+        granularity: str - "session" or "week"
+
+    Returns:
+        Dict: n, slope_per_day, intercept, r_squared and the slope standard error
+    """
+    if granularity == "week":
+        series = _weekly_accuracy_subquery(user_id)
+        timestamp = series.c.week_start
+    else:
+        series = _session_accuracy_subquery(user_id)
+        timestamp = series.c.created_at
+
+    x = (func.extract("epoch", timestamp) / 86400.0).cast(Float)
+    y = series.c.avg_accuracy.cast(Float)
+
+    result = await db.execute(
+        select(
+            func.regr_count(y, x).label("n"),
+            func.regr_slope(y, x).label("slope"),
+            func.regr_intercept(y, x).label("intercept"),
+            func.regr_r2(y, x).label("r_squared"),
+            func.regr_sxx(y, x).label("sxx"),
+            func.regr_syy(y, x).label("syy"),
+            func.regr_sxy(y, x).label("sxy")
+        )
+    )
+    row = result.first()
+    n = row.n if row and row.n else 0
+    if n < 2 or row.slope is None:
+        return {"n": n, "slope_per_day": None, "intercept": None, "r_squared": None, "stderr": None}
+
+    stderr = None
+    if n > 2 and row.sxx:
+        residual = max(float(row.syy) - float(row.slope) * float(row.sxy), 0.0)
+        stderr = math.sqrt(residual / (n - 2) / float(row.sxx))
+
+    return {
+        "n": n,
+        "slope_per_day": float(row.slope),
+        "intercept": float(row.intercept),
+        "r_squared": float(row.r_squared) if row.r_squared is not None else None,
+        "stderr": stderr,
+    }
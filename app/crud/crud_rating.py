@@ -0,0 +1,197 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import select, delete, func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.challenge import Challenge, ChallengeStatus
+from app.db.models.rating import UserRating, RatingHistory
+from app.db.models.user import User
+from app.utils import elo
+
+
+def _score(sender_id: int, winner_id: Optional[int]) -> float:
+    """The sender's score: 1 for a win, 0 for a loss, 0.5 for a draw"""
+    if winner_id is None:
+        return 0.5
+    return 1.0 if winner_id == sender_id else 0.0
+
+
+async def get(db: AsyncSession, user_id: int) -> Dict[str, Any]:
+    """A user's rating; users without rated challenges have the initial rating"""
+    result = await db.execute(
+        select(UserRating.rating, UserRating.games, UserRating.updated_at)
+        .where(UserRating.user_id == user_id)
+    )
+    row = result.first()
+    if row is None:
+        return {"user_id": user_id, "rating": settings.ELO_INITIAL_RATING, "games": 0, "updated_at": None}
+    return {"user_id": user_id, **row._mapping}
+
+
+async def get_history(db: AsyncSession, user_id: int, *, limit: int = 50) -> List[Dict[str, Any]]:
+    """Most recent rating changes for a user, newest first"""
+    result = await db.execute(
+        select(RatingHistory.challenge_id, RatingHistory.rating, RatingHistory.delta, RatingHistory.created_at)
+        .where(RatingHistory.user_id == user_id)
+        .order_by(RatingHistory.created_at.desc(), RatingHistory.id.desc())
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def get_leaderboard(db: AsyncSession, *, skip: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        select(UserRating.user_id, User.username, UserRating.rating, UserRating.games)
+        .join(User, User.id == UserRating.user_id)
+        .where(User.is_active.is_(True))
+        .order_by(UserRating.rating.desc(), UserRating.user_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in result]
+
+
+async def record_result(
+    db: AsyncSession,
+    *,
+    challenge_id: int,
+    sender_id: int,
+    recipient_id: int,
+    winner_id: Optional[int]
+) -> Dict[int, float]:
+    """
+    Apply one completed challenge to both players' ratings.
+    
+    Constant work per result: both rating rows are locked (in user id order,
+    so concurrent results cannot deadlock), updated with one upsert and two
+    history rows are appended. Does not commit; the caller commits together
+    with the challenge completion.
+    
+    Self-challenges (possible on rows created before they were refused)
+    leave ratings untouched.
+    
+    Returns:
+        Dict: New rating per user id
+    """
+    if sender_id == recipient_id:
+        return {}
+    player_ids = sorted((sender_id, recipient_id))
+    await db.execute(
+        pg_insert(UserRating)
+        .values([{"user_id": user_id, "rating": settings.ELO_INITIAL_RATING} for user_id in player_ids])
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+    result = await db.execute(
+        select(UserRating.user_id, UserRating.rating)
+        .where(UserRating.user_id.in_(player_ids))
+        .order_by(UserRating.user_id)
+        .with_for_update()
+    )
+    current = {row.user_id: row.rating for row in result}
+    
+    sender_rating, recipient_rating = elo.update(
+        current[sender_id], current[recipient_id], _score(sender_id, winner_id), settings.ELO_K_FACTOR
+    )
+    new_ratings = {sender_id: sender_rating, recipient_id: recipient_rating}
+    
+    stmt = pg_insert(UserRating).values([
+        {"user_id": user_id, "rating": new_ratings[user_id], "games": 1}
+        for user_id in player_ids
+    ])
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "rating": stmt.excluded.rating,
+                "games": UserRating.games + 1,
+                "updated_at": func.now(),
+            }
+        )
+    )
+    await db.execute(
+        pg_insert(RatingHistory).values([
+            {
+                "user_id": user_id,
+                "challenge_id": challenge_id,
+                "rating": new_ratings[user_id],
+                "delta": round(new_ratings[user_id] - current[user_id]),
+            }
+            for user_id in player_ids
+        ])
+    )
+    return new_ratings
+
+
+async def recompute_all(db: AsyncSession) -> Dict[str, int]:
+    """
+    Rebuild every rating and the full history by replaying all completed
+    challenges in completion order.
+    
+    The replay runs vectorized in NumPy (see app.utils.elo.replay) and the
+    results are written back with COPY, replacing the existing tables in
+    one transaction.
+    
+    Returns:
+        Dict: Number of challenges replayed and players rated
+    """
+    result = await db.execute(
+        select(
+            Challenge.id,
+            Challenge.sender_id,
+            Challenge.recipient_id,
+            Challenge.winner_id,
+            Challenge.completed_at,
+        )
+        .where(
+            Challenge.status == ChallengeStatus.COMPLETED,
+            Challenge.sender_id != Challenge.recipient_id
+        )
+        .order_by(Challenge.completed_at, Challenge.id)
+    )
+    rows = result.all()
+    
+    await db.execute(delete(RatingHistory))
+    await db.execute(delete(UserRating))
+    if not rows:
+        await db.commit()
+        return {"challenges": 0, "players": 0}
+    
+    challenge_ids, sender_ids, recipient_ids, winner_ids, completed_at = zip(*rows)
+    senders = np.fromiter(sender_ids, dtype=np.int64, count=len(rows))
+    recipients = np.fromiter(recipient_ids, dtype=np.int64, count=len(rows))
+    winners = np.fromiter((w if w is not None else -1 for w in winner_ids), dtype=np.int64, count=len(rows))
+    score = np.where(winners == senders, 1.0, np.where(winners == recipients, 0.0, 0.5))
+    
+    # Map user ids to dense indices for the replay
+    player_ids, dense = np.unique(np.concatenate([senders, recipients]), return_inverse=True)
+    a, b = dense[:len(rows)], dense[len(rows):]
+    
+    ratings, after_a, after_b, deltas = elo.replay(
+        a, b, score, len(player_ids),
+        initial=settings.ELO_INITIAL_RATING, k=settings.ELO_K_FACTOR
+    )
+    games = np.bincount(dense, minlength=len(player_ids))
+    rounded = np.rint(deltas).astype(np.int64).tolist()
+    
+    history = list(zip(sender_ids, challenge_ids, after_a.tolist(), rounded, completed_at))
+    history.extend(zip(recipient_ids, challenge_ids, after_b.tolist(), [-d for d in rounded], completed_at))
+    
+    connection = await db.connection()
+    raw = (await connection.get_raw_connection()).driver_connection
+    await raw.copy_records_to_table(
+        UserRating.__tablename__,
+        records=zip(player_ids.tolist(), ratings.tolist(), games.tolist()),
+        columns=["user_id", "rating", "games"],
+    )
+    await raw.copy_records_to_table(
+        RatingHistory.__tablename__,
+        records=history,
+        columns=["user_id", "challenge_id", "rating", "delta", "created_at"],
+    )
+    await db.execute(text("ANALYZE user_ratings, rating_history"))
+    await db.commit()
+    
+    return {"challenges": len(rows), "players": len(player_ids)}
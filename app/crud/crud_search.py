@@ -0,0 +1,96 @@
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, case, func, literal, literal_column, or_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.drill import Drill
+from app.db.models.drill_group import DrillGroup
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _scored(model, result_type: str, query: str):
+    """
+    Matching rows of one table with a combined relevance score.
+    
+    The score is a tier (3 exact name, 2 name prefix, 1 name substring,
+    0.5 description substring, 0 fuzzy only) plus the best trigram
+    similarity, so any literal match outranks a typo match and typo
+    matches are ordered by closeness.
+    """
+    term = literal(query)
+    contains = f"%{_escape_like(query)}%"
+    starts = f"{_escape_like(query)}%"
+    description = func.coalesce(model.description, "")
+    
+    tier = case(
+        (func.lower(model.name) == query.lower(), literal_column("3.0")),
+        (model.name.ilike(starts, escape="\\"), literal_column("2.0")),
+        (model.name.ilike(contains, escape="\\"), literal_column("1.0")),
+        (description.ilike(contains, escape="\\"), literal_column("0.5")),
+        else_=literal_column("0.0")
+    )
+    fuzzy = func.greatest(
+        func.similarity(model.name, term),
+        func.word_similarity(term, model.name),
+        literal_column("0.5") * func.word_similarity(term, description),
+    )
+    
+    return select(
+        model.id,
+        model.name,
+        literal_column(f"'{result_type}'").label("type"),
+        model.description,
+        (tier + fuzzy).label("score"),
+    ).where(
+        # Each branch can use the trigram GIN indexes
+        or_(
+            model.name.ilike(contains, escape="\\"),
+            model.description.ilike(contains, escape="\\"),
+            model.name.op("%")(term),
+            term.op("<%")(model.name),
+        )
+    )
+
+
+async def search(
+    db: AsyncSession,
+    query: str,
+    *,
+    limit: int = 50,
+    threshold: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    Typo-tolerant search over drills and public drill groups.
+    
+    Runs as one UNION ALL query that returns only the top `limit` rows.
+    `threshold` is the trigram similarity below which fuzzy-only matches
+    are dropped (SEARCH_SIMILARITY_THRESHOLD by default).
+    """
+    query = " ".join(query.split())
+    if not query:
+        return []
+    
+    threshold = settings.SEARCH_SIMILARITY_THRESHOLD if threshold is None else threshold
+    # The % and <% operators read their cutoffs from these settings. Both are
+    # always set, since pg_trgm's own defaults differ (0.3 and 0.6)
+    await db.execute(
+        select(
+            func.set_config("pg_trgm.similarity_threshold", str(threshold), True),
+            func.set_config("pg_trgm.word_similarity_threshold", str(threshold), True),
+        )
+    )
+    
+    drills = _scored(Drill, "drill", query)
+    groups = _scored(DrillGroup, "drill_group", query).where(DrillGroup.is_public.is_(True))
+    matches = union_all(drills, groups).subquery()
+    
+    result = await db.execute(
+        select(matches)
+        .order_by(matches.c.score.desc(), func.lower(matches.c.name), matches.c.id)
+        .limit(limit)
+    )
+    return [dict(row._mapping) for row in result]
@@ -0,0 +1,120 @@
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, or_, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.challenge import Challenge
+from app.db.models.drill import Drill
+from app.db.models.drill_group import DrillGroup, DrillGroupDrills
+from app.db.models.practice_session import PracticeSession
+from app.db.models.sync import SyncTombstone
+
+
+def _visible_group(user_id: int):
+    return or_(DrillGroup.is_public.is_(True), DrillGroup.user_id == user_id)
+
+
+# Syncable tables in feed order: (name, table, visibility for a user).
+# Tombstones follow as the last position.
+SYNC_TABLES: List[Tuple[str, Any, Optional[Callable[[int], Any]]]] = [
+    ("drills", Drill.__table__, None),
+    ("drill_groups", DrillGroup.__table__, _visible_group),
+    ("drill_group_drills", DrillGroupDrills.__table__, lambda user_id: exists().where(
+        DrillGroup.id == DrillGroupDrills.drill_group_id, _visible_group(user_id)
+    )),
+    ("practice_sessions", PracticeSession.__table__, lambda user_id: PracticeSession.user_id == user_id),
+    ("challenges", Challenge.__table__, lambda user_id: or_(
+        Challenge.sender_id == user_id, Challenge.recipient_id == user_id
+    )),
+]
+TOMBSTONES = len(SYNC_TABLES)
+
+
+def cursor_length(position: int) -> int:
+    """Number of values in a resume key at `position`: change_xid then the primary key"""
+    if position == TOMBSTONES:
+        return 2
+    return 1 + len(SYNC_TABLES[position][1].primary_key.columns)
+
+
+async def get_horizon(db: AsyncSession) -> int:
+    """
+    Oldest transaction id still running. Every transaction below it has
+    finished, so a later sync from here cannot miss a late commit.
+    """
+    result = await db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+    return result.scalar_one()
+
+
+async def get_changes(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    since: int,
+    position: int = 0,
+    after: Optional[List[Any]] = None,
+    limit: int = 500
+) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]], Optional[Tuple[int, List[Any]]]]:
+    """
+    Up to `limit` rows visible to the user that changed at or after
+    transaction `since`, walking the tables in feed order by
+    (change_xid, primary key) range scans starting at `position`/`after`.
+
+    Returns (changes by table, deletions, cursor). Deletions include drill
+    groups made private by another user. The cursor is (position, key) to
+    resume from, or None when the feed is exhausted.
+    """
+    changes: Dict[str, List[Dict[str, Any]]] = {}
+    deleted: List[Dict[str, Any]] = []
+    remaining = limit
+
+    while position < TOMBSTONES and remaining > 0:
+        name, table, visibility = SYNC_TABLES[position]
+        keys = [table.c.change_xid, *table.primary_key.columns]
+        query = select(table).where(table.c.change_xid >= since)
+        if after is not None:
+            query = query.where(tuple_(*keys) > tuple_(*after))
+        if visibility is not None:
+            query = query.where(visibility(user_id))
+        rows = (await db.execute(query.order_by(*keys).limit(remaining))).all()
+
+        if rows:
+            changes.setdefault(name, []).extend(dict(row._mapping) for row in rows)
+        remaining -= len(rows)
+        if remaining == 0:
+            last = rows[-1]._mapping
+            return changes, deleted, (position, [last[column] for column in keys])
+        position, after = position + 1, None
+
+    # A full sync has nothing to delete
+    if since > 0 and remaining > 0:
+        query = (
+            select(SyncTombstone)
+            .where(
+                SyncTombstone.change_xid >= since,
+                or_(SyncTombstone.user_ids.is_(None), SyncTombstone.user_ids.any(user_id)),
+                SyncTombstone.except_user_id.is_distinct_from(user_id),
+            )
+        )
+        if after is not None:
+            query = query.where(tuple_(SyncTombstone.change_xid, SyncTombstone.id) > tuple_(*after))
+        tombstones = (await db.execute(
+            query.order_by(SyncTombstone.change_xid, SyncTombstone.id).limit(remaining)
+        )).scalars().all()
+        deleted.extend(
+            {"table": t.table_name, "key": t.row_key, "change_xid": t.change_xid} for t in tombstones
+        )
+        if len(tombstones) == remaining:
+            return changes, deleted, (TOMBSTONES, [tombstones[-1].change_xid, tombstones[-1].id])
+
+    return changes, deleted, None
+
+
+async def prune_tombstones(db: AsyncSession) -> int:
+    """Drop tombstones older than any sync token still accepted"""
+    cutoff = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    result = await db.execute(delete(SyncTombstone).where(SyncTombstone.created_at < cutoff))
+    await db.commit()
+    return result.rowcount
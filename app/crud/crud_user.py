@@ -1,7 +1,7 @@
-from typing import Any, Dict, Optional, Union
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from datetime import datetime
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_password_hash, verify_password
@@ -27,6 +27,66 @@ async def get_by_username(db: AsyncSession, username: str) -> Optional[UserModel
     return result.scalar_one_or_none()
 
 
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def autocomplete(
+    db: AsyncSession,
+    query: str,
+    *,
+    limit: int = 10,
+    include_phone: bool = False,
+    active_only: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Prefix search over username, full name (any word) and phone number.
+    
+    Username and phone prefixes use the text_pattern_ops indexes and name
+    matches use the trigram index on lower(full_name). Results are ranked
+    exact username, username prefix, name prefix, phone prefix, then by
+    username length.
+    """
+    prefix = query.strip().lower()
+    pattern = f"{_escape_like(prefix)}%"
+    word_pattern = f"% {_escape_like(prefix)}%"
+    digits = "".join(filter(str.isdigit, query))
+    
+    username = func.lower(UserModel.username)
+    full_name = func.lower(UserModel.full_name)
+    name_match = or_(full_name.like(pattern, escape="\\"), full_name.like(word_pattern, escape="\\"))
+    
+    conditions = [username.like(pattern, escape="\\"), name_match]
+    if include_phone and digits:
+        conditions.append(UserModel.phone_number.like(f"{digits}%"))
+    
+    rank = case(
+        (username == prefix, 0),
+        (username.like(pattern, escape="\\"), 1),
+        (name_match, 2),
+        else_=3
+    )
+    
+    stmt = (
+        select(
+            UserModel.id,
+            UserModel.username,
+            UserModel.full_name,
+            UserModel.phone_number,
+            UserModel.is_active,
+            rank.label("rank"),
+        )
+        .where(or_(*conditions))
+        .order_by(rank, func.length(UserModel.username), UserModel.username)
+        .limit(limit)
+    )
+    if active_only:
+        stmt = stmt.where(UserModel.is_active.is_(True))
+    
+    result = await db.execute(stmt)
+    return [dict(row._mapping) for row in result]
+
+
 async def get(db: AsyncSession, user_id: int) -> Optional[UserModel]:
     stmt = select(UserModel).where(UserModel.id == user_id)
     result = await db.execute(stmt)
@@ -148,6 +208,19 @@ async def get_all_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> li
     Returns:
         List[UserModel]: List of users
     """
-    query = select(UserModel).offset(skip).limit(limit)
+    query = select(UserModel).order_by(UserModel.id).offset(skip).limit(limit)
     result = await db.execute(query)
     return result.scalars().all()
+
+
+async def stream_all_users(
+    db: AsyncSession, skip: int = 0, limit: Optional[int] = None, batch_size: int = 500
+) -> AsyncIterator[List[UserModel]]:
+    """
+    Users in id order, fetched through a server-side cursor `batch_size`
+    rows at a time, so memory stays flat however many are read.
+    """
+    query = select(UserModel).order_by(UserModel.id).offset(skip).limit(limit)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+    async for batch in result.scalars().partitions():
+        yield batch
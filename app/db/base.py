@@ -1,8 +1,9 @@
-from typing import Any, AsyncGenerator, Generator
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Generator, Optional
 import os
 
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import settings
@@ -14,6 +15,9 @@ from app.db.models.drill import Drill  # noqa
 from app.db.models.shot import Shot  # noqa
 from app.db.models.drill_group import DrillGroup, DrillGroupDrills  # noqa
 from app.db.models.practice_session import PracticeSession  # noqa
+from app.db.models.drill_group_stats import DrillGroupCounterShard, DrillGroupStats  # noqa
+from app.db.models.rating import UserRating, RatingHistory  # noqa
+from app.db.models.sync import SyncTombstone  # noqa
 
 # Check if we're using psycopg2 (sync) or asyncpg (async)
 if 'psycopg2' in settings.DATABASE_URL:
@@ -58,13 +62,25 @@ else:
     )
 
 
+# Set while an atomic POST /batch runs: request sessions join this connection's
+# transaction, and their commits become savepoint releases
+batch_connection: ContextVar[Optional[AsyncConnection]] = ContextVar("batch_connection", default=None)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database sessions (either async or sync)
     """
     if use_async:
+        connection = batch_connection.get()
+        if connection is not None:
+            session = AsyncSession(
+                bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False
+            )
+        else:
+            session = async_session()
         # Use async session for asyncpg
-        async with async_session() as session:
+        async with session:
             try:
                 yield session
                 await session.commit()
@@ -1,9 +1,10 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float, Enum
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 
 from app.db.base import Base
+from app.db.models.sync import change_xid_column
 
 
 class ChallengeStatus(str, enum.Enum):
@@ -31,6 +32,16 @@ class Challenge(Base):
     drill_type = Column(String)  # Can be custom or reference a predefined drill
     target_score = Column(Integer)
     
+    # Result, set when the challenge is completed (winner_id NULL means a draw)
+    winner_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    change_xid = change_xid_column()
+    
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_challenges")
     recipient = relationship("User", foreign_keys=[recipient_id], back_populates="received_challenges")
+    
+    # Change feed range scans for GET /sync
+    __table_args__ = (
+        Index('idx_challenges_change', 'change_xid', 'id'),
+    )
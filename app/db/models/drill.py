@@ -1,8 +1,9 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
+from app.db.models.sync import change_xid_column
 
 
 class Drill(Base):
@@ -18,8 +19,22 @@ class Drill(Base):
     drill_type = Column(String(50), nullable=False)
     duration_minutes = Column(Integer, nullable=True)
     session_id = Column(Integer, ForeignKey('practice_sessions.id', ondelete='SET NULL'), nullable=True)
+    change_xid = change_xid_column()
 
     # Relationships
     practice_sessions = relationship("PracticeSession", back_populates="drill", foreign_keys="PracticeSession.drill_id")
     drill_groups = relationship("DrillGroup", secondary="drill_group_drills", back_populates="drills")
     shots = relationship("Shot", back_populates="drill", cascade="all, delete-orphan")
+    
+    # Composite indexes for the catalog filters and its default ordering
+    __table_args__ = (
+        Index('idx_drills_type_difficulty_duration', 'drill_type', 'difficulty', 'duration_minutes'),
+        Index('idx_drills_difficulty_duration', 'difficulty', 'duration_minutes'),
+        Index('idx_drills_created_at_id', created_at.desc(), id.desc()),
+        # Change feed range scans for GET /sync
+        Index('idx_drills_change', 'change_xid', 'id'),
+        # Trigram indexes for fuzzy and substring search
+        Index('idx_drills_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('idx_drills_description_trgm', 'description', postgresql_using='gin',
+              postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, JSON, Index, sql as sa
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Index, sql as sa
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
+from app.db.models.sync import change_xid_column
 
 
 class DrillGroup(Base):
@@ -14,15 +16,27 @@ class DrillGroup(Base):
     description = Column(Text, nullable=True)
     is_public = Column(Boolean, nullable=False, server_default=sa.text('true'))
     difficulty = Column(Integer, nullable=True)
-    tags = Column(JSON, nullable=True, server_default='[]')
+    tags = Column(JSONB, nullable=True, server_default='[]')
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
     image = Column(String(255), nullable=True)
+    change_xid = change_xid_column()
     
     # Relationships
     user = relationship("User", back_populates="drill_groups")
     drills = relationship("Drill", secondary="drill_group_drills", back_populates="drill_groups")
     
+    # GIN index for tag containment (tags @> '["..."]') filters
+    __table_args__ = (
+        Index('idx_drill_groups_tags', 'tags', postgresql_using='gin', postgresql_ops={'tags': 'jsonb_path_ops'}),
+        # Change feed range scans for GET /sync
+        Index('idx_drill_groups_change', 'change_xid', 'id'),
+        # Trigram indexes for fuzzy and substring search
+        Index('idx_drill_groups_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('idx_drill_groups_description_trgm', 'description', postgresql_using='gin',
+              postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
+    
     class Config:
         from_attributes = True
 
@@ -32,9 +46,11 @@ class DrillGroupDrills(Base):
     
     drill_group_id = Column(Integer, ForeignKey("drill_groups.id", ondelete="CASCADE"), nullable=False, primary_key=True)
     drill_id = Column(Integer, ForeignKey("drills.id", ondelete="CASCADE"), nullable=False, primary_key=True)
+    change_xid = change_xid_column()
     
     # Define indexes for better performance
     __table_args__ = (
         Index('idx_drill_group_drills_drill_id', 'drill_id'),
         Index('idx_drill_group_drills_group_id', 'drill_group_id'),
+        Index('idx_drill_group_drills_change', 'change_xid', 'drill_group_id', 'drill_id'),
     )
@@ -0,0 +1,38 @@
+from sqlalchemy import BigInteger, Column, DateTime, Float, ForeignKey, Integer, SmallInteger, Index
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class DrillGroupCounterShard(Base):
+    """
+    Write side of the drill group popularity counters.
+    
+    Each practice insert bumps one randomly chosen shard row, so concurrent
+    writers for the same group rarely contend on a single row.
+    """
+    __tablename__ = "drill_group_counter_shards"
+    
+    drill_group_id = Column(Integer, ForeignKey("drill_groups.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True)
+    practice_count = Column(BigInteger, nullable=False, server_default='0')
+    # Forward-decayed score in log2 space: log2(sum of 2 ** ((t - landmark) / half_life))
+    trending_score = Column(Float, nullable=False, server_default='0')
+
+
+class DrillGroupStats(Base):
+    """
+    Read side of the drill group popularity counters, rolled up from the shards.
+    """
+    __tablename__ = "drill_group_stats"
+    
+    drill_group_id = Column(Integer, ForeignKey("drill_groups.id", ondelete="CASCADE"), primary_key=True)
+    practice_count = Column(BigInteger, nullable=False, server_default='0')
+    trending_score = Column(Float, nullable=False, server_default='0')
+    updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
+    
+    # Ranked listings are served straight from these indexes
+    __table_args__ = (
+        Index('idx_drill_group_stats_trending', trending_score.desc(), 'drill_group_id'),
+        Index('idx_drill_group_stats_popular', practice_count.desc(), 'drill_group_id'),
+    )
@@ -3,6 +3,7 @@ from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
+from app.db.models.sync import change_xid_column
 
 
 class PracticeSession(Base):
@@ -13,6 +14,7 @@ class PracticeSession(Base):
     drill_group_id = Column(Integer, ForeignKey("drill_groups.id", ondelete="CASCADE"), nullable=False)
     drill_id = Column(Integer, ForeignKey("drills.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime, nullable=False, server_default=func.now())
+    change_xid = change_xid_column()
     
     # Relationships
     user = relationship("User", back_populates="practice_sessions")
@@ -24,4 +26,6 @@ class PracticeSession(Base):
         Index('idx_practice_sessions_user_id', 'user_id'),
         Index('idx_practice_sessions_drill_group_id', 'drill_group_id'),
         Index('idx_practice_sessions_drill_id', 'drill_id'),
+        Index('idx_practice_sessions_created_at', 'created_at'),
+        Index('idx_practice_sessions_change', 'change_xid', 'id'),
     )
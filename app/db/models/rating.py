@@ -0,0 +1,33 @@
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, REAL, SmallInteger, Index
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class UserRating(Base):
+    __tablename__ = "user_ratings"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    rating = Column(REAL, nullable=False)
+    games = Column(Integer, nullable=False, server_default='0')
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index('idx_user_ratings_rating', rating.desc(), user_id),
+    )
+
+
+class RatingHistory(Base):
+    """One row per player per rated challenge, kept narrow (4-byte floats, 2-byte delta)"""
+    __tablename__ = "rating_history"
+    
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    challenge_id = Column(Integer, ForeignKey("challenges.id", ondelete="CASCADE"), nullable=False)
+    rating = Column(REAL, nullable=False)  # Rating after the challenge
+    delta = Column(SmallInteger, nullable=False)  # Rounded rating change
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_rating_history_user_created', 'user_id', 'created_at'),
+    )
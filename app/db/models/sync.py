@@ -0,0 +1,37 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+# 64-bit id of the writing transaction. Unlike a sequence value it never
+# becomes visible out of order relative to the snapshot horizon GET /sync
+# hands out, so clients cannot skip late-committing rows.
+CHANGE_XID = text("(pg_current_xact_id()::text::bigint)")
+
+
+def change_xid_column() -> Column:
+    """Change stamp for a syncable table; kept current by the sync_stamp_change trigger"""
+    return Column(BigInteger, nullable=False, server_default=CHANGE_XID)
+
+
+class SyncTombstone(Base):
+    """
+    One row per deleted row of a syncable table, written by the
+    sync_record_delete trigger and pruned after SYNC_TOMBSTONE_RETENTION_DAYS.
+    A drill group made private also gets one, for everyone but its owner.
+    """
+    __tablename__ = "sync_tombstones"
+    
+    id = Column(BigInteger, primary_key=True)
+    table_name = Column(String(63), nullable=False)
+    row_key = Column(JSONB, nullable=False)  # Primary key columns of the deleted row
+    user_ids = Column(ARRAY(Integer), nullable=True)  # Who may see it; NULL means everyone
+    except_user_id = Column(Integer, nullable=True)  # Never sent to this user
+    change_xid = change_xid_column()
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_sync_tombstones_change', 'change_xid', 'id'),
+        Index('idx_sync_tombstones_created_at', 'created_at'),
+    )
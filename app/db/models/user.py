@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -27,3 +27,13 @@ class User(Base):
     drill_groups = relationship("DrillGroup", back_populates="user")
     received_challenges = relationship("Challenge", back_populates="recipient", foreign_keys="Challenge.recipient_id")
     practice_sessions = relationship("PracticeSession", back_populates="user")
+    
+    __table_args__ = (
+        # Prefix autocomplete (LIKE 'abc%') under any collation
+        Index('idx_users_username_prefix', func.lower(username).label('username_lower'),
+              postgresql_ops={'username_lower': 'text_pattern_ops'}),
+        Index('idx_users_phone_prefix', phone_number, postgresql_ops={'phone_number': 'text_pattern_ops'}),
+        # Matches on any word of the name
+        Index('idx_users_full_name_trgm', func.lower(full_name).label('full_name_lower'), postgresql_using='gin',
+              postgresql_ops={'full_name_lower': 'gin_trgm_ops'}),
+    )
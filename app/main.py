@@ -10,7 +10,7 @@ from app.core.logging_config import setup_logging
 
 # Setup logging configuration
 logging.config.dictConfig(setup_logging(level="INFO" if settings.ENV == "production" else "DEBUG"))
-from app.api.v1 import auth, users, practice, practice_session, challenge, dashboard, advisor, drill_group, drill, search
+from app.api.v1 import auth, users, practice, practice_session, challenge, dashboard, advisor, drill_group, drill, search, events, rating, admin, home, batch, sync
 
 # Create FastAPI app
 app = FastAPI(
@@ -21,10 +21,48 @@ app = FastAPI(
 )
 
 # Database connection management
-from app.db.base import engine
+import asyncio
+from app.db.base import engine, use_async
+from app.utils import recommender, matchmaking, autocomplete, suggest
+from app.utils.tasks import run_periodic
+from app.crud import crud_drill_group_stats, crud_sync
+from app.utils.broker import broker
+
+background_tasks = []
+
+@app.on_event("startup")
+async def startup():
+    # Keep the in-memory drill recommender in sync with practice sessions
+    if use_async:
+        background_tasks.append(asyncio.create_task(recommender.run_refresh_loop()))
+        # Roll drill group popularity shards up into the ranked stats table
+        background_tasks.append(asyncio.create_task(run_periodic(
+            "drill_group_stats_rollup",
+            crud_drill_group_stats.rollup,
+            settings.POPULARITY_ROLLUP_SECONDS
+        )))
+        # Forget deletions older than any sync token still accepted
+        background_tasks.append(asyncio.create_task(run_periodic(
+            "sync_tombstone_prune",
+            crud_sync.prune_tombstones,
+            settings.SYNC_PRUNE_SECONDS
+        )))
+        # Keep the in-memory opponent index in sync with users and ratings
+        background_tasks.append(asyncio.create_task(matchmaking.run_refresh_loop()))
+        # Name index behind /search/suggest
+        background_tasks.append(asyncio.create_task(suggest.run_refresh_loop()))
+        if settings.USER_AUTOCOMPLETE_IN_MEMORY:
+            background_tasks.append(asyncio.create_task(autocomplete.run_refresh_loop()))
+    # Share realtime events between workers
+    if settings.REALTIME_PG_BRIDGE:
+        await broker.start_bridge()
 
 @app.on_event("shutdown")
 async def shutdown():
+    # Stop background jobs
+    for task in background_tasks:
+        task.cancel()
+    await broker.stop_bridge()
     # Close all database connections
     await engine.dispose()
 
@@ -62,6 +100,12 @@ app.include_router(dashboard.router, prefix=f"{settings.API_V1_STR}/dashboard",
 app.include_router(advisor.router, prefix=f"{settings.API_V1_STR}/advisor", tags=["advisor"])
 app.include_router(drill_group.router, prefix=f"{settings.API_V1_STR}/drill-groups", tags=["drill_groups"])
 app.include_router(search.router, prefix=settings.API_V1_STR)
+app.include_router(events.router, prefix=f"{settings.API_V1_STR}/events", tags=["events"])
+app.include_router(rating.router, prefix=f"{settings.API_V1_STR}/rating", tags=["rating"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["admin"])
+app.include_router(home.router, prefix=f"{settings.API_V1_STR}/home", tags=["home"])
+app.include_router(batch.router, prefix=f"{settings.API_V1_STR}/batch", tags=["batch"])
+app.include_router(sync.router, prefix=f"{settings.API_V1_STR}/sync", tags=["sync"])
 
 
 # Health check endpoint
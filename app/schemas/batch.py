@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Literal, Optional
+
+
+class BatchSubRequest(BaseModel):
+    id: Optional[str] = None  # echoed back so clients can match responses
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"]
+    path: str  # v1 route, with or without the /api/v1 prefix; may carry a query string
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+    @field_validator("path")
+    @classmethod
+    def path_is_absolute(cls, v: str) -> str:
+        if not v.startswith("/"):
+            raise ValueError("path must start with /")
+        return v
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest] = Field(..., min_length=1)
+    # Run every sub-request in one transaction; any failure rolls all back
+    atomic: bool = False
+
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
+    committed: bool
@@ -23,6 +23,10 @@ class ChallengeCreate(ChallengeBase):
     recipient_id: int
 
 
+class ChallengeBatchCreate(ChallengeBase):
+    recipient_ids: List[int] = Field(..., min_length=1, max_length=500)
+
+
 class ChallengeUpdate(BaseModel):
     status: Optional[ChallengeStatusEnum] = None
     title: Optional[str] = None
@@ -30,6 +34,10 @@ class ChallengeUpdate(BaseModel):
     target_score: Optional[int] = Field(None, ge=1, le=10)
 
 
+class ChallengeComplete(BaseModel):
+    winner_id: Optional[int] = Field(None, description="Winning participant; omit for a draw")
+
+
 class ChallengeInDBBase(ChallengeBase):
     id: int
     sender_id: int
@@ -38,6 +46,8 @@ class ChallengeInDBBase(ChallengeBase):
     expires_at: Optional[datetime] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+    winner_id: Optional[int] = None
+    completed_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -50,3 +60,22 @@ class Challenge(ChallengeInDBBase):
 class ChallengeWithUsers(Challenge):
     sender_username: str
     recipient_username: str
+
+
+class ChallengeBatchResult(BaseModel):
+    recipient_id: int
+    status: str  # "created", "not_found", "inactive", "self" or "duplicate"
+    challenge: Optional[Challenge] = None
+
+
+class ChallengeBatchResponse(BaseModel):
+    created: int
+    results: List[ChallengeBatchResult]
+
+
+class OpponentSuggestion(BaseModel):
+    user_id: int
+    username: str
+    rating: float
+    games: int
+    rating_difference: float
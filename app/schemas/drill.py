@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 
@@ -39,3 +39,24 @@ class DrillWithStats(Drill):
     shot_count: int = 0
     average_accuracy: float = 0.0
     completion_rate: float = 0.0  # Percentage of shots that met target score
+
+
+# Schema for recommender results
+class SimilarDrill(BaseModel):
+    drill_id: int
+    score: float = Field(description="Cosine similarity of the practice co-occurrence")
+    co_occurrences: int = Field(description="Number of users who practiced both drills")
+
+
+# Schema for a drill catalog page
+class DrillCatalogFacets(BaseModel):
+    drill_type: Dict[str, int] = {}
+    difficulty: Dict[str, int] = {}
+    duration: Dict[str, int] = Field(default={}, description="Counts per duration bucket (under_15, 15_29, 30_59, 60_plus)")
+
+
+class DrillCatalogPage(BaseModel):
+    items: List[Drill]
+    total: int
+    total_is_estimate: bool = False
+    facets: DrillCatalogFacets
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 from .drill import Drill
@@ -39,3 +39,20 @@ class DrillGroupInDBBase(DrillGroupBase):
 
 class DrillGroup(DrillGroupInDBBase):
     drills: Optional[List[Drill]] = Field(default=[])
+
+
+class DrillGroupFacets(BaseModel):
+    total: int = 0
+    tags: Dict[str, int] = Field(default={}, description="Number of drill groups per tag")
+    difficulty: Dict[str, int] = Field(default={}, description="Number of drill groups per difficulty level")
+    is_public: Dict[str, int] = Field(default={}, description="Number of public (true) and private (false) drill groups")
+
+
+class DrillGroupForkRequest(BaseModel):
+    drill_group_ids: List[int] = Field(..., min_length=1, max_length=100, description="IDs of the drill groups to copy")
+
+
+class DrillGroupForkResult(BaseModel):
+    source_id: int = Field(..., description="ID of the drill group that was copied")
+    drill_group: DrillGroupInDBBase
+    drill_count: int = Field(0, description="Number of drills copied into the new group")
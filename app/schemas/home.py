@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+from app.schemas.user import User
+from app.schemas.challenge import Challenge
+from app.schemas.session import Session
+
+
+class HomeScreen(BaseModel):
+    """
+    Everything the app shows at launch. A section that failed or timed out
+    is null and named in `errors` with the reason.
+    """
+    user: User
+    dashboard: Optional[Dict[str, Any]] = None
+    pending_challenges: Optional[List[Challenge]] = None
+    practice_sessions: Optional[List[Session]] = None
+    advice: Optional[Dict[str, Any]] = None
+    errors: Dict[str, str] = {}
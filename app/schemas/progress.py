@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+
+class ProgressPoint(BaseModel):
+    timestamp: datetime
+    accuracy: float
+    shot_count: int
+    session_id: Optional[int] = None
+    session_count: Optional[int] = None
+    moving_average: Optional[float] = None
+    cumulative_accuracy: Optional[float] = None
+    change: Optional[float] = None
+
+
+class ProgressTrend(BaseModel):
+    n: int = 0
+    slope_per_day: Optional[float] = None
+    slope_per_week: Optional[float] = None
+    intercept: Optional[float] = None
+    r_squared: Optional[float] = None
+    stderr: Optional[float] = None
+    ci_low_per_week: Optional[float] = Field(None, description="Lower bound of the 95% confidence interval")
+    ci_high_per_week: Optional[float] = Field(None, description="Upper bound of the 95% confidence interval")
+    significant: bool = False
+
+
+class ProgressCurve(BaseModel):
+    user_id: int
+    granularity: str
+    total_points: int
+    points: List[ProgressPoint]
+    trend: ProgressTrend
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class RatingHistoryEntry(BaseModel):
+    challenge_id: int
+    rating: float
+    delta: int
+    created_at: datetime
+
+
+class UserRating(BaseModel):
+    user_id: int
+    rating: float
+    games: int = 0
+    updated_at: Optional[datetime] = None
+    history: List[RatingHistoryEntry] = []
+
+
+class LeaderboardEntry(BaseModel):
+    user_id: int
+    username: str
+    rating: float
+    games: int
+
+
+class RatingRecomputeResult(BaseModel):
+    challenges: int
+    players: int
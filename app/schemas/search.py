@@ -6,7 +6,14 @@ class SearchResult(BaseModel):
     name: str
     type: str  # "drill" or "drill_group"
     description: Optional[str] = None
+    score: Optional[float] = None
 
 class SearchResponse(BaseModel):
     items: List[SearchResult]
     total: int
+
+class SearchSuggestion(BaseModel):
+    id: int
+    name: str
+    type: str  # "drill" or "drill_group"
+    popularity: int = 0
@@ -0,0 +1,17 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
+
+
+class SyncDeletion(BaseModel):
+    table: str
+    key: Dict[str, Any] = Field(description="Primary key of the removed row")
+    change_xid: int
+
+
+class SyncPage(BaseModel):
+    changes: Dict[str, List[Dict[str, Any]]] = Field(
+        default={}, description="Changed rows per table, whole rows including change_xid"
+    )
+    deleted: List[SyncDeletion] = []
+    next: str = Field(description="Pass as `since` for the next page, or to the next sync once has_more is false")
+    has_more: bool
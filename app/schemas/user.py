@@ -80,3 +80,12 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: Optional[str] = None
+
+
+class UserSuggestion(BaseModel):
+    id: int
+    username: str
+    full_name: Optional[str] = None
+    phone_number: Optional[str] = None  # Only returned to admins
+    is_active: bool = True
+    rank: int
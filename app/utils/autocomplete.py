@@ -0,0 +1,255 @@
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.user import User
+from app.utils.tasks import run_periodic
+
+# Re-read this much history on every refresh to catch rows committed
+# slightly out of order; re-applying a row is a no-op.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class _Node:
+    __slots__ = ("edges", "values")
+
+    def __init__(self):
+        # first character -> (edge label, child)
+        self.edges: Dict[str, Tuple[str, "_Node"]] = {}
+        self.values: Set[Hashable] = set()
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class RadixTrie:
+    """
+    Compressed prefix tree mapping string keys to sets of values.
+
+    Chains of single-child nodes are merged into one edge, so memory is
+    proportional to the number of distinct keys rather than characters.
+    Lookups walk at most len(prefix) characters and then read values
+    breadth-first, which returns shorter completions first.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+
+    def insert(self, key: str, value: Hashable) -> None:
+        node, rest = self.root, key
+        while rest:
+            edge = node.edges.get(rest[0])
+            if edge is None:
+                child = _Node()
+                node.edges[rest[0]] = (rest, child)
+                node, rest = child, ""
+                break
+            label, child = edge
+            common = _common_prefix(label, rest)
+            if common < len(label):
+                # Split the edge at the point where the keys diverge
+                middle = _Node()
+                middle.edges[label[common]] = (label[common:], child)
+                node.edges[rest[0]] = (label[:common], middle)
+                child = middle
+            node, rest = child, rest[common:]
+        node.values.add(value)
+
+    def remove(self, key: str, value: Hashable) -> None:
+        path = []
+        node, rest = self.root, key
+        while rest:
+            edge = node.edges.get(rest[0])
+            if edge is None or not rest.startswith(edge[0]):
+                return
+            path.append((node, rest[0]))
+            node, rest = edge[1], rest[len(edge[0]):]
+        node.values.discard(value)
+
+        # Drop emptied leaves and re-merge single-child chains
+        while path and not node.values and not node.edges:
+            parent, first = path.pop()
+            del parent.edges[first]
+            node = parent
+        if path and node is not self.root and not node.values and len(node.edges) == 1:
+            parent, first = path[-1]
+            label, _ = parent.edges[first]
+            child_label, child = next(iter(node.edges.values()))
+            parent.edges[first] = (label + child_label, child)
+
+    def search(self, prefix: str, limit: int) -> List[Hashable]:
+        """Up to `limit` values whose key starts with `prefix`, shortest keys first"""
+        node, rest = self.root, prefix
+        while rest:
+            edge = node.edges.get(rest[0])
+            if edge is None:
+                return []
+            label, child = edge
+            if rest.startswith(label):
+                rest = rest[len(label):]
+            elif not label.startswith(rest):
+                return []
+            else:
+                rest = ""
+            node = child
+
+        found: List[Hashable] = []
+        seen: Set[Hashable] = set()
+        queue = deque([node])
+        while queue and len(found) < limit:
+            node = queue.popleft()
+            for value in node.values:
+                if value not in seen:
+                    seen.add(value)
+                    found.append(value)
+                    if len(found) >= limit:
+                        return found
+            for first in sorted(node.edges):
+                queue.append(node.edges[first][1])
+        return found
+
+
+def _name_keys(full_name: Optional[str]) -> Iterable[str]:
+    """The whole name and each later word, so "john smith" matches "sm" too"""
+    if not full_name:
+        return []
+    name = full_name.lower().strip()
+    words = name.split()
+    return {name, *words[1:]}
+
+
+class UserAutocompleteIndex:
+    """
+    In-memory prefix index over username, full name and phone number.
+
+    Ranking matches crud_user.autocomplete: exact username, then username
+    prefix, then name prefix, then phone prefix; ties go to shorter
+    usernames.
+    """
+
+    def __init__(self):
+        self.watermark: Optional[datetime] = None
+        self.loaded = False
+        self._usernames = RadixTrie()
+        self._names = RadixTrie()
+        self._phones = RadixTrie()
+        self._users: Dict[int, Tuple[str, Optional[str], str, bool]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.loaded
+
+    def remove(self, user_id: int) -> None:
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+        username, full_name, phone_number, _ = entry
+        self._usernames.remove(username.lower(), user_id)
+        for key in _name_keys(full_name):
+            self._names.remove(key, user_id)
+        self._phones.remove(phone_number, user_id)
+
+    def upsert(
+        self, user_id: int, username: str, full_name: Optional[str], phone_number: str, is_active: bool
+    ) -> None:
+        entry = (username, full_name, phone_number, is_active)
+        current = self._users.get(user_id)
+        if current == entry:
+            return
+        if current is not None and current[:3] == entry[:3]:
+            self._users[user_id] = entry
+            return
+        self.remove(user_id)
+        self._usernames.insert(username.lower(), user_id)
+        for key in _name_keys(full_name):
+            self._names.insert(key, user_id)
+        self._phones.insert(phone_number, user_id)
+        self._users[user_id] = entry
+
+    def search(
+        self, query: str, *, limit: int = 10, include_phone: bool = False, active_only: bool = True
+    ) -> List[Dict]:
+        prefix = query.strip().lower()
+        digits = "".join(filter(str.isdigit, query))
+        # Over-fetch so inactive users and duplicates across fields can be dropped
+        fetch = limit * 4 if active_only else limit * 2
+
+        tiers: Dict[int, int] = {}
+        candidates = [(1, self._usernames.search(prefix, fetch)), (2, self._names.search(prefix, fetch))]
+        if include_phone and digits:
+            candidates.append((3, self._phones.search(digits, fetch)))
+        for tier, user_ids in candidates:
+            for user_id in user_ids:
+                if user_id not in tiers:
+                    tiers[user_id] = tier
+
+        results = []
+        for user_id, tier in tiers.items():
+            username, full_name, phone_number, is_active = self._users[user_id]
+            if active_only and not is_active:
+                continue
+            if tier == 1 and username.lower() == prefix:
+                tier = 0
+            results.append({
+                "id": user_id,
+                "username": username,
+                "full_name": full_name,
+                "phone_number": phone_number,
+                "is_active": is_active,
+                "rank": tier,
+            })
+        results.sort(key=lambda item: (item["rank"], len(item["username"]), item["username"]))
+        return results[:limit]
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Apply users created or changed since the watermark.
+
+        Returns:
+            int: Number of rows read
+        """
+        changed_at = func.coalesce(User.updated_at, User.created_at)
+        query = select(
+            User.id,
+            User.username,
+            User.full_name,
+            User.phone_number,
+            User.is_active,
+            changed_at.label("changed_at"),
+        )
+        if self.watermark is not None:
+            query = query.where(changed_at >= self.watermark - WATERMARK_OVERLAP)
+
+        result = await db.stream(query.execution_options(yield_per=5000))
+        rows = 0
+        async for partition in result.partitions():
+            for row in partition:
+                self.upsert(row.id, row.username, row.full_name, row.phone_number, bool(row.is_active))
+                if row.changed_at is not None and (self.watermark is None or row.changed_at > self.watermark):
+                    self.watermark = row.changed_at
+            rows += len(partition)
+        # Loaded even when the table is empty, so lookups stop falling back to
+        # the database; the watermark stays None until a row is seen
+        self.loaded = True
+        return rows
+
+
+user_index = UserAutocompleteIndex()
+
+
+async def run_refresh_loop(interval: Optional[int] = None) -> None:
+    """Background task that keeps the user autocomplete index in sync with users"""
+    await run_periodic(
+        "user_autocomplete",
+        user_index.refresh,
+        interval or settings.USER_AUTOCOMPLETE_REFRESH_SECONDS
+    )
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One connected client's bounded event queue.
+
+    When a slow client lets its queue fill up, the oldest event is dropped
+    to make room, so a stalled connection never blocks publishers or grows
+    without bound. `dropped` tells the client it missed events and should
+    re-fetch.
+    """
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Broker:
+    """
+    In-process publish/subscribe keyed by user id.
+
+    Publishing is synchronous and non-blocking: events are copied into each
+    subscriber's bounded queue. With the Postgres bridge started, events are
+    also sent with pg_notify and events from other workers are delivered
+    locally, so every worker sees every event exactly once.
+    """
+
+    def __init__(self, queue_size: int = 100, channel: str = "bowlsace_events"):
+        self.queue_size = queue_size
+        self.channel = channel
+        self.worker_id = uuid.uuid4().hex
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._bridge = None
+        self._bridge_lock = asyncio.Lock()
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def subscribe(self, user_id: int) -> Subscription:
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscribers[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subs = self._subscribers.get(subscription.user_id)
+        if subs is not None:
+            subs.discard(subscription)
+            if not subs:
+                del self._subscribers[subscription.user_id]
+
+    def _deliver(self, user_ids: Iterable[int], event: Dict[str, Any]) -> None:
+        for user_id in set(user_ids):
+            for subscription in tuple(self._subscribers.get(user_id, ())):
+                subscription.offer(event)
+
+    async def publish(self, user_ids: Iterable[int], event_type: str, data: Any) -> None:
+        """Send an event to every connection of the given users, on all workers"""
+        user_ids = list(set(user_ids))
+        event = {"type": event_type, "data": jsonable_encoder(data)}
+        self._deliver(user_ids, event)
+
+        if self._bridge is not None:
+            payload = json.dumps({"origin": self.worker_id, "user_ids": user_ids, "event": event})
+            try:
+                async with self._bridge_lock:
+                    await self._bridge.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            except Exception as e:
+                logger.error(f"Failed to forward event over LISTEN/NOTIFY: {e}")
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("origin") == self.worker_id:
+            return
+        self._deliver(message.get("user_ids", []), message.get("event", {}))
+
+    async def start_bridge(self) -> None:
+        """Share events between workers through Postgres LISTEN/NOTIFY"""
+        import asyncpg
+
+        dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        self._bridge = await asyncpg.connect(dsn)
+        await self._bridge.add_listener(self.channel, self._on_notify)
+        logger.info(f"Realtime bridge listening on channel {self.channel}")
+
+    async def stop_bridge(self) -> None:
+        if self._bridge is not None:
+            bridge, self._bridge = self._bridge, None
+            await bridge.close()
+
+
+broker = Broker(queue_size=settings.REALTIME_QUEUE_SIZE, channel=settings.REALTIME_CHANNEL)
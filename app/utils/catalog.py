@@ -0,0 +1,41 @@
+import asyncio
+from typing import Optional
+
+
+class CatalogVersion:
+    """
+    Process-local version number for the drill / drill group catalog.
+
+    CRUD functions that change drill or drill group names, descriptions or
+    visibility call bump(). Derived in-memory structures compare the
+    version they were built from with the current one, and background
+    rebuilders can sleep in wait_for_change() instead of polling.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._changed: Optional[asyncio.Event] = None
+
+    def _event(self) -> asyncio.Event:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def bump(self) -> int:
+        self.version += 1
+        self._event().set()
+        return self.version
+
+    async def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the catalog changes; False if `timeout` seconds passed first"""
+        event = self._event()
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            event.clear()
+
+
+catalog = CatalogVersion()
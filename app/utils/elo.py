@@ -0,0 +1,92 @@
+"""
+Elo rating arithmetic.
+
+`update` applies a single result in O(1) and is used when a challenge is
+completed. `replay` rebuilds every rating from the full chronological list
+of results with NumPy: results are scheduled into rounds in which no player
+appears twice, and each round is applied as one vectorized update, which
+gives exactly the same ratings as applying the results one by one.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+
+def expected_score(rating_a: float, rating_b: float) -> float:
+    """Probability that player A beats player B"""
+    return 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / 400.0))
+
+
+def update(rating_a: float, rating_b: float, score_a: float, k: float) -> Tuple[float, float]:
+    """
+    Apply one result.
+    
+    Args:
+        score_a: 1 if A won, 0 if B won, 0.5 for a draw
+    
+    Returns:
+        Tuple: New ratings for A and B
+    """
+    delta = k * (score_a - expected_score(rating_a, rating_b))
+    return rating_a + delta, rating_b - delta
+
+
+def _schedule(a: np.ndarray, b: np.ndarray, n_players: int) -> np.ndarray:
+    """
+    Assign each result to the earliest round after both players' previous
+    results, so rounds can be applied in order without changing the outcome.
+    """
+    next_round: List[int] = [0] * n_players
+    rounds: List[int] = []
+    append = rounds.append
+    for x, y in zip(a.tolist(), b.tolist()):
+        r = next_round[x]
+        if next_round[y] > r:
+            r = next_round[y]
+        append(r)
+        next_round[x] = next_round[y] = r + 1
+    return np.asarray(rounds, dtype=np.int64)
+
+
+def replay(
+    a: np.ndarray,
+    b: np.ndarray,
+    score_a: np.ndarray,
+    n_players: int,
+    *,
+    initial: float,
+    k: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Replay results in chronological order starting from `initial` ratings.
+    
+    Args:
+        a, b: Dense player indices (0..n_players-1) for each result
+        score_a: Score of player A for each result
+    
+    Returns:
+        Tuple: Final ratings per player, rating of A and of B after each
+        result, and A's rating change for each result (B's is the negation)
+    """
+    ratings = np.full(n_players, initial, dtype=np.float64)
+    after_a = np.empty(len(a), dtype=np.float64)
+    after_b = np.empty(len(a), dtype=np.float64)
+    deltas = np.empty(len(a), dtype=np.float64)
+    if len(a) == 0:
+        return ratings, after_a, after_b, deltas
+    
+    rounds = _schedule(a, b, n_players)
+    order = np.argsort(rounds, kind="stable")
+    boundaries = np.flatnonzero(np.diff(rounds[order])) + 1
+    
+    for batch in np.split(order, boundaries):
+        pa, pb = a[batch], b[batch]
+        ra, rb = ratings[pa], ratings[pb]
+        delta = k * (score_a[batch] - 1.0 / (1.0 + 10.0 ** ((rb - ra) / 400.0)))
+        ratings[pa] = ra + delta
+        ratings[pb] = rb - delta
+        after_a[batch] = ra + delta
+        after_b[batch] = rb - delta
+        deltas[batch] = delta
+    
+    return ratings, after_a, after_b, deltas
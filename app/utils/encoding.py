@@ -0,0 +1,124 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgpack
+from fastapi import Request, Response
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+COLUMNAR_JSON = "application/vnd.bowlsace.columnar+json"
+COLUMNAR_MSGPACK = "application/vnd.bowlsace.columnar+msgpack"
+
+# Media type -> (columnar layout, msgpack encoding)
+MEDIA_TYPES: Dict[str, Tuple[bool, bool]] = {
+    JSON: (False, False),
+    MSGPACK: (False, True),
+    "application/x-msgpack": (False, True),
+    COLUMNAR_JSON: (True, False),
+    COLUMNAR_MSGPACK: (True, True),
+}
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """
+    Pick the response media type from an Accept header, honouring q-values.
+    Anything unrecognised (including */*) falls back to plain JSON.
+    """
+    best, best_q = JSON, 0.0
+    for part in (accept or "").split(","):
+        media_type, _, params = part.strip().partition(";")
+        media_type = media_type.strip().lower()
+        if media_type not in MEDIA_TYPES:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > best_q:
+            best, best_q = media_type, q
+    return best
+
+
+def _columns(records: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    fields: Dict[str, None] = {}
+    for record in records:
+        fields.update(dict.fromkeys(record))
+    return {field: [record.get(field) for record in records] for field in fields}
+
+
+def to_columnar(records: List[Dict[str, Any]], entities: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Lay records out as one array per field.
+
+    `entities` maps a field holding a nested object (or list of objects)
+    with an `id` to a shared table name. Those objects are replaced by
+    their ids and stored once per table under `refs`, so a drill repeated
+    across a hundred sessions is sent once. Nested objects are normalized
+    recursively into the same tables.
+    """
+    entities = entities or {}
+    tables: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+
+    def ref(table: str, entity: Dict[str, Any]) -> Any:
+        rows = tables.setdefault(table, {})
+        if entity["id"] not in rows:
+            rows[entity["id"]] = None  # Reserve the slot before recursing
+            rows[entity["id"]] = normalize(entity)
+        return entity["id"]
+
+    def normalize(record: Dict[str, Any]) -> Dict[str, Any]:
+        flat = {}
+        for field, value in record.items():
+            table = entities.get(field)
+            if table is None or value is None:
+                flat[field] = value
+            elif isinstance(value, list):
+                flat[field] = [ref(table, item) for item in value]
+            else:
+                flat[field] = ref(table, value)
+        return flat
+
+    rows = [normalize(record) for record in records]
+    return {
+        "count": len(rows),
+        "columns": _columns(rows),
+        "refs": {
+            table: {"count": len(entries), "columns": _columns(list(entries.values()))}
+            for table, entries in tables.items()
+        },
+    }
+
+
+def encode(records: List[Any], media_type: str, entities: Optional[Dict[str, str]] = None) -> bytes:
+    """Serialize a list of records (dicts or models) in the negotiated media type"""
+    columnar, binary = MEDIA_TYPES[media_type]
+    if columnar:
+        # Deduplicate first so each shared entity is only encoded once
+        records = [record.model_dump() if isinstance(record, BaseModel) else record for record in records]
+        records = to_columnar(records, entities)
+    # pydantic-core handles models, datetimes and enums natively, much
+    # faster than jsonable_encoder followed by the stdlib json module
+    if binary:
+        return msgpack.packb(to_jsonable_python(records), use_bin_type=True)
+    return to_json(records)
+
+
+def negotiated_response(
+    request: Request, records: List[Any], *, entities: Optional[Dict[str, str]] = None
+) -> Response:
+    """
+    Response for a list endpoint in the format the client's Accept header
+    asks for: plain JSON (default), msgpack, or the columnar layout with
+    deduplicated nested entities in either encoding.
+    """
+    media_type = negotiate(request.headers.get("Accept"))
+    return Response(
+        content=encode(records, media_type, entities),
+        media_type=media_type,
+        headers={"Vary": "Accept"},
+    )
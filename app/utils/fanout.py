@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+ReadJob = Callable[[AsyncSession], Awaitable[Any]]
+
+
+async def gather_reads(*jobs: ReadJob, limit: Optional[int] = None) -> List[Any]:
+    """
+    Run independent read queries concurrently, each on its own short-lived
+    session (and so its own pooled connection).
+
+    At most `limit` jobs (READ_FANOUT_LIMIT by default) run at once, which
+    caps how many connections a single request can take from the pool.
+    Results come back in job order; the first failure is raised after the
+    other jobs finish.
+
+    Jobs see separate snapshots, so only use this for reads that do not
+    need to be mutually consistent.
+    """
+    from app.db.base import async_session
+
+    semaphore = asyncio.Semaphore(limit or settings.READ_FANOUT_LIMIT)
+
+    async def run(job: ReadJob) -> Any:
+        async with semaphore:
+            async with async_session() as session:
+                return await job(session)
+
+    results = await asyncio.gather(*(run(job) for job in jobs), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
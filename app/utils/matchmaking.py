@@ -0,0 +1,135 @@
+import bisect
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.rating import UserRating
+from app.db.models.user import User
+from app.utils.tasks import run_periodic
+
+# Re-read this much history on every refresh to catch rows committed
+# slightly out of order; re-applying a row is a no-op.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class OpponentIndex:
+    """
+    In-memory index of active users ordered by rating.
+
+    `_keys` is a sorted list of (rating, user_id), so finding the caller's
+    position is a binary search and the nearest opponents are read by
+    walking outwards from it: O(log n + K) per lookup. Rating changes move
+    a single entry.
+    """
+
+    def __init__(self):
+        self.watermark: Optional[datetime] = None
+        self._keys: List[Tuple[float, int]] = []
+        self._users: Dict[int, Tuple[float, str, int]] = {}  # user_id -> (rating, username, games)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def remove(self, user_id: int) -> None:
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return
+        i = bisect.bisect_left(self._keys, (entry[0], user_id))
+        if i < len(self._keys) and self._keys[i] == (entry[0], user_id):
+            del self._keys[i]
+
+    def upsert(self, user_id: int, rating: float, username: str, games: int = 0) -> None:
+        current = self._users.get(user_id)
+        if current is not None and current[0] == rating:
+            self._users[user_id] = (rating, username, games)
+            return
+        self.remove(user_id)
+        bisect.insort(self._keys, (rating, user_id))
+        self._users[user_id] = (rating, username, games)
+
+    def rating_of(self, user_id: int) -> Optional[float]:
+        entry = self._users.get(user_id)
+        return entry[0] if entry else None
+
+    def nearest(
+        self, rating: float, k: int, exclude: Optional[Set[int]] = None
+    ) -> List[Dict]:
+        """
+        The `k` users closest to `rating`, nearest first, skipping `exclude`.
+        """
+        exclude = exclude or set()
+        keys = self._keys
+        hi = bisect.bisect_left(keys, (rating, -1))
+        lo = hi - 1
+        found = []
+        while len(found) < k and (lo >= 0 or hi < len(keys)):
+            # Take whichever side is closer to the target rating
+            if hi >= len(keys) or (lo >= 0 and rating - keys[lo][0] <= keys[hi][0] - rating):
+                key, lo = keys[lo], lo - 1
+            else:
+                key, hi = keys[hi], hi + 1
+            user_id = key[1]
+            if user_id in exclude:
+                continue
+            user_rating, username, games = self._users[user_id]
+            found.append({
+                "user_id": user_id,
+                "username": username,
+                "rating": user_rating,
+                "games": games,
+                "rating_difference": user_rating - rating,
+            })
+        return found
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Apply users and ratings changed since the watermark.
+
+        Returns:
+            int: Number of rows read
+        """
+        changed_at = func.greatest(
+            func.coalesce(User.updated_at, User.created_at),
+            UserRating.updated_at
+        )
+        query = (
+            select(
+                User.id,
+                User.username,
+                User.is_active,
+                func.coalesce(UserRating.rating, settings.ELO_INITIAL_RATING).label("rating"),
+                func.coalesce(UserRating.games, 0).label("games"),
+                changed_at.label("changed_at"),
+            )
+            .outerjoin(UserRating, UserRating.user_id == User.id)
+        )
+        if self.watermark is not None:
+            query = query.where(changed_at >= self.watermark - WATERMARK_OVERLAP)
+
+        result = await db.stream(query.execution_options(yield_per=5000))
+        rows = 0
+        async for partition in result.partitions():
+            for row in partition:
+                if row.is_active:
+                    self.upsert(row.id, float(row.rating), row.username, row.games)
+                else:
+                    self.remove(row.id)
+                if row.changed_at is not None and (self.watermark is None or row.changed_at > self.watermark):
+                    self.watermark = row.changed_at
+            rows += len(partition)
+        return rows
+
+
+opponent_index = OpponentIndex()
+
+
+async def run_refresh_loop(interval: Optional[int] = None) -> None:
+    """Background task that keeps the opponent index in sync with users and ratings"""
+    await run_periodic(
+        "opponent_index",
+        opponent_index.refresh,
+        interval or settings.MATCHMAKING_REFRESH_SECONDS
+    )
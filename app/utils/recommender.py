@@ -0,0 +1,138 @@
+import heapq
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.practice_session import PracticeSession
+from app.utils.tasks import run_periodic
+
+# Rows committed slightly out of created_at order are picked up by re-reading
+# this much history on every refresh. Re-reading is harmless because
+# co-occurrence is counted over distinct (user, drill) pairs.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class DrillRecommender:
+    """
+    In-memory "users who practiced X also practiced Y" index.
+
+    Co-occurrence is a sparse drill x drill matrix stored as nested dicts:
+    cell (i, j) is the number of users who practiced both drills. Each drill
+    keeps a precomputed top-K neighbour list ranked by cosine similarity,
+    so lookups are plain dict reads.
+    """
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self.watermark: Optional[datetime] = None
+        self._user_drills: Dict[int, Set[int]] = defaultdict(set)
+        self._drill_users: Dict[int, int] = defaultdict(int)
+        self._co_counts: Dict[int, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self._neighbours: Dict[int, List[Tuple[int, float, int]]] = {}
+
+    def add_pairs(self, pairs: Iterable[Tuple[int, int]]) -> Set[int]:
+        """
+        Fold (user_id, drill_id) pairs into the matrix.
+
+        Returns:
+            Set[int]: Drills whose counts changed
+        """
+        touched: Set[int] = set()
+        for user_id, drill_id in pairs:
+            drills = self._user_drills[user_id]
+            if drill_id in drills:
+                continue
+            for other in drills:
+                self._co_counts[drill_id][other] += 1
+                self._co_counts[other][drill_id] += 1
+                touched.add(other)
+            drills.add(drill_id)
+            self._drill_users[drill_id] += 1
+            touched.add(drill_id)
+        return touched
+
+    def _rank(self, drill_id: int) -> List[Tuple[int, float, int]]:
+        row = self._co_counts.get(drill_id)
+        if not row:
+            return []
+        n_i = self._drill_users[drill_id]
+        scored = (
+            (other, count / math.sqrt(n_i * self._drill_users[other]), count)
+            for other, count in row.items()
+        )
+        return heapq.nlargest(self.top_k, scored, key=lambda item: (item[1], item[2]))
+
+    def refresh_neighbours(self, touched: Set[int]) -> None:
+        """Recompute top-K lists for changed drills and the drills that list them"""
+        affected = set(touched)
+        for drill_id in touched:
+            affected.update(self._co_counts.get(drill_id, ()))
+        for drill_id in affected:
+            self._neighbours[drill_id] = self._rank(drill_id)
+
+    def similar(self, drill_id: int, limit: int = 10) -> List[Tuple[int, float, int]]:
+        """Top neighbours of a drill as (drill_id, score, co_occurrences)"""
+        return self._neighbours.get(drill_id, [])[:limit]
+
+    def recommend_for_user(self, user_id: int, limit: int = 10) -> List[Tuple[int, float, int]]:
+        """
+        Rank drills the user has not practiced by summed similarity to the drills they have.
+        """
+        practiced = self._user_drills.get(user_id)
+        if not practiced:
+            return []
+        scores: Dict[int, float] = defaultdict(float)
+        counts: Dict[int, int] = defaultdict(int)
+        for drill_id in practiced:
+            for other, score, count in self._neighbours.get(drill_id, ()):
+                if other not in practiced:
+                    scores[other] += score
+                    counts[other] += count
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(other, score, counts[other]) for other, score in best]
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Pull practice sessions newer than the watermark and update the index.
+
+        Returns:
+            int: Number of rows read
+        """
+        query = select(
+            PracticeSession.user_id,
+            PracticeSession.drill_id,
+            PracticeSession.created_at
+        ).order_by(PracticeSession.created_at)
+        if self.watermark is not None:
+            query = query.where(PracticeSession.created_at >= self.watermark - WATERMARK_OVERLAP)
+
+        result = await db.stream(query.execution_options(yield_per=5000))
+        rows = 0
+        touched: Set[int] = set()
+        async for partition in result.partitions():
+            touched |= self.add_pairs((row.user_id, row.drill_id) for row in partition)
+            rows += len(partition)
+            last = partition[-1].created_at
+            if self.watermark is None or last > self.watermark:
+                self.watermark = last
+
+        if touched:
+            self.refresh_neighbours(touched)
+        return rows
+
+
+drill_recommender = DrillRecommender(top_k=settings.RECOMMENDER_TOP_K)
+
+
+async def run_refresh_loop(interval: Optional[int] = None) -> None:
+    """Background task that keeps the recommender in sync with practice_sessions"""
+    await run_periodic(
+        "drill_recommender",
+        drill_recommender.refresh,
+        interval or settings.RECOMMENDER_REFRESH_SECONDS
+    )
@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+from app.utils import singleflight
+
+
+class SearchCache:
+    """
+    Bounded LRU cache of serialized search responses.
+
+    Callers include the catalog version in the key, so a catalog change on
+    this worker makes every older entry unreachable (they age out of the
+    LRU). Entries also expire after `ttl` seconds, which bounds staleness
+    from changes made on other workers.
+
+    Concurrent misses for the same key share a single computation through
+    the "search" singleflight group.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+        self._flight = singleflight.group("search")
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self._hit_seconds = 0.0
+        self._miss_seconds = 0.0
+        self._max_miss_seconds = 0.0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[bytes]]
+    ) -> Tuple[bytes, bool]:
+        """
+        Cached value for `key`, computing it on a miss.
+
+        Returns:
+            Tuple: The value and whether it was served without computing
+            (a cache hit or a shared in-flight computation)
+        """
+        start = time.perf_counter()
+        value = self.get(key)
+        if value is not None:
+            self.hits += 1
+            self._hit_seconds += time.perf_counter() - start
+            return value, True
+
+        computed = False
+
+        async def run() -> bytes:
+            nonlocal computed
+            computed = True
+            value = await compute()
+            self.set(key, value)
+            return value
+
+        value = await self._flight.do(key, run)
+        if not computed:
+            self.coalesced += 1
+            return value, True
+        elapsed = time.perf_counter() - start
+        self.misses += 1
+        self._miss_seconds += elapsed
+        self._max_miss_seconds = max(self._max_miss_seconds, elapsed)
+        return value, False
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            # Share of lookups that did not run the query themselves
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "avg_hit_ms": self._hit_seconds / self.hits * 1000 if self.hits else 0.0,
+            "avg_miss_ms": self._miss_seconds / self.misses * 1000 if self.misses else 0.0,
+            "max_miss_ms": self._max_miss_seconds * 1000,
+        }
+
+
+search_cache = SearchCache(maxsize=settings.SEARCH_CACHE_SIZE, ttl=settings.SEARCH_CACHE_TTL_SECONDS)
@@ -0,0 +1,94 @@
+import math
+from typing import List, Optional, Sequence, Tuple
+
+# Two-sided 95% Student t critical values by degrees of freedom.
+# Beyond 30 degrees of freedom the normal approximation is close enough.
+_T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571,
+    6: 2.447, 7: 2.365, 8: 2.306, 9: 2.262, 10: 2.228,
+    11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086,
+    21: 2.080, 22: 2.074, 23: 2.069, 24: 2.064, 25: 2.060,
+    26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+}
+
+
+def t_critical_95(dof: int) -> float:
+    """Two-sided 95% t critical value for the given degrees of freedom"""
+    if dof <= 0:
+        return float("inf")
+    return _T_CRITICAL_95.get(dof, 1.96)
+
+
+def slope_confidence_interval(
+    slope: float,
+    stderr: Optional[float],
+    n: int
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Return the 95% confidence interval for a least-squares slope.
+
+    Args:
+        slope: float - Fitted slope
+        stderr: Optional[float] - Standard error of the slope
+        n: int - Number of points used for the fit
+
+    Returns:
+        Tuple: (lower, upper), or (None, None) when the fit has no residual freedom
+    """
+    if stderr is None or n < 3:
+        return None, None
+    margin = t_critical_95(n - 2) * stderr
+    return slope - margin, slope + margin
+
+
+def lttb(points: Sequence[Tuple[float, float]], threshold: int) -> List[int]:
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; every bucket in between
+    contributes the point forming the largest triangle with the previously
+    selected point and the average of the next bucket. Runs in O(n).
+
+    Args:
+        points: Sequence of (x, y) pairs sorted by x
+        threshold: int - Maximum number of points to keep
+
+    Returns:
+        List[int]: Indices of the selected points, in order
+    """
+    n = len(points)
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:max(threshold, 0)]
+
+    selected = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average point of the next bucket
+        next_start = int(math.floor((i + 1) * bucket_size)) + 1
+        next_end = min(int(math.floor((i + 2) * bucket_size)) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(points[j][0] for j in range(next_start, next_end)) / span
+        avg_y = sum(points[j][1] for j in range(next_start, next_end)) / span
+
+        # Pick the point of the current bucket with the largest triangle area
+        start = int(math.floor(i * bucket_size)) + 1
+        end = int(math.floor((i + 1) * bucket_size)) + 1
+        ax, ay = points[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (points[j][1] - ay) - (ax - points[j][0]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+    return selected
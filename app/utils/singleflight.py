@@ -0,0 +1,146 @@
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn query arguments (lists, dicts, sets) into a hashable key"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(item) for item in value))
+    return value
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical async calls into one.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight await the same result (or exception) instead of running it
+    again. Nothing is cached: once the call finishes the next caller runs
+    it afresh. If the running caller is cancelled, one of the waiters
+    takes over.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_waiters = 0
+        self._waiters: Dict[Hashable, int] = {}
+        self._seconds = 0.0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        release: Optional[AsyncSession] = None
+    ) -> T:
+        """
+        Run `fn` unless an identical call (same key) is already in flight.
+
+        Args:
+            release: The caller's session; if this call waits on another
+                caller's result, the session's transaction is ended first
+                so its pooled connection is free while waiting
+        """
+        while True:
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            if release is not None and release.in_transaction():
+                await release.commit()
+            self._waiters[key] = self._waiters.get(key, 0) + 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+            try:
+                result = await asyncio.shield(future)
+                self.coalesced += 1
+                return result
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The running caller went away; take over
+            finally:
+                self._waiters[key] -= 1
+                if not self._waiters[key]:
+                    del self._waiters[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        start = time.perf_counter()
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.errors += 1
+            future.set_exception(e)
+            # Mark retrieved so an exception nobody awaited is not logged
+            future.exception()
+            raise
+        finally:
+            self._seconds += time.perf_counter() - start
+            self._inflight.pop(key, None)
+        future.set_result(result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._inflight),
+            "max_waiters": self.max_waiters,
+            "coalesced_ratio": self.coalesced / calls if calls else 0.0,
+            "avg_execution_ms": self._seconds / self.executions * 1000 if self.executions else 0.0,
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def group(name: str) -> SingleFlight:
+    """The named SingleFlight group, created on first use"""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every group on this worker"""
+    return {name: flight.stats() for name, flight in sorted(_groups.items())}
+
+
+def coalesce(name: Optional[str] = None):
+    """
+    Decorator for read-only CRUD functions taking the session first.
+
+    Concurrent calls with equal arguments (the session is ignored) share
+    one execution, so the function must not write and its result must be
+    safe to hand to several callers (plain data rather than ORM objects).
+    """
+    def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        flight = group(name or f"{fn.__module__}.{fn.__qualname__}")
+
+        @functools.wraps(fn)
+        async def wrapper(db: AsyncSession, *args: Any, **kwargs: Any) -> T:
+            key = (_freeze(args), _freeze(kwargs))
+            return await flight.do(key, lambda: fn(db, *args, **kwargs), release=db)
+
+        wrapper.singleflight = flight
+        return wrapper
+    return decorator
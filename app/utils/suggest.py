@@ -0,0 +1,163 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.drill import Drill
+from app.db.models.drill_group import DrillGroup
+from app.db.models.drill_group_stats import DrillGroupStats
+from app.db.models.practice_session import PracticeSession
+from app.utils.catalog import catalog
+
+logger = logging.getLogger(__name__)
+
+# (popularity, type, id, name)
+Entry = Tuple[int, str, int, str]
+
+
+class NameSuggestIndex:
+    """
+    Prefix index over drill names and public drill group names.
+
+    Every word start of every name is a key in one sorted array, so all
+    names with a word starting with a prefix form a contiguous range found
+    with two binary searches. Each key also carries its entry's popularity
+    rank, and a sparse table answers "best entry in this range" in O(1);
+    the top K are read by repeatedly taking the best and splitting the
+    range around it, so a lookup costs O(log n + K log K) whatever the
+    size of the range.
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.built_at: Optional[float] = None
+        self._keys: List[str] = []
+        self._entries: List[Entry] = []  # Ordered best first
+        self._table: List[np.ndarray] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    def build(self, entries: Iterable[Entry], version: Optional[int] = None) -> None:
+        # Rank 0 is the most popular entry; ties go to shorter names
+        ranked = sorted(entries, key=lambda entry: (-entry[0], len(entry[3]), entry[3]))
+        keyed = []
+        for rank, entry in enumerate(ranked):
+            name = entry[3].lower()
+            start = 0
+            for word in name.split():
+                start = name.index(word, start)
+                keyed.append((name[start:], rank))
+                start += len(word)
+        keyed.sort()
+
+        keys = [key for key, _ in keyed]
+        # Encode rank and key position together so the range minimum says where it is
+        n = max(len(keys), 1)
+        level = np.fromiter((rank for _, rank in keyed), dtype=np.int64, count=len(keyed)) * n
+        level += np.arange(len(keyed), dtype=np.int64)
+        table = [level]
+        width = 1
+        while width * 2 <= len(keyed):
+            level = np.minimum(level[:-width], level[width:])
+            table.append(level)
+            width *= 2
+
+        # Swap in one step so concurrent readers never see a half-built index
+        self._keys, self._entries, self._table = keys, ranked, table
+        self.version = version
+        self.built_at = time.monotonic()
+
+    def _range_min(self, lo: int, hi: int) -> int:
+        """Smallest encoded value for keys lo..hi inclusive"""
+        level = (hi - lo + 1).bit_length() - 1
+        row = self._table[level]
+        return int(min(row[lo], row[hi - (1 << level) + 1]))
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        prefix = " ".join(prefix.lower().split())
+        if not prefix or not self._keys:
+            return []
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\uffff", lo) - 1
+        if lo > hi:
+            return []
+
+        n = len(self._keys)
+        heap = [(self._range_min(lo, hi), lo, hi)]
+        seen = set()
+        results = []
+        while heap and len(results) < limit:
+            value, lo, hi = heapq.heappop(heap)
+            rank, position = divmod(value, n)
+            # A name can match on several words; count it once
+            if rank not in seen:
+                seen.add(rank)
+                popularity, entry_type, entry_id, name = self._entries[rank]
+                results.append({"id": entry_id, "name": name, "type": entry_type, "popularity": popularity})
+            if lo < position:
+                heapq.heappush(heap, (self._range_min(lo, position - 1), lo, position - 1))
+            if position < hi:
+                heapq.heappush(heap, (self._range_min(position + 1, hi), position + 1, hi))
+        return results
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """
+        Rebuild from the database.
+
+        Drill popularity is the number of practice sessions on the drill;
+        drill group popularity comes from the rolled-up drill_group_stats.
+
+        Returns:
+            int: Number of names indexed
+        """
+        version = catalog.version
+        drill_counts = (
+            select(PracticeSession.drill_id, func.count().label("practice_count"))
+            .group_by(PracticeSession.drill_id)
+            .subquery()
+        )
+        drills = await db.execute(
+            select(Drill.id, Drill.name, func.coalesce(drill_counts.c.practice_count, 0))
+            .outerjoin(drill_counts, drill_counts.c.drill_id == Drill.id)
+        )
+        groups = await db.execute(
+            select(DrillGroup.id, DrillGroup.name, func.coalesce(DrillGroupStats.practice_count, 0))
+            .outerjoin(DrillGroupStats, DrillGroupStats.drill_group_id == DrillGroup.id)
+            .where(DrillGroup.is_public.is_(True))
+        )
+        entries = [(int(count), "drill", drill_id, name) for drill_id, name, count in drills if name]
+        entries.extend((int(count), "drill_group", group_id, name) for group_id, name, count in groups if name)
+        self.build(entries, version)
+        return len(entries)
+
+
+suggest_index = NameSuggestIndex()
+
+
+async def run_refresh_loop(interval: Optional[int] = None) -> None:
+    """
+    Build the suggest index, then rebuild it whenever this worker changes
+    the catalog, and at least every `interval` seconds to pick up
+    popularity and changes made by other workers.
+    """
+    from app.db.base import async_session
+
+    interval = interval or settings.SUGGEST_REFRESH_SECONDS
+    while True:
+        try:
+            async with async_session() as session:
+                await suggest_index.refresh(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background job suggest_index failed: {e}")
+        await catalog.wait_for_change(timeout=interval)
@@ -0,0 +1,29 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodic(
+    name: str,
+    job: Callable[[AsyncSession], Awaitable[Any]],
+    interval: float
+) -> None:
+    """
+    Run `job` with a fresh database session every `interval` seconds until cancelled.
+    Failures are logged and retried on the next tick.
+    """
+    from app.db.base import async_session
+
+    while True:
+        try:
+            async with async_session() as session:
+                await job(session)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background job {name} failed: {e}")
+        await asyncio.sleep(interval)
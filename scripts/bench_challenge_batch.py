@@ -0,0 +1,77 @@
+"""Benchmark batch challenge creation against the one-by-one path
+
+Seeds temporary recipients inside a transaction, then sends the same
+challenge to all of them twice: once the way POST /challenge/send does
+(recipient lookup + insert + commit per recipient) and once through
+crud_challenge.create_many. Everything is rolled back at the end.
+
+Usage: python -m scripts.bench_challenge_batch [recipient_count]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.base import Base  # noqa: registers all models before the CRUD imports
+from app.crud import crud_challenge, crud_user
+from app.schemas.challenge import ChallengeCreate, ChallengeBatchCreate
+
+
+async def bench_challenge_batch(recipient_count: int):
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        # Session commits become savepoint releases inside the outer transaction
+        db = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+        try:
+            sender_id = (await db.execute(text("SELECT id FROM users ORDER BY id LIMIT 1"))).scalar()
+            if sender_id is None:
+                print("Need at least one user to send the challenges")
+                return
+
+            result = await db.execute(text("""
+                INSERT INTO users (email, username, hashed_password, phone_number, phone_verified,
+                                   email_verified, is_active, is_admin)
+                SELECT 'bench' || g || '@example.com', 'bench_user_' || g, 'x',
+                       '+99' || lpad(g::text, 10, '0'), false, false, true, false
+                FROM generate_series(1, :n) AS g
+                RETURNING id
+            """), {"n": recipient_count})
+            recipient_ids = [row.id for row in result]
+
+            start = time.perf_counter()
+            for recipient_id in recipient_ids:
+                recipient = await crud_user.get(db, user_id=recipient_id)
+                if recipient:
+                    await crud_challenge.create(
+                        db,
+                        obj_in=ChallengeCreate(title="Club night", recipient_id=recipient_id),
+                        sender_id=sender_id
+                    )
+            one_by_one = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = await crud_challenge.create_many(
+                db,
+                obj_in=ChallengeBatchCreate(title="Club night", recipient_ids=recipient_ids),
+                sender_id=sender_id
+            )
+            batch = time.perf_counter() - start
+            created = sum(1 for item in results if item["status"] == "created")
+
+            print(f"Recipients:  {recipient_count}")
+            print(f"One-by-one:  {one_by_one * 1000:8.1f} ms  ({recipient_count / one_by_one:8.0f} challenges/s)")
+            print(f"Batch:       {batch * 1000:8.1f} ms  ({created / batch:8.0f} challenges/s)")
+            print(f"Speedup:     {one_by_one / batch:8.1f}x")
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    asyncio.run(bench_challenge_batch(count))
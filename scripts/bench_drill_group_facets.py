@@ -0,0 +1,92 @@
+"""Benchmark tag filtering and facet counts on 100k drill groups
+
+Seeds 100k drill groups server-side inside a transaction, times the tag
+containment listing and the single-statement facets query, prints the
+query plan for the containment filter, then rolls everything back.
+
+Usage: python -m scripts.bench_drill_group_facets [group_count]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.base import Base  # noqa: registers all models before the CRUD imports
+from app.crud import crud_drill_group
+
+REPEATS = 20
+
+
+async def timed(label, coro_factory):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        await coro_factory()
+    elapsed = (time.perf_counter() - start) / REPEATS * 1000
+    print(f"{label:<45} {elapsed:8.2f} ms/call")
+
+
+async def bench_drill_group_facets(group_count: int):
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn)
+        try:
+            owner_id = (await db.execute(text("SELECT id FROM users ORDER BY id LIMIT 1"))).scalar()
+            if owner_id is None:
+                print("Need at least one user to own the seeded drill groups")
+                return
+
+            print(f"Seeding {group_count} drill groups...")
+            start = time.perf_counter()
+            await db.execute(text("""
+                INSERT INTO drill_groups (user_id, name, description, is_public, difficulty, tags)
+                SELECT :owner_id,
+                       'Bench group ' || g,
+                       'Benchmark drill group',
+                       g % 3 <> 0,
+                       1 + g % 5,
+                       jsonb_build_array('tag' || (g % 50), 'tag' || (g % 7), 'level' || (g % 3))
+                FROM generate_series(1, :group_count) AS g
+            """), {"owner_id": owner_id, "group_count": group_count})
+            await db.execute(text("ANALYZE drill_groups"))
+            print(f"Seeded in {time.perf_counter() - start:.1f}s\n")
+
+            await timed(
+                "list tags=[tag7] limit 100",
+                lambda: crud_drill_group.get_multi(db, tags=["tag7"], limit=100)
+            )
+            await timed(
+                "list tags=[tag7, tag3] limit 100",
+                lambda: crud_drill_group.get_multi(db, tags=["tag7", "tag3"], limit=100)
+            )
+            await timed(
+                "facets (no filter)",
+                lambda: crud_drill_group.get_facets(db)
+            )
+            await timed(
+                "facets tags=[tag7]",
+                lambda: crud_drill_group.get_facets(db, tags=["tag7"])
+            )
+            await timed(
+                "facets tags=[tag7] difficulty=3 is_public",
+                lambda: crud_drill_group.get_facets(db, tags=["tag7"], difficulty=3, is_public=True)
+            )
+
+            plan = await db.execute(text(
+                "EXPLAIN ANALYZE SELECT id FROM drill_groups WHERE tags @> '[\"tag7\", \"tag3\"]'::jsonb"
+            ))
+            print("\nContainment filter plan:")
+            for (line,) in plan:
+                print(f"  {line}")
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    asyncio.run(bench_drill_group_facets(count))
@@ -0,0 +1,96 @@
+"""Benchmark response encodings for the large list endpoints
+
+Builds payloads shaped like GET /practice-sessions/user/{id} (each session
+embedding its drill, its drill group with all of the group's drills, and
+the user) and GET /drill-groups/ (groups with nested drills), then encodes
+them as plain JSON, msgpack, and the columnar layout in both encodings.
+Reports payload size, gzipped size and serialization time per format. No
+database is needed.
+
+Usage: python -m scripts.bench_encoding [session_count] [drill_count]
+"""
+import gzip
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from app.utils.encoding import COLUMNAR_JSON, COLUMNAR_MSGPACK, JSON, MSGPACK, encode
+
+REPEATS = 10
+
+
+def make_drill(drill_id: int) -> dict:
+    return {
+        "id": drill_id,
+        "name": f"Drill {drill_id}",
+        "description": "Place four bowls within a mat length of the jack from alternating hands",
+        "difficulty": 1 + drill_id % 5,
+        "drill_type": random.choice(["DRAW", "DRIVE", "WEIGHTED"]),
+        "duration_minutes": 15 + drill_id % 4 * 15,
+        "target_score": 80,
+        "created_at": datetime(2025, 1, 1) + timedelta(days=drill_id),
+    }
+
+
+def make_payloads(session_count: int, drill_count: int):
+    random.seed(42)
+    drills = [make_drill(i) for i in range(1, drill_count + 1)]
+    groups = []
+    for group_id in range(1, max(2, drill_count // 4) + 1):
+        groups.append({
+            "id": group_id,
+            "name": f"Group {group_id}",
+            "description": "A balanced session of draw and weighted shots",
+            "is_public": True,
+            "difficulty": 1 + group_id % 5,
+            "tags": ["draw", "club"],
+            "created_at": datetime(2025, 2, 1),
+            "updated_at": datetime(2025, 3, 1),
+            "drills": random.sample(drills, min(8, len(drills))),
+        })
+    user = {
+        "id": 1, "email": "player@example.com", "username": "player", "full_name": "Club Player",
+        "is_active": True, "is_admin": False, "phone_verified": True, "email_verified": True,
+        "created_at": datetime(2024, 6, 1), "updated_at": None,
+    }
+    sessions = []
+    for session_id in range(1, session_count + 1):
+        group = random.choice(groups)
+        drill = random.choice(group["drills"])
+        sessions.append({
+            "id": session_id,
+            "user_id": 1,
+            "drill_group_id": group["id"],
+            "drill_id": drill["id"],
+            "created_at": datetime(2025, 4, 1) + timedelta(hours=session_id),
+            "drill": drill,
+            "drill_group": group,
+            "user": user,
+        })
+    return {
+        "practice sessions": (sessions, {"drill": "drills", "drills": "drills", "drill_group": "drill_groups", "user": "users"}),
+        "drill groups": (groups, {"drills": "drills"}),
+    }
+
+
+def bench_encoding(session_count: int, drill_count: int):
+    for name, (records, entities) in make_payloads(session_count, drill_count).items():
+        print(f"{name} ({len(records)} records):")
+        baseline = None
+        for media_type in (JSON, MSGPACK, COLUMNAR_JSON, COLUMNAR_MSGPACK):
+            start = time.perf_counter()
+            for _ in range(REPEATS):
+                body = encode(records, media_type, entities)
+            elapsed = (time.perf_counter() - start) / REPEATS * 1000
+            gzipped = len(gzip.compress(body, 6))
+            baseline = baseline or len(body)
+            print(f"  {media_type:<40} {len(body) / 1024:9.1f} KiB ({len(body) / baseline:5.0%})  "
+                  f"gzip {gzipped / 1024:8.1f} KiB  {elapsed:8.2f} ms")
+        print()
+
+
+if __name__ == "__main__":
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    drills = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    bench_encoding(sessions, drills)
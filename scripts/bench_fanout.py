@@ -0,0 +1,75 @@
+"""Benchmark concurrent sub-query fan-out on the composite read endpoints
+
+Times the dashboard, advisor and admin dashboard handlers with their
+independent queries run back to back on one session (the old behaviour)
+and through gather_reads at a few fan-out limits. Reports mean and p95
+latency per call and the peak number of pooled connections checked out.
+
+Usage: python -m scripts.bench_fanout [repeats]
+"""
+import asyncio
+import statistics
+import sys
+import time
+from unittest import mock
+
+from sqlalchemy import select
+
+from app.main import app  # noqa: registers all models and routers
+from app.core.config import settings
+from app.db.base import async_session, engine
+from app.db.models.user import User
+from app.api.v1 import admin, advisor, dashboard
+from scripts.bench_singleflight import PoolGauge
+
+LIMITS = (1, 2, 4, 8)
+
+
+async def sequential_reads(*jobs, limit=None):
+    async with async_session() as db:
+        return [await job(db) for job in jobs]
+
+
+async def timed(label, call, repeats, gauge):
+    await call()  # warm the pool and statement caches
+    gauge.reset()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"  {label:<22} mean {statistics.mean(samples):7.2f} ms  "
+          f"p95 {p95:7.2f} ms  peak connections {gauge.peak:3d}")
+
+
+async def bench_fanout(repeats: int):
+    async with async_session() as db:
+        user = (await db.execute(select(User).order_by(User.id).limit(1))).scalar_one_or_none()
+    if user is None:
+        print("Need at least one user in the database")
+        return
+
+    endpoints = {
+        "dashboard": lambda: dashboard._dashboard_metrics(user.id, user.username),
+        "advisor": lambda: advisor.get_advice_recommendations(user.id, current_user=user),
+        "admin dashboard": lambda: admin.get_admin_dashboard(current_user=user),
+    }
+    gauge = PoolGauge(engine.sync_engine.pool)
+
+    for name, call in endpoints.items():
+        print(f"{name}:")
+        with mock.patch.object(dashboard, "gather_reads", sequential_reads), \
+                mock.patch.object(advisor, "gather_reads", sequential_reads), \
+                mock.patch.object(admin, "gather_reads", sequential_reads):
+            await timed("sequential", call, repeats, gauge)
+        for limit in LIMITS:
+            with mock.patch.object(settings, "READ_FANOUT_LIMIT", limit):
+                await timed(f"gather_reads limit={limit}", call, repeats, gauge)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    asyncio.run(bench_fanout(repeats))
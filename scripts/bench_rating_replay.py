@@ -0,0 +1,46 @@
+"""Benchmark the vectorized Elo replay against applying results one by one
+
+Generates synthetic results between random players, rebuilds the ratings
+with app.utils.elo.replay and with a plain Python loop over elo.update, and
+checks that both give the same ratings. No database is needed; this is the
+compute part of crud_rating.recompute_all.
+
+Usage: python -m scripts.bench_rating_replay [challenge_count] [player_count]
+"""
+import sys
+import time
+
+import numpy as np
+
+from app.utils import elo
+
+INITIAL = 1500.0
+K = 32.0
+
+
+def bench_rating_replay(challenge_count: int, player_count: int):
+    rng = np.random.default_rng(42)
+    a = rng.integers(0, player_count, challenge_count)
+    b = (a + rng.integers(1, player_count, challenge_count)) % player_count
+    score_a = rng.choice([0.0, 0.5, 1.0], challenge_count)
+
+    start = time.perf_counter()
+    ratings, _, _, _ = elo.replay(a, b, score_a, player_count, initial=INITIAL, k=K)
+    vectorized = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop = [INITIAL] * player_count
+    for x, y, s in zip(a.tolist(), b.tolist(), score_a.tolist()):
+        loop[x], loop[y] = elo.update(loop[x], loop[y], s, K)
+    sequential = time.perf_counter() - start
+
+    print(f"Challenges:  {challenge_count}  Players: {player_count}")
+    print(f"Vectorized:  {vectorized * 1000:8.1f} ms")
+    print(f"One by one:  {sequential * 1000:8.1f} ms")
+    print(f"Max rating difference: {np.abs(ratings - np.asarray(loop)).max():.2e}")
+
+
+if __name__ == "__main__":
+    challenges = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    bench_rating_replay(challenges, players)
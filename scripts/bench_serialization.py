@@ -0,0 +1,101 @@
+"""Benchmark the fast JSON response path against response_model serialization
+
+Builds in-memory ORM objects shaped like the responses of GET /drill-groups/
+(groups with nested drills), GET /challenge/ and GET /drill/catalog, then
+serializes them the way FastAPI does for a `response_model` (validate from
+attributes, dump to Python, stdlib json) and through FastJSONResponse
+(pydantic-core validate + dump_json). Checks that both produce the same
+JSON and reports CPU time per response. No database is needed.
+
+Usage: python -m scripts.bench_serialization [group_count] [drills_per_group]
+"""
+import asyncio
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.main import app  # noqa: registers all models and routers
+from app.db.models.challenge import Challenge as ChallengeModel, ChallengeStatus
+from app.db.models.drill import Drill as DrillModel
+from app.db.models.drill_group import DrillGroup as DrillGroupModel
+from app.schemas.challenge import Challenge
+from app.schemas.drill import DrillCatalogPage
+from app.schemas.drill_group import DrillGroup
+from app.utils.fast_json import FastJSONResponse
+
+REPEATS = 20
+
+
+def make_drill(drill_id: int) -> DrillModel:
+    return DrillModel(
+        id=drill_id, name=f"Drill {drill_id}", description="Draw to the jack from alternating hands",
+        difficulty=1 + drill_id % 5, drill_type="DRAW", duration_minutes=30, target_score=80,
+        session_id=None, created_at=datetime(2025, 1, 1) + timedelta(days=drill_id),
+    )
+
+
+def make_payloads(group_count: int, drills_per_group: int):
+    drills = [make_drill(i) for i in range(1, group_count * drills_per_group + 1)]
+    groups = [
+        DrillGroupModel(
+            id=group_id, user_id=1, name=f"Group {group_id}", description="Club night warm-up",
+            is_public=True, difficulty=2, tags=["draw", "club"], image=None,
+            created_at=datetime(2025, 2, 1), updated_at=datetime(2025, 3, 1),
+            drills=drills[(group_id - 1) * drills_per_group:group_id * drills_per_group],
+        )
+        for group_id in range(1, group_count + 1)
+    ]
+    challenges = [
+        ChallengeModel(
+            id=i, sender_id=1, recipient_id=2, title=f"Challenge {i}", description=None,
+            status=ChallengeStatus.PENDING, expires_at=None, created_at=datetime(2025, 4, 1),
+            updated_at=None, drill_type="DRAW", target_score=10, winner_id=None, completed_at=None,
+        )
+        for i in range(1, group_count + 1)
+    ]
+    catalog = {
+        "items": drills[:100], "total": len(drills), "total_is_estimate": False,
+        "facets": {"drill_type": {"DRAW": len(drills)}, "difficulty": {"1": 10}, "duration": {"30_59": 10}},
+    }
+    return {
+        "drill groups": (groups, List[DrillGroup]),
+        "challenges": (challenges, List[Challenge]),
+        "drill catalog": (catalog, DrillCatalogPage),
+    }
+
+
+async def response_model_body(content, schema) -> bytes:
+    field = create_response_field(name="response", type_=schema)
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def bench_serialization(group_count: int, drills_per_group: int):
+    for name, (content, schema) in make_payloads(group_count, drills_per_group).items():
+        baseline = await response_model_body(content, schema)
+        fast = FastJSONResponse(content, schema).body
+        assert json.loads(baseline) == json.loads(fast), f"{name}: fast path output differs"
+
+        start = time.process_time()
+        for _ in range(REPEATS):
+            await response_model_body(content, schema)
+        slow_ms = (time.process_time() - start) / REPEATS * 1000
+
+        start = time.process_time()
+        for _ in range(REPEATS):
+            FastJSONResponse(content, schema)
+        fast_ms = (time.process_time() - start) / REPEATS * 1000
+
+        print(f"{name:<14} {len(fast) / 1024:8.1f} KiB  response_model {slow_ms:8.2f} ms  "
+              f"fast path {fast_ms:8.2f} ms  ({slow_ms / fast_ms:4.1f}x less CPU)")
+
+
+if __name__ == "__main__":
+    groups = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    per_group = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(bench_serialization(groups, per_group))
@@ -0,0 +1,98 @@
+"""Benchmark request coalescing on a burst of identical dashboard reads
+
+Fires a burst of concurrent "requests" for the same user's dashboard, each
+with its own session that first loads the user (like the auth dependency
+does), then computes the dashboard either directly or through the
+"dashboard" singleflight group. Reports wall time, how many times the
+dashboard queries actually ran, the peak number of pooled connections
+checked out and the total time connections were held.
+
+Usage: python -m scripts.bench_singleflight [burst_size] [rounds]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import event, select
+
+from app.main import app  # noqa: registers all models and routers
+from app.db.base import async_session, engine
+from app.db.models.user import User
+from app.api.v1.dashboard import _dashboard_metrics
+from app.utils.singleflight import SingleFlight
+
+
+class PoolGauge:
+    """Tracks connections checked out of the engine's pool"""
+
+    def __init__(self, pool):
+        self.current = 0
+        self.peak = 0
+        self.connection_seconds = 0.0
+        self._last = time.perf_counter()
+        event.listen(pool, "checkout", self._checkout)
+        event.listen(pool, "checkin", self._checkin)
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.connection_seconds += self.current * (now - self._last)
+        self._last = now
+
+    def _checkout(self, *args):
+        self._tick()
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+
+    def _checkin(self, *args):
+        self._tick()
+        self.current -= 1
+
+    def reset(self):
+        self._tick()
+        self.peak = self.current
+        self.connection_seconds = 0.0
+
+
+async def request(user_id: int, flight: SingleFlight = None):
+    async with async_session() as db:
+        user = (await db.execute(select(User).where(User.id == user_id))).scalar_one()
+        if flight is None:
+            return await _dashboard_metrics(user_id, user.username)
+        return await flight.do(user_id, lambda: _dashboard_metrics(user_id, user.username), release=db)
+
+
+async def burst(label: str, user_id: int, size: int, rounds: int, gauge: PoolGauge, coalesce: bool):
+    gauge.reset()
+    executions = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        flight = SingleFlight("bench") if coalesce else None
+        await asyncio.gather(*[request(user_id, flight) for _ in range(size)])
+        executions += flight.executions if flight else size
+    elapsed = (time.perf_counter() - start) / rounds
+    gauge._tick()
+    print(f"{label:<14} {elapsed * 1000:8.1f} ms/burst  "
+          f"dashboard runs/burst: {executions / rounds:6.1f}  "
+          f"peak connections: {gauge.peak:3d}  "
+          f"connection-ms/burst: {gauge.connection_seconds / rounds * 1000:8.1f}")
+
+
+async def bench_singleflight(size: int, rounds: int):
+    async with async_session() as db:
+        user_id = (await db.execute(select(User.id).order_by(User.id).limit(1))).scalar()
+    if user_id is None:
+        print("Need at least one user in the database")
+        return
+
+    gauge = PoolGauge(engine.sync_engine.pool)
+    print(f"Burst of {size} identical dashboard requests, {rounds} rounds "
+          f"(pool size {engine.pool.size()} + overflow)\n")
+    await burst("direct", user_id, size, rounds, gauge, coalesce=False)
+    await burst("singleflight", user_id, size, rounds, gauge, coalesce=True)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    asyncio.run(bench_singleflight(size, rounds))
@@ -0,0 +1,79 @@
+"""Benchmark peak memory of materialized vs streamed user listings
+
+Seeds temporary users inside a transaction, then serializes GET
+/admin/users-sized pages two ways: the list path (all rows loaded, then
+encoded as one body) and the streaming path (server-side cursor, one chunk
+per STREAM_BATCH_SIZE rows). Reports wall time, bytes produced and peak
+Python memory (tracemalloc) per page size. Everything is rolled back.
+
+Usage: python -m scripts.bench_streaming [user_count]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.db.base import Base  # noqa: registers all models before the CRUD imports
+from app.crud import crud_user
+from app.schemas.user import User
+from app.utils.fast_json import FastJSONResponse, json_array_chunks
+
+
+async def materialized(db: AsyncSession, limit: int) -> int:
+    users = await crud_user.get_all_users(db, limit=limit)
+    return len(FastJSONResponse(users, List[User]).body)
+
+
+async def streamed(db: AsyncSession, limit: int) -> int:
+    size = 0
+    batches = crud_user.stream_all_users(db, limit=limit, batch_size=settings.STREAM_BATCH_SIZE)
+    async for chunk in json_array_chunks(batches, User):
+        size += len(chunk)
+    return size
+
+
+async def measure(label: str, run, db: AsyncSession, limit: int):
+    db.expunge_all()
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = await run(db, limit)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<13} {elapsed * 1000:8.1f} ms  {size / 1024 / 1024:7.2f} MiB out  "
+          f"peak {peak / 1024 / 1024:7.2f} MiB")
+
+
+async def bench_streaming(user_count: int):
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        db = AsyncSession(bind=conn, expire_on_commit=False)
+        try:
+            print(f"Seeding {user_count} users...")
+            await db.execute(text("""
+                INSERT INTO users (email, username, hashed_password, phone_number, phone_verified,
+                                   email_verified, is_active, is_admin)
+                SELECT 'stream' || g || '@example.com', 'stream_user_' || g, 'x',
+                       '+98' || lpad(g::text, 10, '0'), false, false, true, false
+                FROM generate_series(1, :n) AS g
+            """), {"n": user_count})
+
+            for limit in (1_000, 10_000, user_count):
+                print(f"limit={limit}:")
+                await measure("materialized", materialized, db, limit)
+                await measure("streamed", streamed, db, limit)
+        finally:
+            await db.close()
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    asyncio.run(bench_streaming(count))
@@ -0,0 +1,81 @@
+"""Concurrency stress test for challenge state transitions
+
+Creates pending challenges between two existing users and fires many
+concurrent accept/decline calls at each one from separate sessions.
+Exactly one transition per challenge must win; every other call must fail
+with a precise reason instead of silently overwriting the winner.
+
+Usage: python -m scripts.test_challenge_transitions [rounds] [concurrency]
+"""
+import asyncio
+import sys
+from collections import Counter
+
+from sqlalchemy import select
+
+from app.db.base import async_session
+from app.db.models.user import User
+from app.db.models.challenge import ChallengeStatus
+from app.crud import crud_challenge
+from app.schemas.challenge import ChallengeCreate
+
+
+async def attempt(challenge_id: int, to_status: ChallengeStatus, user_id: int) -> str:
+    async with async_session() as session:
+        try:
+            await crud_challenge.transition(
+                session, challenge_id=challenge_id, to_status=to_status, user_id=user_id
+            )
+            return "ok"
+        except crud_challenge.TransitionError as e:
+            return e.reason
+
+
+async def test_challenge_transitions(rounds: int, concurrency: int):
+    async with async_session() as session:
+        users = (await session.execute(select(User).order_by(User.id).limit(2))).scalars().all()
+    if len(users) < 2:
+        print("Need at least two users in the database")
+        return
+    sender, recipient = users
+
+    totals = Counter()
+    failures = 0
+    for round_number in range(rounds):
+        async with async_session() as session:
+            challenge = await crud_challenge.create(
+                session,
+                obj_in=ChallengeCreate(title=f"Stress test {round_number}", recipient_id=recipient.id),
+                sender_id=sender.id
+            )
+        challenge_id = challenge.id
+
+        # Half the callers accept, half decline, all at once
+        outcomes = await asyncio.gather(*[
+            attempt(
+                challenge_id,
+                ChallengeStatus.ACCEPTED if i % 2 == 0 else ChallengeStatus.DECLINED,
+                recipient.id
+            )
+            for i in range(concurrency)
+        ])
+        counts = Counter(outcomes)
+        totals.update(counts)
+        if counts["ok"] != 1:
+            failures += 1
+            print(f"Round {round_number}: expected exactly one winner, got {dict(counts)}")
+
+        async with async_session() as session:
+            await crud_challenge.delete_challenge(session, challenge_id=challenge_id)
+
+    print(f"Outcomes over {rounds} rounds x {concurrency} callers: {dict(totals)}")
+    if failures:
+        print(f"FAILED: {failures} rounds had zero or multiple winners")
+        sys.exit(1)
+    print("PASSED: every challenge transitioned exactly once")
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    asyncio.run(test_challenge_transitions(rounds, concurrency))